@@ -0,0 +1,318 @@
+import os
+import gc
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import tempfile
+import tracemalloc
+from datetime import datetime
+import numpy as np
+import pandas as pd
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+from benchmarks.generador_eventos import generar_carpeta_partidos
+from procesamiento.almacen_eventos import (
+    EQUIPO_POR_DEFECTO, actualizar_almacen, cargar_eventos, cargar_eventos_jugador, cargar_indice_jugadores, cargar_tensor_heatmaps,
+    ruta_almacen
+)
+from procesamiento.agregados_equipo import cargar_prefijos_jugadores, estadisticas_ventana, limpiar_cache_agregados
+from procesamiento.mapas_calor import sumar_heatmaps
+from procesamiento.posesiones import (
+    COLUMNAS_POSESIONES, COLUMNAS_RESUMEN_POSESIONES, asignar_posesiones, resumen_posesiones
+)
+from procesamiento.red_pases import COLUMNAS_RED_PASES, calcular_red_pases
+from scrapers.filtrar_eventos_por_jugador import filtrar_y_limpiar_eventos_jugador, limpiar_eventos_jugador
+from visualizations.cache_render import figura_a_png
+from visualizations.generar_ranking_defensivo import generar_ranking_defensivo, graficar_ranking_defensivo
+from visualizations.generar_dispersion_pases import calcular_metricas_pases, graficar_dispersion_pases
+from visualizations.generar_grafico_goles import calcular_goles_por_jugador, graficar_goles_torta
+from visualizations.graficos_jugador import GRAFICOS_JUGADOR, datos_grafico_jugador
+from pages.jugadores import obtener_jugadores_equipo, calcular_estadisticas_por_jugador
+
+# Carpeta donde se guardan los resultados en JSON
+CARPETA_RESULTADOS = "./data/benchmarks"
+
+# Escalas disponibles: nombre -> (partidos, temporadas). None = temporadas completas de la liga
+ESCALAS = {
+    "partido": (1, 1),
+    "temporada_equipo": (38, 1),
+    "temporada_liga": (None, 1),
+    "tres_temporadas": (None, 3),
+}
+ESCALAS_POR_DEFECTO = ["partido", "temporada_equipo", "temporada_liga"]
+
+# Un resultado es regresión si su mediana supera a la anterior por este factor
+UMBRAL_REGRESION = 1.25
+
+
+def _medir(funcion, repeticiones, preparar=None):
+    """
+    Mide la latencia de una función (varias repeticiones) y su pico de memoria.
+
+    El pico se mide en una ejecución aparte con tracemalloc, para que el rastreo
+    no infle los tiempos.
+    """
+    # Una llamada sin medir para que la importación diferida de los módulos no cuente como latencia
+    if preparar:
+        preparar()
+    funcion()
+
+    tiempos = []
+    for _ in range(repeticiones):
+        if preparar:
+            preparar()
+        gc.collect()
+        inicio = time.perf_counter()
+        funcion()
+        tiempos.append(time.perf_counter() - inicio)
+
+    if preparar:
+        preparar()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        funcion()
+        _, pico = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "repeticiones": repeticiones,
+        "mediana_s": round(float(np.median(tiempos)), 6),
+        "min_s": round(min(tiempos), 6),
+        "max_s": round(max(tiempos), 6),
+        "memoria_pico_mb": round(pico / 2**20, 3),
+    }
+
+
+def _casos(carpeta, equipo, carpeta_salida):
+    """Funciones a medir sobre una carpeta de partidos: nombre -> (función, preparación)."""
+    jugador = cargar_indice_jugadores(carpeta, equipo).groupby("player")["n_eventos"].sum().idxmax()
+    df_jugador = limpiar_eventos_jugador(cargar_eventos_jugador(carpeta, player=jugador))
+    ranking = generar_ranking_defensivo(carpeta, equipo)
+    metricas = calcular_metricas_pases(carpeta, equipo=equipo)
+    goles = calcular_goles_por_jugador(carpeta, equipo)
+    tensor = cargar_tensor_heatmaps(carpeta, equipo)
+    prefijos = cargar_prefijos_jugadores(carpeta, equipo)
+    eventos_red = cargar_eventos(carpeta, columnas=COLUMNAS_RED_PASES)
+    eventos_posesiones = cargar_eventos(carpeta, columnas=COLUMNAS_POSESIONES + COLUMNAS_RESUMEN_POSESIONES)
+    # Primera mitad de la temporada, solo de local
+    ventana = (0, len(prefijos["calendario"]) // 2, "local")
+
+    casos = {
+        # Agregados de equipo: en frío (sin caché en memoria) y servidos desde la caché
+        "generar_ranking_defensivo": (lambda: generar_ranking_defensivo(carpeta, equipo), limpiar_cache_agregados),
+        "generar_ranking_defensivo_cache": (lambda: generar_ranking_defensivo(carpeta, equipo), None),
+        "calcular_metricas_pases": (lambda: calcular_metricas_pases(carpeta, equipo=equipo), limpiar_cache_agregados),
+        "calcular_goles_por_jugador": (lambda: calcular_goles_por_jugador(carpeta, equipo), limpiar_cache_agregados),
+        "filtrar_y_limpiar_eventos_jugador": (
+            lambda: filtrar_y_limpiar_eventos_jugador(carpeta, carpeta_salida, jugador), None),
+        "obtener_jugadores_equipo": (lambda: obtener_jugadores_equipo(carpeta, equipo), None),
+        "cargar_eventos_jugador": (lambda: cargar_eventos_jugador(carpeta, player=jugador), None),
+        # Todos los eventos de la escala con el esquema compacto (la memoria pico refleja su tamaño)
+        "cargar_eventos": (lambda: cargar_eventos(carpeta), None),
+        "calcular_estadisticas_por_jugador": (lambda: calcular_estadisticas_por_jugador(df_jugador, jugador, equipo), None),
+        # Métricas de la ficha en una ventana de jornadas, desde las sumas prefijas
+        "estadisticas_ventana": (lambda: estadisticas_ventana(prefijos, jugador, ventana), None),
+        # Red de pases de todos los equipos de la escala en una sola pasada
+        "calcular_red_pases": (lambda: calcular_red_pases(eventos_red), None),
+        # Segmentación en posesiones de toda la escala y su resumen (el almacén ya guarda possession_id)
+        "asignar_posesiones": (lambda: asignar_posesiones(eventos_posesiones), None),
+        "resumen_posesiones": (lambda: resumen_posesiones(eventos_posesiones), None),
+        # Heatmap de toda la plantilla en toda la escala, sumado desde el tensor del almacén
+        "sumar_heatmaps": (lambda: sumar_heatmaps(tensor), None),
+        "graficar_ranking_defensivo": (lambda: graficar_ranking_defensivo(ranking), None),
+        "graficar_dispersion_pases": (lambda: graficar_dispersion_pases(metricas), None),
+        "graficar_goles_torta": (lambda: graficar_goles_torta(goles), None),
+    }
+    # Gráficos de la ficha del jugador, renderizados sin la caché de render
+    for grafico, (funcion, args, _) in GRAFICOS_JUGADOR.items():
+        datos = datos_grafico_jugador(grafico, df_jugador)
+        casos[f"grafico_{grafico}"] = (
+            lambda funcion=funcion, args=args, datos=datos: figura_a_png(funcion(datos, *args)), None)
+    return casos
+
+
+def ejecutar_escala(escala, equipo=EQUIPO_POR_DEFECTO, repeticiones=5, funciones=None, semilla=0,
+                    conservar=False):
+    """
+    Genera los datos sintéticos de una escala y mide cada función sobre ellos.
+
+    Parámetros:
+    - escala (str): Clave de ESCALAS.
+    - equipo (str): Equipo sobre el que se calculan los agregados y la ficha de jugador.
+    - repeticiones (int): Ejecuciones cronometradas por función.
+    - funciones (list): Limita la medición a estas funciones. None mide todas.
+    - semilla (int): Semilla del generador sintético.
+    - conservar (bool): Si es True no se borran los CSV ni el almacén generados.
+
+    Retorna:
+    - list: Un dict por función con la escala, el volumen de datos y las mediciones.
+    """
+    partidos, temporadas = ESCALAS[escala]
+    carpeta_temporal = tempfile.mkdtemp(prefix="lfc_benchmark_")
+    carpeta = os.path.join(carpeta_temporal, f"benchmark_{escala}")
+    try:
+        volumen = generar_carpeta_partidos(carpeta, partidos, temporadas, semilla=semilla)
+        resultados = []
+
+        # La ingesta del almacén se mide una vez: las siguientes llamadas no tienen nada que hacer
+        inicio = time.perf_counter()
+        actualizar_almacen(carpeta)
+        resultados.append(dict(funcion="actualizar_almacen", escala=escala, **volumen, repeticiones=1,
+                               mediana_s=round(time.perf_counter() - inicio, 6)))
+
+        casos = _casos(carpeta, equipo, os.path.join(carpeta_temporal, "jugadores"))
+        for nombre, (funcion, preparar) in casos.items():
+            if funciones and nombre not in funciones:
+                continue
+            medicion = _medir(funcion, repeticiones, preparar)
+            resultados.append(dict(funcion=nombre, escala=escala, **volumen, **medicion))
+            print(f"[INFO] {escala:<17} {nombre:<36} {medicion['mediana_s'] * 1000:>10.2f} ms "
+                  f"{medicion['memoria_pico_mb']:>9.2f} MB")
+        return resultados
+    finally:
+        limpiar_cache_agregados()
+        plt.close("all")
+        if conservar:
+            print(f"[INFO] Datos sintéticos conservados en {carpeta} y {ruta_almacen(carpeta)}")
+        else:
+            shutil.rmtree(carpeta_temporal, ignore_errors=True)
+            shutil.rmtree(ruta_almacen(carpeta), ignore_errors=True)
+
+
+def curvas_escalado(resultados):
+    """
+    Ajusta, para cada función, la pendiente log-log de la latencia frente al número de eventos.
+
+    Una pendiente cercana a 1 indica coste lineal; cercana a 0, coste constante.
+
+    Retorna:
+    - dict: función -> {'eventos': [...], 'mediana_s': [...], 'pendiente': float o None}.
+    """
+    df = pd.DataFrame(resultados)
+    curvas = {}
+    for funcion, grupo in df.groupby("funcion", sort=False):
+        grupo = grupo.sort_values("eventos")
+        pendiente = None
+        if grupo["eventos"].nunique() > 1 and (grupo["mediana_s"] > 0).all():
+            pendiente = round(float(np.polyfit(np.log(grupo["eventos"]), np.log(grupo["mediana_s"]), 1)[0]), 3)
+        curvas[funcion] = {
+            "eventos": grupo["eventos"].tolist(),
+            "mediana_s": grupo["mediana_s"].tolist(),
+            "pendiente": pendiente,
+        }
+    return curvas
+
+
+def comparar_resultados(actuales, anteriores, umbral=UMBRAL_REGRESION):
+    """
+    Compara dos ejecuciones y retorna las mediciones que empeoraron más que el umbral.
+
+    Parámetros:
+    - actuales (dict): Resultados de esta ejecución.
+    - anteriores (dict): Resultados de una ejecución anterior (mismo formato JSON).
+    - umbral (float): Factor de la mediana a partir del cual se considera regresión.
+
+    Retorna:
+    - list: Un dict por (función, escala) con ambas medianas y el factor.
+    """
+    previos = {(r["funcion"], r["escala"]): r for r in anteriores["resultados"]}
+    regresiones = []
+    for r in actuales["resultados"]:
+        previo = previos.get((r["funcion"], r["escala"]))
+        if previo is None or previo["mediana_s"] <= 0:
+            continue
+        factor = r["mediana_s"] / previo["mediana_s"]
+        if factor > umbral:
+            regresiones.append({"funcion": r["funcion"], "escala": r["escala"], "anterior_s": previo["mediana_s"],
+                                "actual_s": r["mediana_s"], "factor": round(factor, 2)})
+    return regresiones
+
+
+def graficar_curvas(curvas, ruta):
+    """Guarda un gráfico log-log de latencia frente a eventos con una línea por función."""
+    fig, ax = plt.subplots(figsize=(9, 6))
+    for funcion, curva in curvas.items():
+        if len(curva["eventos"]) > 1:
+            ax.plot(curva["eventos"], curva["mediana_s"], marker="o", label=funcion)
+    ax.set_xscale("log")
+    ax.set_yscale("log")
+    ax.set_xlabel("Eventos")
+    ax.set_ylabel("Mediana (s)")
+    ax.legend(fontsize=6)
+    fig.savefig(ruta, dpi=100, bbox_inches="tight")
+    plt.close(fig)
+
+
+def ejecutar_benchmarks(escalas=ESCALAS_POR_DEFECTO, equipo=EQUIPO_POR_DEFECTO, repeticiones=5, funciones=None,
+                        semilla=0, salida=None, conservar=False):
+    """
+    Ejecuta el benchmark en todas las escalas y guarda los resultados en JSON.
+
+    Retorna:
+    - dict: Entorno, resultados por (función, escala), curvas de escalado y ruta del JSON.
+    """
+    resultados = []
+    for escala in escalas:
+        resultados += ejecutar_escala(escala, equipo, repeticiones, funciones, semilla, conservar)
+
+    informe = {
+        "fecha": datetime.now().isoformat(timespec="seconds"),
+        "entorno": {
+            "python": platform.python_version(),
+            "pandas": pd.__version__,
+            "numpy": np.__version__,
+            "plataforma": platform.platform(),
+            "cpus": os.cpu_count(),
+        },
+        "parametros": {"escalas": list(escalas), "equipo": equipo, "repeticiones": repeticiones, "semilla": semilla},
+        "resultados": resultados,
+        "curvas": curvas_escalado(resultados),
+    }
+
+    if salida is None:
+        os.makedirs(CARPETA_RESULTADOS, exist_ok=True)
+        salida = os.path.join(CARPETA_RESULTADOS, f"benchmark_{datetime.now():%Y%m%d_%H%M%S}.json")
+    with open(salida, "w", encoding="utf-8") as f:
+        json.dump(informe, f, ensure_ascii=False, indent=2)
+    informe["ruta"] = salida
+    print(f"[INFO] Resultados guardados en {salida}")
+    return informe
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Mide latencia, memoria y escalado de las funciones de la app.")
+    parser.add_argument("--escala", action="append", dest="escalas", choices=list(ESCALAS),
+                        help=f"Escala a medir (repetible). Por defecto: {', '.join(ESCALAS_POR_DEFECTO)}.")
+    parser.add_argument("--equipo", default=EQUIPO_POR_DEFECTO)
+    parser.add_argument("--repeticiones", type=int, default=5)
+    parser.add_argument("--funcion", action="append", dest="funciones", help="Limita a esta función (repetible).")
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument("--salida", default=None, help="Ruta del JSON de resultados.")
+    parser.add_argument("--comparar", default=None, help="JSON de una ejecución anterior para detectar regresiones.")
+    parser.add_argument("--umbral", type=float, default=UMBRAL_REGRESION)
+    parser.add_argument("--grafico", default=None, help="Guarda las curvas de escalado en este PNG.")
+    parser.add_argument("--conservar", action="store_true", help="No borra los datos sintéticos generados.")
+    args = parser.parse_args()
+
+    informe = ejecutar_benchmarks(args.escalas or ESCALAS_POR_DEFECTO, args.equipo, args.repeticiones,
+                                  args.funciones, args.semilla, args.salida, args.conservar)
+    for funcion, curva in informe["curvas"].items():
+        if curva["pendiente"] is not None:
+            print(f"[INFO] Escalado {funcion:<36} pendiente log-log {curva['pendiente']}")
+    if args.grafico:
+        graficar_curvas(informe["curvas"], args.grafico)
+
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as f:
+            regresiones = comparar_resultados(informe, json.load(f), args.umbral)
+        for r in regresiones:
+            print(f"[ERROR] Regresión en {r['funcion']} ({r['escala']}): "
+                  f"{r['anterior_s']:.4f} s -> {r['actual_s']:.4f} s (x{r['factor']})")
+        if regresiones:
+            sys.exit(1)
@@ -0,0 +1,277 @@
+import os
+import argparse
+import itertools
+import numpy as np
+import pandas as pd
+from procesamiento.almacen_eventos import ESQUEMA_EVENTOS
+
+# Equipos de la liga sintética (Premier League 2024/25); el primero es el equipo por defecto
+EQUIPOS_LIGA = [
+    "Liverpool", "Arsenal", "Aston Villa", "Bournemouth", "Brentford", "Brighton", "Chelsea",
+    "Crystal Palace", "Everton", "Fulham", "Ipswich", "Leicester", "Man City", "Man Utd",
+    "Newcastle", "Nottingham Forest", "Southampton", "Tottenham", "West Ham", "Wolves",
+]
+
+# Frecuencia de cada tipo de evento con jugador (medida sobre los partidos reales del Liverpool)
+FRECUENCIA_TIPOS = {
+    "Pass": 0.6539, "BallRecovery": 0.0554, "BallTouch": 0.0395, "Foul": 0.0294, "Aerial": 0.0255,
+    "Clearance": 0.0254, "TakeOn": 0.0247, "Tackle": 0.0223, "CornerAwarded": 0.0139,
+    "Dispossessed": 0.0115, "Challenge": 0.0104, "Interception": 0.0097, "BlockedPass": 0.0097,
+    "KeeperPickup": 0.0087, "SavedShot": 0.0087, "Save": 0.0086, "MissedShots": 0.0056,
+    "Card": 0.0035, "OffsideGiven": 0.0021, "OffsideProvoked": 0.0021, "OffsidePass": 0.0021,
+    "Goal": 0.0019, "Error": 0.0013, "KeeperSweeper": 0.0011, "Claim": 0.0008, "ShotOnPost": 0.0004,
+}
+
+# Probabilidad de que cada tipo tenga outcome_type 'Successful' (el resto es 1.0)
+PROBABILIDAD_EXITO = {
+    "Pass": 0.83, "Aerial": 0.5, "BallTouch": 0.55, "Foul": 0.5, "CornerAwarded": 0.5,
+    "Challenge": 0.0, "OffsideGiven": 0.0, "Tackle": 0.65, "TakeOn": 0.42, "Claim": 0.89,
+    "KeeperSweeper": 0.91,
+}
+
+TIPOS_TIRO = ["SavedShot", "MissedShots", "Goal", "ShotOnPost"]
+
+# Identificadores de WhoScored de los calificadores que se generan
+ID_CALIFICADOR = {
+    "Zone": 56, "Length": 212, "Angle": 213, "PassEndX": 140, "PassEndY": 141,
+    "Longball": 1, "Cross": 2, "HeadPass": 3, "Chipped": 155, "LayOff": 156, "ThrowIn": 107,
+    "FreekickTaken": 5, "CornerTaken": 6, "GoalKick": 124, "KeyPass": 11113, "ShotAssist": 210,
+    "IntentionalAssist": 154, "IntentionalGoalAssist": 11111, "BigChanceCreated": 11112,
+    "RegularPlay": 22, "FastBreak": 23, "SetPiece": 24, "BigChance": 214, "Assisted": 29,
+    "Head": 15, "LeftFoot": 72, "RightFoot": 20, "OppositeRelatedEvent": 233, "Yellow": 31,
+}
+
+# Calificadores opcionales de los pases y probabilidad de aparecer
+CALIFICADORES_PASE = {
+    "Longball": 0.11, "Chipped": 0.08, "HeadPass": 0.04, "Cross": 0.03, "ThrowIn": 0.03,
+    "LayOff": 0.013, "GoalKick": 0.013, "FreekickTaken": 0.02, "CornerTaken": 0.01,
+    "KeyPass": 0.019, "ShotAssist": 0.018, "IntentionalAssist": 0.023, "IntentionalGoalAssist": 0.002,
+    "BigChanceCreated": 0.004,
+}
+
+# Calificadores opcionales de los tiros y probabilidad de aparecer
+CALIFICADORES_TIRO = {
+    "RegularPlay": 0.7, "FastBreak": 0.08, "SetPiece": 0.15, "BigChance": 0.2, "Assisted": 0.7,
+    "Head": 0.15, "LeftFoot": 0.35, "RightFoot": 0.5,
+}
+
+ZONAS = ["Back", "Center", "Left", "Right"]
+
+EVENTOS_POR_PARTIDO = 1540
+JUGADORES_POR_PLANTILLA = 25
+GAME_ID_INICIAL = 1_800_000
+
+
+def _calificador(nombre, valor=None):
+    texto = f"{{'type': {{'displayName': '{nombre}', 'value': {ID_CALIFICADOR[nombre]}}}"
+    if valor is not None:
+        texto += f", 'value': '{valor}'"
+    return texto + "}"
+
+
+def _plantilla(equipo, team_id):
+    """Nombres y player_id de la plantilla sintética de un equipo."""
+    ids = team_id * 1000 + np.arange(JUGADORES_POR_PLANTILLA)
+    nombres = np.array([f"{equipo} Jugador {i + 1:02d}" for i in range(JUGADORES_POR_PLANTILLA)], dtype=object)
+    return ids, nombres
+
+
+def _calificadores_eventos(rng, tipos, x, y, end_x, end_y):
+    """Texto de la columna 'qualifiers' para cada evento (mismo formato que WhoScored)."""
+    n = len(tipos)
+    es_pase = tipos == "Pass"
+    es_tiro = np.isin(tipos, TIPOS_TIRO)
+    zonas = rng.choice(ZONAS, size=n)
+    partes = [[_calificador("Zone", z)] for z in zonas]
+
+    largo = np.hypot(end_x - x, end_y - y).round(1)
+    angulo = (np.arctan2(end_y - y, end_x - x) % (2 * np.pi)).round(2)
+    for i in np.flatnonzero(es_pase):
+        partes[i] += [_calificador("PassEndX", end_x[i]), _calificador("PassEndY", end_y[i]),
+                      _calificador("Length", largo[i]), _calificador("Angle", angulo[i])]
+
+    for mascara, opcionales in ((es_pase, CALIFICADORES_PASE), (es_tiro, CALIFICADORES_TIRO)):
+        filas = np.flatnonzero(mascara)
+        for nombre, probabilidad in opcionales.items():
+            for i in filas[rng.random(len(filas)) < probabilidad]:
+                partes[i].append(_calificador(nombre))
+
+    for i in np.flatnonzero(np.isin(tipos, ["Aerial", "Challenge", "Foul", "Tackle", "TakeOn"])):
+        partes[i].append(_calificador("OppositeRelatedEvent", int(rng.integers(1, 1500))))
+    for i in np.flatnonzero(tipos == "Card"):
+        partes[i].append(_calificador("Yellow"))
+    return ["[" + ", ".join(p) + "]" for p in partes]
+
+
+def generar_partido(game_id, local, visitante, rng, eventos_por_partido=EVENTOS_POR_PARTIDO,
+                    id_local=1, id_visitante=2):
+    """
+    Genera los eventos sintéticos de un partido con el esquema de WhoScored.
+
+    Los tipos de evento, los resultados y los calificadores siguen la proporción de los
+    partidos reales, de modo que las funciones de agregación y los gráficos trabajan
+    sobre volúmenes y distribuciones comparables.
+
+    Parámetros:
+    - game_id (int): Identificador del partido.
+    - local (str): Equipo local.
+    - visitante (str): Equipo visitante.
+    - rng (numpy.random.Generator): Generador aleatorio.
+    - eventos_por_partido (int): Media de eventos con jugador del partido.
+    - id_local, id_visitante (int): team_id de cada equipo (también fija los player_id).
+
+    Retorna:
+    - DataFrame: Eventos con las columnas de ESQUEMA_EVENTOS.
+    """
+    n = int(rng.poisson(eventos_por_partido))
+    tipos_posibles = np.array(list(FRECUENCIA_TIPOS), dtype=object)
+    pesos = np.array(list(FRECUENCIA_TIPOS.values()))
+    indices_tipo = rng.choice(len(tipos_posibles), size=n, p=pesos / pesos.sum())
+    tipos = tipos_posibles[indices_tipo]
+    exito = np.array([PROBABILIDAD_EXITO.get(t, 1.0) for t in tipos_posibles])
+    exitoso = rng.random(n) < exito[indices_tipo]
+
+    # Equipo y jugador: 11 titulares con más peso que los 3 suplentes que entran
+    es_local = rng.random(n) < 0.5
+    equipos = np.where(es_local, local, visitante).astype(object)
+    team_ids = np.where(es_local, id_local, id_visitante)
+    player_ids = np.empty(n, dtype=np.int64)
+    jugadores = np.empty(n, dtype=object)
+    peso_convocados = np.r_[np.full(11, 1.0), np.full(3, 0.3)]
+    for equipo, team_id, filas in ((local, id_local, np.flatnonzero(es_local)),
+                                   (visitante, id_visitante, np.flatnonzero(~es_local))):
+        ids, nombres = _plantilla(equipo, team_id)
+        convocados = rng.choice(JUGADORES_POR_PLANTILLA, size=14, replace=False)
+        elegidos = convocados[rng.choice(14, size=len(filas), p=peso_convocados / peso_convocados.sum())]
+        player_ids[filas] = ids[elegidos]
+        jugadores[filas] = nombres[elegidos]
+
+    expanded_minute = np.sort(rng.integers(0, 97, size=n))
+    second = rng.integers(0, 60, size=n).astype(float)
+    periodo = np.where(expanded_minute < 47, "FirstHalf", "SecondHalf").astype(object)
+    minute = np.where(expanded_minute < 47, np.minimum(expanded_minute, 45), np.maximum(expanded_minute - 2, 45))
+
+    x = rng.uniform(0, 100, size=n).round(1)
+    y = rng.uniform(0, 100, size=n).round(1)
+    es_pase = tipos == "Pass"
+    end_x = np.where(es_pase, np.clip(x + rng.normal(8, 18, size=n), 0, 100), np.nan).round(1)
+    end_y = np.where(es_pase, np.clip(y + rng.normal(0, 20, size=n), 0, 100), np.nan).round(1)
+
+    es_tiro = np.isin(tipos, TIPOS_TIRO)
+    x = np.where(es_tiro, rng.uniform(70, 99, size=n).round(1), x)
+    y = np.where(es_tiro, rng.uniform(30, 70, size=n).round(1), y)
+    goal_mouth_y = np.where(es_tiro, rng.uniform(40, 60, size=n).round(1), np.nan)
+    goal_mouth_z = np.where(es_tiro, rng.uniform(0, 40, size=n).round(1), np.nan)
+    bloqueado = es_tiro & (tipos == "SavedShot") & (rng.random(n) < 0.4)
+    blocked_x = np.where(bloqueado, (x + 3).round(1), np.nan)
+    blocked_y = np.where(bloqueado, y, np.nan)
+
+    df = pd.DataFrame({
+        "game_id": game_id,
+        "period": periodo,
+        "minute": minute,
+        "second": second,
+        "expanded_minute": expanded_minute,
+        "type": tipos,
+        "outcome_type": np.where(exitoso, "Successful", "Unsuccessful").astype(object),
+        "team_id": team_ids,
+        "team": equipos,
+        "player_id": player_ids.astype(float),
+        "player": jugadores,
+        "x": x,
+        "y": y,
+        "end_x": end_x,
+        "end_y": end_y,
+        "goal_mouth_y": goal_mouth_y,
+        "goal_mouth_z": goal_mouth_z,
+        "blocked_x": blocked_x,
+        "blocked_y": blocked_y,
+        "qualifiers": _calificadores_eventos(rng, tipos, x, y, end_x, end_y),
+        "is_touch": ~np.isin(tipos, ["CornerAwarded", "OffsideGiven", "Card", "Foul"]),
+        "is_shot": pd.array(np.where(es_tiro, True, pd.NA), dtype="boolean"),
+        "is_goal": pd.array(np.where(tipos == "Goal", True, pd.NA), dtype="boolean"),
+        "card_type": np.where(tipos == "Card", "Yellow", None).astype(object),
+        "related_event_id": np.nan,
+        "related_player_id": np.nan,
+    })
+
+    # Eventos sin jugador que abren y cierran cada parte
+    estructura = pd.DataFrame({
+        "game_id": game_id,
+        "period": ["FirstHalf", "FirstHalf", "SecondHalf", "SecondHalf"] * 2,
+        "minute": [0, 45, 45, 90] * 2,
+        "second": 0.0,
+        "expanded_minute": [0, 47, 47, 96] * 2,
+        "type": ["Start", "End"] * 4,
+        "outcome_type": "Successful",
+        "team_id": [id_local] * 4 + [id_visitante] * 4,
+        "team": [local] * 4 + [visitante] * 4,
+        "x": 0.0,
+        "y": 0.0,
+        "qualifiers": "[]",
+        "is_touch": False,
+    })
+    df = pd.concat([df, estructura], ignore_index=True)
+    df = df.sort_values(["expanded_minute", "second"], kind="stable", ignore_index=True)
+    return df[list(ESQUEMA_EVENTOS)]
+
+
+def calendario_liga(equipos=EQUIPOS_LIGA, temporadas=1):
+    """
+    Calendario de ida y vuelta (todos contra todos) de una o varias temporadas.
+
+    Retorna:
+    - list: Tuplas (temporada, local, visitante).
+    """
+    return [(temporada, local, visitante)
+            for temporada in range(temporadas)
+            for local, visitante in itertools.permutations(equipos, 2)]
+
+
+def generar_carpeta_partidos(carpeta, partidos=None, temporadas=1, equipos=EQUIPOS_LIGA, semilla=0,
+                             eventos_por_partido=EVENTOS_POR_PARTIDO):
+    """
+    Escribe una carpeta de CSV de partidos sintéticos, uno por partido, como la del scraper.
+
+    Parámetros:
+    - carpeta (str): Carpeta de destino (se crea si no existe).
+    - partidos (int): Número de partidos. None genera todas las temporadas completas.
+      Se toman primero los partidos del primer equipo, para que un número pequeño
+      equivalga a la temporada de un solo equipo.
+    - temporadas (int): Temporadas completas de la liga que se generan.
+    - equipos (list): Equipos de la liga.
+    - semilla (int): Semilla aleatoria (la misma semilla genera los mismos datos).
+    - eventos_por_partido (int): Media de eventos con jugador por partido.
+
+    Retorna:
+    - dict: 'partidos' y 'eventos' generados.
+    """
+    calendario = calendario_liga(equipos, temporadas)
+    # Partidos del primer equipo delante: los primeros 38 forman su temporada completa
+    calendario.sort(key=lambda p: (p[0], equipos[0] not in p[1:]))
+    if partidos is not None:
+        calendario = calendario[:partidos]
+
+    os.makedirs(carpeta, exist_ok=True)
+    rng = np.random.default_rng(semilla)
+    eventos = 0
+    for i, (temporada, local, visitante) in enumerate(calendario):
+        df = generar_partido(GAME_ID_INICIAL + i, local, visitante, rng, eventos_por_partido,
+                             equipos.index(local) + 1, equipos.index(visitante) + 1)
+        # Mismo nombre que el scraper; con varias temporadas se añade la temporada para no pisar archivos
+        sufijo = f"_t{temporada + 1}" if temporada else ""
+        archivo = f"{local.lower()}_vs_{visitante.lower()}{sufijo}.csv"
+        df.to_csv(os.path.join(carpeta, archivo), index=False)
+        eventos += len(df)
+    print(f"[INFO] Generados {len(calendario)} partidos sintéticos ({eventos} eventos) en {carpeta}")
+    return {"partidos": len(calendario), "eventos": eventos}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Genera partidos sintéticos con el esquema de WhoScored.")
+    parser.add_argument("carpeta")
+    parser.add_argument("--partidos", type=int, default=None)
+    parser.add_argument("--temporadas", type=int, default=1)
+    parser.add_argument("--semilla", type=int, default=0)
+    args = parser.parse_args()
+    generar_carpeta_partidos(args.carpeta, args.partidos, args.temporadas, semilla=args.semilla)
@@ -0,0 +1,113 @@
+import os
+import sys
+import json
+import shutil
+import argparse
+import tempfile
+from datetime import datetime
+from benchmarks.generador_eventos import generar_carpeta_partidos
+from procesamiento.almacen_eventos import CARPETA_PARTIDOS, actualizar_almacen, cargar_eventos, ruta_almacen
+from procesamiento.esquema_compacto import memoria_por_columna
+
+# Carpeta donde se guardan los informes en JSON
+CARPETA_RESULTADOS = "./data/benchmarks"
+
+# Partidos de una temporada completa de liga, para proyectar la memoria por temporada
+PARTIDOS_TEMPORADA = 380
+
+# Escalas sintéticas que se pueden medir sin datos reales: nombre -> (partidos, temporadas)
+ESCALAS = {
+    "temporada_equipo": (38, 1),
+    "temporada_liga": (None, 1),
+    "tres_temporadas": (None, 3),
+}
+
+MB = 1024 ** 2
+
+
+def informe_memoria(carpeta_partidos=CARPETA_PARTIDOS):
+    """
+    Compara la memoria de todos los eventos de una carpeta con el esquema canónico y con el compacto.
+
+    Parámetros:
+    - carpeta_partidos (str): Carpeta con los CSV de partidos (el almacén se sincroniza antes de leer).
+
+    Retorna:
+    - dict: Volumen ('partidos', 'eventos'), memoria total de cada esquema en MB, bytes por
+      evento, proyección a una temporada de liga y el detalle por columna.
+    """
+    partidos = len(actualizar_almacen(carpeta_partidos)["partidos"])
+    canonico = cargar_eventos(carpeta_partidos, compacto=False)
+    compacto = cargar_eventos(carpeta_partidos)
+    antes = memoria_por_columna(canonico)
+    despues = memoria_por_columna(compacto)
+
+    columnas = {}
+    for columna in canonico.columns:
+        columnas[columna] = {
+            "tipo": str(canonico[columna].dtype),
+            # None: la columna no tiene ningún valor y no se carga
+            "tipo_compacto": str(compacto[columna].dtype) if columna in compacto else None,
+            "mb": round(antes[columna] / MB, 3),
+            "mb_compacto": round(despues.get(columna, 0) / MB, 3),
+        }
+
+    eventos = len(canonico)
+    total, total_compacto = antes.sum(), despues.sum()
+    eventos_por_partido = eventos / max(partidos, 1)
+    return {
+        "fecha": datetime.now().isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "partidos": partidos,
+        "eventos": eventos,
+        "total_mb": round(total / MB, 2),
+        "total_compacto_mb": round(total_compacto / MB, 2),
+        "reduccion": round(1 - total_compacto / total, 3) if total else 0.0,
+        "bytes_por_evento": round(total / max(eventos, 1), 1),
+        "bytes_por_evento_compacto": round(total_compacto / max(eventos, 1), 1),
+        "temporada_mb": round(total / max(eventos, 1) * eventos_por_partido * PARTIDOS_TEMPORADA / MB, 1),
+        "temporada_compacto_mb": round(
+            total_compacto / max(eventos, 1) * eventos_por_partido * PARTIDOS_TEMPORADA / MB, 1),
+        "columnas": dict(sorted(columnas.items(), key=lambda x: -x[1]["mb"])),
+    }
+
+
+def informe_memoria_escala(escala, semilla=0):
+    """Genera los datos sintéticos de una escala de ESCALAS, mide su memoria y los borra."""
+    partidos, temporadas = ESCALAS[escala]
+    carpeta_temporal = tempfile.mkdtemp(prefix="lfc_memoria_")
+    carpeta = os.path.join(carpeta_temporal, f"memoria_{escala}")
+    try:
+        generar_carpeta_partidos(carpeta, partidos, temporadas, semilla=semilla)
+        return dict(informe_memoria(carpeta), escala=escala)
+    finally:
+        shutil.rmtree(carpeta_temporal, ignore_errors=True)
+        shutil.rmtree(ruta_almacen(carpeta), ignore_errors=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compara la memoria de los eventos con el esquema canónico y el compacto.")
+    parser.add_argument("carpeta_partidos", nargs="?", default=CARPETA_PARTIDOS)
+    parser.add_argument("--escala", choices=list(ESCALAS), default=None,
+                        help="Mide datos sintéticos de esta escala en lugar de la carpeta de partidos.")
+    parser.add_argument("--salida", default=None, help="Ruta del JSON del informe.")
+    args = parser.parse_args()
+
+    informe = informe_memoria_escala(args.escala) if args.escala else informe_memoria(args.carpeta_partidos)
+    print(f"[INFO] {informe['partidos']} partidos, {informe['eventos']} eventos")
+    print(f"         {'columna':<20} {'tipo':<10} {'MB':>9}   {'compacto':<10} {'MB':>9}")
+    for columna, datos in informe["columnas"].items():
+        print(f"         {columna:<20} {datos['tipo']:<10} {datos['mb']:>9.3f}   "
+              f"{datos['tipo_compacto'] or '(vacía)':<10} {datos['mb_compacto']:>9.3f}")
+    print(f"[INFO] Total: {informe['total_mb']} MB -> {informe['total_compacto_mb']} MB "
+          f"({informe['reduccion']:.1%} menos, {informe['bytes_por_evento_compacto']} bytes por evento)")
+    print(f"[INFO] Proyección a una temporada de liga ({PARTIDOS_TEMPORADA} partidos): "
+          f"{informe['temporada_mb']} MB -> {informe['temporada_compacto_mb']} MB")
+
+    salida = args.salida
+    if salida is None:
+        os.makedirs(CARPETA_RESULTADOS, exist_ok=True)
+        salida = os.path.join(CARPETA_RESULTADOS, f"memoria_{datetime.now():%Y%m%d_%H%M%S}.json")
+    with open(salida, "w", encoding="utf-8") as f:
+        json.dump(informe, f, ensure_ascii=False, indent=2)
+    print(f"[INFO] Informe guardado en {salida}")
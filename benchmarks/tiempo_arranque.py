@@ -0,0 +1,127 @@
+import os
+import re
+import sys
+import json
+import argparse
+import subprocess
+from collections import defaultdict
+from datetime import datetime
+import numpy as np
+
+# Carpeta donde se guardan los informes en JSON
+CARPETA_RESULTADOS = "./data/benchmarks"
+
+# Módulos de entrada de la app cuyo tiempo de importación se mide
+MODULOS_ENTRADA = ["main", "pages.equipo", "pages.jugadores"]
+
+# Línea de `python -X importtime`: "import time: <propio> | <acumulado> | <sangría><módulo>"
+_PATRON_IMPORTTIME = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)")
+
+_RAIZ_REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _entorno():
+    entorno = dict(os.environ)
+    entorno["PYTHONPATH"] = os.pathsep.join(filter(None, [_RAIZ_REPO, entorno.get("PYTHONPATH")]))
+    return entorno
+
+
+def tiempos_importacion(modulo):
+    """
+    Importa un módulo en un proceso nuevo (después de streamlit) y desglosa el tiempo por paquete.
+
+    Streamlit se importa primero porque el servidor ya lo tiene cargado antes de ejecutar
+    el script; así solo se mide lo que añade la app.
+
+    Retorna:
+    - dict: 'total_ms' (acumulado del módulo) y 'paquetes' (paquete raíz -> ms propios).
+    """
+    resultado = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import streamlit; import {modulo}"],
+        cwd=_RAIZ_REPO, env=_entorno(), capture_output=True, text=True,
+    )
+    if resultado.returncode != 0:
+        raise RuntimeError(f"No se pudo importar {modulo}: {resultado.stderr.strip().splitlines()[-1]}")
+
+    lineas = [m.groups() for m in map(_PATRON_IMPORTTIME.match, resultado.stderr.splitlines()) if m]
+    # Las líneas salen en orden de finalización: lo importado por la app va después de 'streamlit'
+    inicio = next(i for i, (_, _, sangria, nombre) in enumerate(lineas) if nombre == "streamlit" and not sangria) + 1
+    paquetes = defaultdict(float)
+    total_us = 0
+    for propio, acumulado, sangria, nombre in lineas[inicio:]:
+        paquetes[nombre.split(".")[0]] += int(propio) / 1000
+        if not sangria:
+            total_us += int(acumulado)
+    return {"total_ms": round(total_us / 1000, 1),
+            "paquetes": {p: round(ms, 1) for p, ms in sorted(paquetes.items(), key=lambda x: -x[1])}}
+
+
+def tiempo_primer_render():
+    """Segundos hasta terminar la primera ejecución de main.py (portada con el login) en un proceso nuevo."""
+    codigo = (
+        "import time; t = time.perf_counter()\n"
+        "from streamlit.testing.v1 import AppTest\n"
+        "AppTest.from_file('main.py', default_timeout=120).run()\n"
+        "print(time.perf_counter() - t)\n"
+    )
+    resultado = subprocess.run([sys.executable, "-c", codigo], cwd=_RAIZ_REPO, env=_entorno(),
+                               capture_output=True, text=True)
+    if resultado.returncode != 0:
+        raise RuntimeError(f"No se pudo ejecutar main.py: {resultado.stderr.strip().splitlines()[-1]}")
+    return float(resultado.stdout.strip().splitlines()[-1])
+
+
+def informe_arranque(modulos=MODULOS_ENTRADA, repeticiones=3, top=10, salida=None):
+    """
+    Mide el tiempo de importación de cada módulo de entrada y el del primer render de la app.
+
+    Cada medición se repite en procesos nuevos y se reporta la mediana.
+
+    Retorna:
+    - dict: Por módulo, el total y los 'top' paquetes más costosos; más 'primer_render_s'.
+    """
+    modulos_informe = {}
+    for modulo in modulos:
+        mediciones = [tiempos_importacion(modulo) for _ in range(repeticiones)]
+        paquetes = defaultdict(list)
+        for medicion in mediciones:
+            for paquete, ms in medicion["paquetes"].items():
+                paquetes[paquete].append(ms)
+        medianas = {p: round(float(np.median(v)), 1) for p, v in paquetes.items()}
+        modulos_informe[modulo] = {
+            "total_ms": round(float(np.median([m["total_ms"] for m in mediciones])), 1),
+            "paquetes": dict(sorted(medianas.items(), key=lambda x: -x[1])[:top]),
+        }
+
+    informe = {
+        "fecha": datetime.now().isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "repeticiones": repeticiones,
+        "modulos": modulos_informe,
+        "primer_render_s": round(float(np.median([tiempo_primer_render() for _ in range(repeticiones)])), 3),
+    }
+
+    if salida is None:
+        os.makedirs(CARPETA_RESULTADOS, exist_ok=True)
+        salida = os.path.join(CARPETA_RESULTADOS, f"arranque_{datetime.now():%Y%m%d_%H%M%S}.json")
+    with open(salida, "w", encoding="utf-8") as f:
+        json.dump(informe, f, ensure_ascii=False, indent=2)
+    informe["ruta"] = salida
+    return informe
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Desglosa el tiempo de importación de los módulos de la app.")
+    parser.add_argument("modulos", nargs="*", default=MODULOS_ENTRADA)
+    parser.add_argument("--repeticiones", type=int, default=3)
+    parser.add_argument("--top", type=int, default=10, help="Paquetes más costosos que se listan por módulo.")
+    parser.add_argument("--salida", default=None, help="Ruta del JSON del informe.")
+    args = parser.parse_args()
+
+    informe = informe_arranque(args.modulos, args.repeticiones, args.top, args.salida)
+    for modulo, datos in informe["modulos"].items():
+        print(f"[INFO] {modulo}: {datos['total_ms']:.0f} ms")
+        for paquete, ms in datos["paquetes"].items():
+            print(f"         {paquete:<28} {ms:>8.1f} ms")
+    print(f"[INFO] Primer render de main.py: {informe['primer_render_s']} s")
+    print(f"[INFO] Informe guardado en {informe['ruta']}")
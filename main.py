@@ -1,7 +1,13 @@
 import streamlit as st
-from PIL import Image, ImageOps
 import time
 from login import check_password, logout
+from procesamiento.recursos_imagenes import variante_imagen
+from procesamiento.fotos_jugadores import cargar_indice_fotos
+from procesamiento.rutas_almacen import CARPETA_PARTIDOS, EQUIPO_POR_DEFECTO, equipos_manifiesto
+from procesamiento.rendimiento import (
+    PANEL_RENDIMIENTO, ejecuciones_recientes, finalizar_ejecucion, iniciar_ejecucion, medir,
+    percentiles_etapas
+)
 
 # Configuración de la página
 st.set_page_config(page_title="Análisis Liverpool PL 2024-2025", layout="wide")
@@ -44,17 +50,22 @@ PAGINAS = {
     "Estadísticas por Jugador": "pages.jugadores",
 }
 
+# Tamaño final de las imágenes de la portada (None conserva el original)
+TAMANO_LOGO = None
+TAMANO_PLANTEL = (600, 400)
+
 # Eliminar fondo blanco de la imagen
-def eliminar_fondo(logo_path):
-    """Elimina el fondo blanco de una imagen."""
+def eliminar_fondo(logo_path, tamano=None):
+    """
+    Elimina el fondo blanco de una imagen y la redimensiona.
+
+    Retorna los bytes PNG de la variante ya procesada (se genera una sola vez y se
+    reutiliza en las siguientes ejecuciones), o None si hubo un error.
+    """
     try:
-        image = Image.open(logo_path).convert("RGBA")
-        datas = image.getdata()
-        new_data = [
-            (255, 255, 255, 0) if item[:3] == (255, 255, 255) else item for item in datas
-        ]
-        image.putdata(new_data)
-        return image
+        return variante_imagen(logo_path, tamano)
+    except FileNotFoundError:
+        raise
     except Exception as e:
         st.warning(f"Error al procesar la imagen: {e}")
         return None
@@ -64,12 +75,44 @@ def cargar_pagina(pagina):
     """Carga la página seleccionada desde el diccionario PAGINAS."""
     if pagina in PAGINAS:
         modulo = __import__(PAGINAS[pagina], fromlist=["main"])
-        modulo.main()
+        with medir(f"pagina.{PAGINAS[pagina]}"):
+            modulo.main()
     else:
         st.error("Página no encontrada. Por favor, selecciona otra opción.")
 
+def mostrar_panel_rendimiento():
+    """Muestra en la barra lateral el desglose por etapa de las últimas ejecuciones y sus p50/p95."""
+    ejecuciones = ejecuciones_recientes()
+    if not ejecuciones:
+        return
+    with st.sidebar.expander("⏱️ Rendimiento"):
+        por_id = {e["id"]: e for e in reversed(ejecuciones)}
+        seleccion = st.selectbox(
+            "Ejecución", list(por_id), key="panel_rendimiento_ejecucion",
+            format_func=lambda i: f"{i} · {por_id[i]['pagina']} · {por_id[i]['ms']:.0f} ms",
+        )
+        ejecucion = por_id[seleccion]
+        st.caption("Tramos de la ejecución (ms)")
+        st.dataframe(
+            [{"etapa": t["etapa"], "ms": t["ms"]} for t in ejecucion["tramos"]],
+            hide_index=True, use_container_width=True,
+        )
+        if ejecucion["caches"]:
+            st.caption("Consultas a cachés")
+            st.dataframe(
+                [{"cache": c, **conteos} for c, conteos in ejecucion["caches"].items()],
+                hide_index=True, use_container_width=True,
+            )
+        st.caption("Últimas mediciones por etapa")
+        st.dataframe(
+            [{"etapa": etapa, **valores} for etapa, valores in percentiles_etapas().items()],
+            hide_index=True, use_container_width=True,
+        )
+
 def main():
     """Función principal de la aplicación."""
+    # Tramos de tiempo de esta ejecución (solo si LFC_RENDIMIENTO=1)
+    ejecucion = iniciar_ejecucion(st.session_state.get("pagina_actual", "Inicio"))
 
     # Crear una fila con columnas para el título y el logo
     col1, col2 = st.columns([0.7, 0.3])
@@ -83,7 +126,8 @@ def main():
     with col2:
         try:
             logo_path = "./images/logo_liverpool_3.png"
-            logo = eliminar_fondo(logo_path)
+            with medir("main.logo"):
+                logo = eliminar_fondo(logo_path, TAMANO_LOGO)
             if logo:
                 st.image(logo, width=150)
         except FileNotFoundError as e:
@@ -91,6 +135,10 @@ def main():
 
     # Verificación de contraseña
     if check_password():
+        # Índice de fotos y miniaturas de los jugadores (solo se reconstruye si cambia la carpeta)
+        with medir("main.indice_fotos"):
+            cargar_indice_fotos()
+
         # Menú de navegación (con control de duplicados)
         if "pagina_actual" not in st.session_state:
             st.session_state["pagina_actual"] = "Inicio"
@@ -103,6 +151,19 @@ def main():
 
         # Guardar la página seleccionada en sesión
         st.session_state["pagina_actual"] = pagina
+        if ejecucion is not None:
+            ejecucion["pagina"] = pagina
+
+        # Equipo a analizar: cualquiera de los que tienen partidos en el almacén. Se lee el
+        # manifiesto sin sincronizar para no cargar pandas/pyarrow en la portada; las páginas
+        # sincronizan el almacén al cargar datos
+        with medir("main.equipos"):
+            equipos = equipos_manifiesto(CARPETA_PARTIDOS)
+        if EQUIPO_POR_DEFECTO not in equipos:
+            equipos = [EQUIPO_POR_DEFECTO] + equipos
+        if st.session_state.get("equipo") not in equipos:
+            st.session_state["equipo"] = EQUIPO_POR_DEFECTO
+        st.sidebar.selectbox("Equipo:", equipos, key="equipo")
 
         # Cargar la página seleccionada
         if pagina == "Inicio":
@@ -111,11 +172,10 @@ def main():
             # Mostrar la imagen del plantel sin fondo
             try:
                 plantel_path = "./images/plantel_1.webp"
-                plantel = eliminar_fondo(plantel_path)
+                # Variante sin fondo ya redimensionada con LANCZOS
+                plantel = eliminar_fondo(plantel_path, TAMANO_PLANTEL)
                 if plantel:
-                    # Mejorar calidad y tamaño
-                    high_quality_image = plantel.resize((600, 400), Image.LANCZOS)
-                    st.image(high_quality_image, width=900)  # Ajustar el ancho deseado
+                    st.image(plantel, width=900)  # Ajustar el ancho deseado
             except FileNotFoundError as e:
                 st.warning(f"⚠️ No se encontró la imagen del plantel: {e}")
 
@@ -126,5 +186,10 @@ def main():
         if st.sidebar.button("Cerrar Sesión"):
             logout()
 
+    finalizar_ejecucion()
+    # Panel de rendimiento: solo con LFC_PANEL_RENDIMIENTO=1 y la sesión de administrador iniciada
+    if PANEL_RENDIMIENTO and st.session_state.get("password_correct"):
+        mostrar_panel_rendimiento()
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
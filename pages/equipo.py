@@ -1,33 +1,43 @@
-import pandas as pd
 import os
 import streamlit as st
-from visualizations.generar_ranking_defensivo import generar_ranking_defensivo, graficar_ranking_defensivo
-from visualizations.generar_dispersion_pases import calcular_metricas_pases, graficar_dispersion_pases
-from visualizations.generar_grafico_goles import calcular_goles_por_jugador, graficar_goles_torta
+from procesamiento.fotos_jugadores import CARPETA_FOTOS, miniatura_por_id
+from procesamiento.almacen_eventos import CARPETA_PARTIDOS, EQUIPO_POR_DEFECTO, id_jugador
+from procesamiento.agregados_equipo import (
+    MINUTOS_MINIMOS_POR_90, calcular_agregados_equipo, filtrar_por_participacion, obtener_grafico
+)
+from procesamiento.rendimiento import medir
+from visualizations.filtro_ventana import selector_ventana
 
 # Ruta de la carpeta de fotos de jugadores
-fotos_dir = "./images/fotos_jugadores"
+fotos_dir = CARPETA_FOTOS
 
-def obtener_foto_jugador(nombre):
-    """Retorna la ruta de la foto del jugador si existe, o None si no se encuentra."""
-    nombre_archivo = f"{nombre}.jpg"
-    ruta_imagen = os.path.join(fotos_dir, nombre_archivo)
-    return ruta_imagen if os.path.exists(ruta_imagen) else None
+def obtener_foto_jugador(nombre, ancho=60, equipo=EQUIPO_POR_DEFECTO):
+    """Retorna la miniatura (PNG) de la foto del jugador, o None si no se encuentra."""
+    # La foto se busca por el player_id del jugador en la plantilla del equipo, no por el nombre
+    player_id = id_jugador(CARPETA_PARTIDOS, nombre, equipo)
+    return miniatura_por_id(player_id, ancho, fotos_dir, CARPETA_PARTIDOS)
 
-def mostrar_jugador_con_foto(jugador, valor, ancho_foto=60):
+def mostrar_jugador_con_foto(jugador, valor, ancho_foto=60, equipo=EQUIPO_POR_DEFECTO):
     """Muestra el jugador con su foto en la misma fila usando columnas en Streamlit."""
     col1, col2 = st.columns([1, 3])  # La imagen ocupará 1 parte, el texto 3 partes
-    foto_jugador = obtener_foto_jugador(jugador)
+    with medir("equipo.foto"):
+        foto_jugador = obtener_foto_jugador(jugador, ancho_foto, equipo)
 
     if foto_jugador:
         col1.image(foto_jugador, width=ancho_foto)
 
     col2.metric(jugador, valor)
 
+def valor_ranking(fila, columna, por_90=False):
+    """Valor que se muestra en un ranking: el total o, por 90 minutos, la columna '_p90' con dos decimales."""
+    return f"{fila[columna + '_p90']:.2f}" if por_90 else fila[columna]
+
 def main():
-    st.title("Análisis Global del Equipo")
+    # Equipo elegido en la barra lateral (todos los equipos comparten el mismo almacén)
+    equipo = st.session_state.get("equipo", EQUIPO_POR_DEFECTO)
+    st.title(f"Análisis Global del Equipo: {equipo}")
 
-    carpeta_partidos = "./data/partidos_liverpool"
+    carpeta_partidos = CARPETA_PARTIDOS
     if not os.path.exists(carpeta_partidos) or not os.listdir(carpeta_partidos):
         st.error("No se encontraron datos de partidos. Asegúrate de ejecutar el scraping primero.")
         return
@@ -39,25 +49,50 @@ def main():
         st.session_state["show_dispersion_chart"] = False
     if "show_goles_chart" not in st.session_state:
         st.session_state["show_goles_chart"] = False
+    if "show_red_pases_chart" not in st.session_state:
+        st.session_state["show_red_pases_chart"] = False
+
+    # Todos los agregados del equipo se calculan en una sola pasada y se reutilizan entre reruns;
+    # los de un rango de jornadas salen de las sumas prefijas sin volver a leer eventos
+    with medir("equipo.agregados", equipo=equipo):
+        calendario = calcular_agregados_equipo(carpeta_partidos, equipo)['calendario']
+    ventana = selector_ventana(calendario, "ventana_equipo")
+    with medir("equipo.agregados_ventana", equipo=equipo):
+        agregados = calcular_agregados_equipo(carpeta_partidos, equipo, ventana)
+    st.caption(f"Partidos en el rango seleccionado: {agregados['total_partidos']}")
+
+    # Los rankings por 90 minutos ya vienen ordenados en los agregados: cambiar de orden no recalcula nada
+    por_90 = st.radio("Ordenar rankings por", ["Total", "Por 90 minutos"], horizontal=True,
+                      key="orden_rankings_equipo") == "Por 90 minutos"
+    sufijo = "_p90" if por_90 else ""
+    titulo_90 = " (por 90 min)" if por_90 else ""
+    if por_90:
+        st.caption(f"Solo jugadores con al menos {MINUTOS_MINIMOS_POR_90} minutos en el rango.")
 
     # **1. Acciones Defensivas**
-    ranking_defensivo = generar_ranking_defensivo(carpeta_partidos)
+    ranking_defensivo = agregados['ranking_defensivo' + sufijo]
     if not ranking_defensivo.empty:
-        st.markdown("<h3 style='color: red;'>Top 3 Jugadores en Acciones Defensivas</h3>", unsafe_allow_html=True)
+        st.markdown(f"<h3 style='color: red;'>Top 3 Jugadores en Acciones Defensivas{titulo_90}</h3>", unsafe_allow_html=True)
         col1, col2, col3 = st.columns(3)
         for i, col in enumerate([col1, col2, col3]):
             with col:
-                mostrar_jugador_con_foto(ranking_defensivo.iloc[i]['player'], ranking_defensivo.iloc[i]['defensive_actions'])
+                if i < len(ranking_defensivo):
+                    mostrar_jugador_con_foto(ranking_defensivo.iloc[i]['player'], valor_ranking(ranking_defensivo.iloc[i], 'defensive_actions', por_90),
+                                             equipo=equipo)
 
         # Botón para mostrar/ocultar gráfico
         if st.button("Gráfico de Acciones Defensivas"):
             st.session_state["show_defensive_chart"] = not st.session_state["show_defensive_chart"]
 
         if st.session_state["show_defensive_chart"]:
-            st.image(graficar_ranking_defensivo(ranking_defensivo), width=800)
+            # Los módulos de gráficos (matplotlib) solo se importan al mostrar el gráfico
+            from visualizations.generar_ranking_defensivo import graficar_ranking_defensivo
+            st.image(obtener_grafico(agregados, 'ranking_defensivo' + sufijo,
+                                     lambda datos: graficar_ranking_defensivo(datos, 'defensive_actions' + sufijo),
+                                     ranking_defensivo), width=800)
 
     # **2. Métricas de Pases**
-    metricas_pases = calcular_metricas_pases(carpeta_partidos, min_participacion=0.7)
+    metricas_pases = filtrar_por_participacion(agregados, min_participacion=0.7)
     if not metricas_pases.empty:
         col1, col2 = st.columns(2)
 
@@ -68,17 +103,19 @@ def main():
             for i in range(min(3, len(top_3_exitosos))):
                 mostrar_jugador_con_foto(
                     top_3_exitosos.iloc[i]['player'],
-                    f"{top_3_exitosos.iloc[i]['porcentaje_exitoso']:.2f}%"
+                    f"{top_3_exitosos.iloc[i]['porcentaje_exitoso']:.2f}%",
+                    equipo=equipo
                 )
 
         # **Pases Clasificados**
         with col2:
-            st.markdown("<h3 style='color: red;'>Top 3 en Pases Clasificados</h3>", unsafe_allow_html=True)
-            top_3_clasificados = metricas_pases.sort_values(by='pases_clasificados', ascending=False).head(3)
+            st.markdown(f"<h3 style='color: red;'>Top 3 en Pases Clasificados{titulo_90}</h3>", unsafe_allow_html=True)
+            top_3_clasificados = metricas_pases.sort_values(by='pases_clasificados' + sufijo, ascending=False).head(3)
             for i in range(min(3, len(top_3_clasificados))):
                 mostrar_jugador_con_foto(
                     top_3_clasificados.iloc[i]['player'],
-                    top_3_clasificados.iloc[i]['pases_clasificados']
+                    valor_ranking(top_3_clasificados.iloc[i], 'pases_clasificados', por_90),
+                    equipo=equipo
                 )
 
         # Botón para mostrar/ocultar gráfico
@@ -86,24 +123,52 @@ def main():
             st.session_state["show_dispersion_chart"] = not st.session_state["show_dispersion_chart"]
 
         if st.session_state["show_dispersion_chart"]:
-            st.image(graficar_dispersion_pases(metricas_pases), width=800)
+            from visualizations.generar_dispersion_pases import graficar_dispersion_pases
+            st.image(obtener_grafico(agregados, 'dispersion_pases', graficar_dispersion_pases, metricas_pases), width=800)
 
     # **3. Goles**
-    goles_df = calcular_goles_por_jugador(carpeta_partidos)
+    goles_df = agregados['goles']
     if not goles_df.empty:
-        st.markdown("<h3 style='color: red;'>Top 3 Goleadores</h3>", unsafe_allow_html=True)
+        # El gráfico de torta reparte los goles totales; solo el top 3 cambia de orden
+        top_goles = agregados['goles' + sufijo]
+        st.markdown(f"<h3 style='color: red;'>Top 3 Goleadores{titulo_90}</h3>", unsafe_allow_html=True)
         col1, col2, col3 = st.columns(3)
         for i, col in enumerate([col1, col2, col3]):
             with col:
-                if i < len(goles_df):
-                    mostrar_jugador_con_foto(goles_df.iloc[i]['player'], goles_df.iloc[i]['goles'])
+                if i < len(top_goles):
+                    mostrar_jugador_con_foto(top_goles.iloc[i]['player'], valor_ranking(top_goles.iloc[i], 'goles', por_90),
+                                             equipo=equipo)
 
         # Botón para mostrar/ocultar gráfico
         if st.button("Gráfico de Goles"):
             st.session_state["show_goles_chart"] = not st.session_state["show_goles_chart"]
 
         if st.session_state["show_goles_chart"]:
-            st.image(graficar_goles_torta(goles_df), width=800)
+            from visualizations.generar_grafico_goles import graficar_goles_torta
+            st.image(obtener_grafico(agregados, 'goles_torta', graficar_goles_torta, goles_df), width=800)
+
+    # **4. Red de Pases**
+    # La red (matriz dispersa + centralidades) se calcula una vez por rango de jornadas
+    from procesamiento.red_pases import red_pases_equipo
+    with medir("equipo.red_pases", equipo=equipo):
+        red = red_pases_equipo(carpeta_partidos, equipo, ventana)
+    centralidad = red['centralidad'].sort_values(by='intermediacion', ascending=False, kind='stable')
+    if red['pases'].nnz:
+        st.markdown("<h3 style='color: red;'>Top 3 en Intermediación (Red de Pases)</h3>", unsafe_allow_html=True)
+        col1, col2, col3 = st.columns(3)
+        for i, col in enumerate([col1, col2, col3]):
+            with col:
+                if i < len(centralidad):
+                    mostrar_jugador_con_foto(centralidad.index[i], f"{centralidad.iloc[i]['intermediacion']:.2f}",
+                                             equipo=equipo)
+
+        # Botón para mostrar/ocultar gráfico
+        if st.button("Red de Pases"):
+            st.session_state["show_red_pases_chart"] = not st.session_state["show_red_pases_chart"]
+
+        if st.session_state["show_red_pases_chart"]:
+            from visualizations.generar_red_pases import graficar_red_pases
+            st.image(obtener_grafico(agregados, 'red_pases', graficar_red_pases, red), width=800)
 
 if __name__ == "__main__":
     main()
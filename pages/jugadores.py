@@ -1,160 +1,111 @@
 import os
-import pandas as pd
-import streamlit as st
-from scrapers.filtrar_eventos_por_jugador import filtrar_y_limpiar_eventos_jugador
-from visualizations.generar_heatmap import generar_heatmap
-from visualizations.generar_campograma_pases import generar_campograma_pases
-from visualizations.generar_campograma_tiros import generar_campograma_tiros
-from visualizations.generar_radar_chart import generate_radar_chart
-import io
-from fpdf import FPDF
-import tempfile
-import webbrowser
 import base64
-from PIL import Image
-
-def obtener_jugadores_liverpool(input_folder, equipo="Liverpool"):
-    jugadores = set()
-    for archivo in os.listdir(input_folder):
-        if archivo.endswith(".csv"):
-            file_path = os.path.join(input_folder, archivo)
-            try:
-                df = pd.read_csv(file_path)
-                if "player" in df.columns and "team" in df.columns:
-                    jugadores.update(df[df["team"] == equipo]["player"].dropna().unique())
-            except Exception as e:
-                print(f"Error procesando {archivo}: {e}")
-    return sorted(jugadores)
-
-def calcular_estadisticas_por_jugador(df, jugador_seleccionado, equipo="Liverpool"):
-    acciones_defensivas = len(df[(df['player'] == jugador_seleccionado) &
-                                 (df['type'].isin(['Clearance', 'Tackle', 'BallRecovery', 'Interception']))])
-    acciones_ofensivas = len(df[(df['player'] == jugador_seleccionado) &
-                                 (df['type'].isin(['Pass', 'Goal', 'MissedShots', 'SavedShot', 'ShotOnPost']))])
-    total_pases = len(df[(df['player'] == jugador_seleccionado) & (df['type'] == 'Pass')])
-    pases_exitosos = len(df[(df['player'] == jugador_seleccionado) &
-                            (df['type'] == 'Pass') &
-                            (df['outcome_type'] == 'Successful')])
-    porcentaje_pases_exitosos = round((pases_exitosos / total_pases * 100) if total_pases > 0 else 0, 2)
-    pases_clasificados = len(df[(df['player'] == jugador_seleccionado) &
-                                 (df['type'] == 'Pass') &
-                                 (df['qualifiers'].str.contains('KeyPass|IntentionalAssist', na=False))])
-    missed_shots = len(df[(df['player'] == jugador_seleccionado) & (df['type'] == 'MissedShots')])
-    saved_shots = len(df[(df['player'] == jugador_seleccionado) & (df['type'] == 'SavedShot')])
-    goals = len(df[(df['player'] == jugador_seleccionado) & (df['type'] == 'Goal')])
-
+import streamlit as st
+from scrapers.filtrar_eventos_por_jugador import limpiar_eventos_jugador
+from visualizations.graficos_jugador import (
+    GRAFICOS_JUGADOR, GRAFICO_RADAR, GRAFICO_HEATMAP, GRAFICO_PASES, GRAFICO_TIROS, renderizar_graficos_jugador
+)
+from procesamiento.almacen_eventos import (
+    CARPETA_PARTIDOS, EQUIPO_POR_DEFECTO, actualizar_almacen, cargar_eventos_jugador, cargar_indice_jugadores,
+    cargar_tensor_heatmaps, id_jugador
+)
+from procesamiento.mapas_calor import sumar_heatmaps
+from procesamiento.estadisticas_jugadores import CLAVES_FICHA, estadisticas_ficha
+from procesamiento.agregados_equipo import calcular_agregados_equipo, cargar_prefijos_jugadores, estadisticas_ventana
+from procesamiento.minutos_jugados import por_90
+from procesamiento.ventanas_partidos import normalizar_ventana, partidos_ventana
+from procesamiento.fotos_jugadores import miniatura_por_id
+from procesamiento.informes_jugadores import DPI_EXPORTACION, nombre_archivo_informe
+from visualizations.cache_render import DPI_PANTALLA
+from procesamiento.rendimiento import medir
+from visualizations.filtro_ventana import selector_ventana
+
+# Nombre de cada gráfico en los avisos de carga y de error
+ETIQUETAS_GRAFICOS = {
+    GRAFICO_RADAR: "radar chart",
+    GRAFICO_HEATMAP: "heatmap",
+    GRAFICO_PASES: "campograma de pases",
+    GRAFICO_TIROS: "campograma de tiros",
+}
+
+def obtener_jugadores_equipo(input_folder, equipo=EQUIPO_POR_DEFECTO):
+    indice = cargar_indice_jugadores(input_folder, equipo)
+    return sorted(indice["player"].dropna().unique())
+
+def calcular_estadisticas_por_jugador(df, jugador_seleccionado, equipo=EQUIPO_POR_DEFECTO):
+    # Todas las métricas salen del mismo cubo de conteos (jugador × tipo × resultado); solo
+    # cuentan los eventos con el equipo, como en las ventanas de jornadas
+    return estadisticas_ficha(df[df["team"] == equipo], jugador_seleccionado)
+
+def calcular_estadisticas_ventana(prefijos, player_id, ventana):
+    # Métricas de la ficha en un rango de jornadas, desde las sumas prefijas del equipo
+    metricas = estadisticas_ventana(prefijos, ventana=ventana, player_id=player_id)
+    return {clave: metricas[clave] for clave in CLAVES_FICHA}
+
+def minutos_jugador(input_folder, player_id, equipo=EQUIPO_POR_DEFECTO, ventana=None):
+    # Minutos con el equipo en el rango de jornadas: ya están sumados en los agregados del equipo,
+    # por nombre; el nombre sale del player_id en la plantilla del equipo
+    indice = cargar_indice_jugadores(input_folder, equipo)
+    nombres = indice.loc[indice["player_id"] == player_id, "player"].unique()
+    jugadores = calcular_agregados_equipo(input_folder, equipo, ventana)["jugadores"]
+    minutos = jugadores.loc[jugadores["player"].isin(nombres), "minutos"]
+    return int(minutos.sum())
+
+def estadisticas_por_90(stats, minutos):
+    # Los conteos de la ficha pasan a 90 minutos; el porcentaje de pases no cambia
     return {
-        "acciones_defensivas": acciones_defensivas,
-        "acciones_ofensivas": acciones_ofensivas,
-        "porcentaje_pases_exitosos": porcentaje_pases_exitosos,
-        "pases_clasificados": pases_clasificados,
-        "missed_shots": missed_shots,
-        "saved_shots": saved_shots,
-        "goals": goals,
+        clave: valor if clave == "porcentaje_pases_exitosos" else round(float(por_90(valor, minutos)), 2)
+        for clave, valor in stats.items()
     }
 
-def fig_to_buffer(fig):
-    buffer = io.BytesIO()
-    fig.savefig(buffer, format="png", dpi=120, bbox_inches="tight")
-    buffer.seek(0)
-    return buffer
-
-def fig_to_base64(fig, dpi=150):
-    # Convierte la figura matplotlib a una imagen base64 para HTML
-    buffer = io.BytesIO()
-    fig.savefig(buffer, format="png", dpi=dpi, bbox_inches="tight")
-    buffer.seek(0)
-    img_str = base64.b64encode(buffer.read()).decode()
-    return f"data:image/png;base64,{img_str}"
+def conteos_heatmap_jugador(input_folder, player_id, equipo=EQUIPO_POR_DEFECTO, partidos=None):
+    # Heatmap del jugador sumado desde el tensor del almacén, sin volver a contar sus eventos
+    return sumar_heatmaps(cargar_tensor_heatmaps(input_folder, equipo), [player_id], partidos)
+
+def imagenes_exportacion(df_jugador, destino, imagenes_pantalla, heatmap=None):
+    # Reutiliza las imágenes de pantalla si el destino usa la misma resolución
+    dpi = DPI_EXPORTACION[destino]
+    if dpi == DPI_PANTALLA:
+        return [imagenes_pantalla[g] for g in GRAFICOS_JUGADOR]
+    imagenes = {grafico: png for grafico, png, _ in renderizar_graficos_jugador(df_jugador, dpi=dpi, heatmap=heatmap)}
+    return [imagenes[g] for g in GRAFICOS_JUGADOR]
+
+def marcador_grafico(grafico, ancho=None):
+    # Hueco del gráfico con un aviso de carga hasta que llegue la imagen
+    marcador = st.empty()
+    marcador.markdown(
+        f"<div style='min-height: 200px; display: flex; align-items: center; justify-content: center; "
+        f"background-color: #f5f5f5; color: #888; border-radius: 8px;'>Cargando {ETIQUETAS_GRAFICOS[grafico]}…</div>",
+        unsafe_allow_html=True,
+    )
+    return ancho, marcador
 
-def generate_pdf(jugador_seleccionado, stats, fig_radar, fig_heatmap, fig_pases, fig_tiros):
-    pdf = FPDF()
-    pdf.add_page()
-    
-    # Configuración de la página
-    pdf.set_auto_page_break(auto=True, margin=15)
-    
-    # Título
-    pdf.set_font("Arial", "B", size=16)
-    pdf.cell(200, 10, txt=f"{jugador_seleccionado} - Premier League 24/25", ln=1, align='C')
-    pdf.ln(10)
-    
-    # Estadísticas principales
-    pdf.set_font("Arial", "B", size=12)
-    pdf.cell(200, 10, txt="Estadísticas del Jugador", ln=1, align='L')
-    pdf.set_font("Arial", size=10)
-    
-    # Primera fila de estadísticas
-    pdf.cell(100, 10, txt=f"Acciones Defensivas: {stats['acciones_defensivas']}", ln=0)
-    pdf.cell(100, 10, txt=f"Acciones Ofensivas: {stats['acciones_ofensivas']}", ln=1)
-    
-    # Segunda fila de estadísticas
-    pdf.cell(100, 10, txt=f"Pases Exitosos: {stats['porcentaje_pases_exitosos']}%", ln=0)
-    pdf.cell(100, 10, txt=f"Pases Clasificados: {stats['pases_clasificados']}", ln=1)
-    
-    # Estadísticas de tiros
-    pdf.ln(5)
-    pdf.set_font("Arial", "B", size=12)
-    pdf.cell(200, 10, txt="Resumen de Tiros", ln=1, align='L')
-    pdf.set_font("Arial", size=10)
-    pdf.cell(70, 10, txt=f"Missed Shots: {stats['missed_shots']}", ln=0)
-    pdf.cell(70, 10, txt=f"Saved Shots: {stats['saved_shots']}", ln=0)
-    pdf.cell(60, 10, txt=f"Goals: {stats['goals']}", ln=1)
-    
-    # Agrupar imágenes en pares
-    image_pairs = [
-        [('Radar Chart', fig_radar), ('Heat Map', fig_heatmap)],
-        [('Mapa de Pases', fig_pases), ('Mapa de Tiros', fig_tiros)]
-    ]
-    
-    for pair in image_pairs:
-        pdf.ln(10)
-        for i, (title, fig) in enumerate(pair):
-            # Guardar figura temporalmente
-            temp_img = tempfile.NamedTemporaryFile(delete=False, suffix='.png')
-            fig.savefig(temp_img.name, format='png', bbox_inches='tight', dpi=300)
-            
-            # Título de la imagen
-            pdf.set_font("Arial", "B", size=12)
-            if i == 0:
-                pdf.cell(95, 10, txt=title, ln=0, align='L')
-            else:
-                pdf.cell(95, 10, txt=title, ln=1, align='L')
-            
-            # Agregar imagen al PDF
-            if i == 0:
-                pdf.image(temp_img.name, x=10, y=pdf.get_y()+10, w=90)
-            else:
-                pdf.image(temp_img.name, x=110, y=pdf.get_y(), w=90)
-                pdf.ln(70)  # Espacio para la siguiente fila de imágenes
-            
-            # Cerrar y eliminar archivo temporal
-            temp_img.close()
-            os.unlink(temp_img.name)
-    
-    # Guardar PDF y abrirlo
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp:
-        pdf.output(tmp.name)
-        webbrowser.open('file://' + tmp.name)
+def png_to_base64(png):
+    # Convierte una imagen PNG (bytes) a una URI base64 para HTML
+    img_str = base64.b64encode(png).decode()
+    return f"data:image/png;base64,{img_str}"
 
-def print_page(jugador_seleccionado, stats, fig_radar, fig_heatmap, fig_pases, fig_tiros):
+def generar_html_impresion(jugador_seleccionado, stats, img_radar, img_heatmap, img_pases, img_tiros,
+                           equipo=EQUIPO_POR_DEFECTO):
     """
     Genera una página HTML optimizada para impresión con las visualizaciones y estadísticas
     del jugador seleccionado. Todo el contenido está diseñado para caber en una sola página.
+
+    Retorna:
+    - str: Documento HTML autocontenido (imágenes en base64) que se imprime al abrirlo.
     """
-    # Convertir figuras a base64 para incluirlas en HTML
-    # Usar menor DPI para reducir el tamaño de las imágenes y garantizar que todo quepa en una página
-    radar_img = fig_to_base64(fig_radar, dpi=120) if fig_radar else ""
-    heatmap_img = fig_to_base64(fig_heatmap, dpi=120) if fig_heatmap else ""
-    pases_img = fig_to_base64(fig_pases, dpi=120) if fig_pases else ""
-    tiros_img = fig_to_base64(fig_tiros, dpi=120) if fig_tiros else ""
+    # Convertir imágenes a base64 para incluirlas en HTML
+    radar_img = png_to_base64(img_radar) if img_radar else ""
+    heatmap_img = png_to_base64(img_heatmap) if img_heatmap else ""
+    pases_img = png_to_base64(img_pases) if img_pases else ""
+    tiros_img = png_to_base64(img_tiros) if img_tiros else ""
     
     # Crear HTML para impresión con ajustes de tamaño y diseño optimizados para una sola página
     html = f"""
     <!DOCTYPE html>
     <html>
     <head>
-        <title>{jugador_seleccionado} - Liverpool Premier League 24/25</title>
+        <title>{jugador_seleccionado} - {equipo} Premier League 24/25</title>
         <style>
             @media print {{
                 @page {{ 
@@ -337,7 +288,7 @@ def print_page(jugador_seleccionado, stats, fig_radar, fig_heatmap, fig_pases, f
     <body onload="window.print()">
         <div class="content-wrapper">
             <div class="header">
-                <h1>{jugador_seleccionado} - Liverpool Premier League 24/25</h1>
+                <h1>{jugador_seleccionado} - {equipo} Premier League 24/25</h1>
             </div>
             
             <div class="top-section">
@@ -394,29 +345,29 @@ def print_page(jugador_seleccionado, stats, fig_radar, fig_heatmap, fig_pases, f
     </html>
     """
     
-    # Crear archivo HTML temporal y abrirlo en el navegador
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".html", mode="w", encoding="utf-8") as f:
-        f.write(html)
-        filename = f.name
-    
-    # Abrir el archivo HTML en una nueva pestaña del navegador
-    webbrowser.open('file://' + filename)
+    return html
 
 def main():
     st.title("Análisis de Jugadores")
 
-    input_folder = "./data/partidos_liverpool"
-    output_folder = "./data/jugadores"
+    # Equipo elegido en la barra lateral
+    equipo = st.session_state.get("equipo", EQUIPO_POR_DEFECTO)
+    input_folder = CARPETA_PARTIDOS
 
     if not os.path.exists(input_folder) or not os.listdir(input_folder):
         st.error("No se encontraron datos de partidos. Asegúrate de ejecutar el scraping primero.")
         return
 
-    jugadores_disponibles = obtener_jugadores_liverpool(input_folder)
+    with medir("jugadores.lista", equipo=equipo):
+        jugadores_disponibles = obtener_jugadores_equipo(input_folder, equipo)
     if not jugadores_disponibles:
         st.error("No se encontraron jugadores en los archivos de datos.")
         return
 
+    # Al cambiar de equipo el jugador elegido antes ya no está entre las opciones
+    if st.session_state.get("jugador_seleccionado") not in jugadores_disponibles:
+        st.session_state.pop("jugador_seleccionado", None)
+
     jugador_seleccionado = st.selectbox(
         "Selecciona un jugador",
         jugadores_disponibles,
@@ -424,99 +375,72 @@ def main():
         key="jugador_seleccionado",
     )
 
+    # Sumas prefijas por jornada de la plantilla: cada rango de jornadas se responde sin releer eventos
+    with medir("jugadores.prefijos", equipo=equipo):
+        prefijos = cargar_prefijos_jugadores(input_folder, equipo)
+    ventana = selector_ventana(prefijos["calendario"], "ventana_jugador")
+    mostrar_por_90 = st.toggle("Métricas por 90 minutos", key="por_90_jugador")
+
     if jugador_seleccionado:
-        sanitized_name = jugador_seleccionado.lower().replace(" ", "_")
-        archivo_filtrado = os.path.join(output_folder, f"{sanitized_name}_eventos.csv")
-
-        if not os.path.exists(archivo_filtrado):
-            archivo_filtrado = filtrar_y_limpiar_eventos_jugador(input_folder, output_folder, jugador_seleccionado)
-
-        if archivo_filtrado and os.path.exists(archivo_filtrado):
-            df_jugador = pd.read_csv(archivo_filtrado)
-            if df_jugador.empty:
-                st.warning(f"No se encontraron eventos para el jugador {jugador_seleccionado}.")
-                return
-
-            stats = calcular_estadisticas_por_jugador(df_jugador, jugador_seleccionado)
-
-            try:
-                params = ['Goals', '% Pass Successful', '% Take On Successful', 'Dispossessed',
-                          '% Aerial Successful', '% Tackle Successful', 'Ball Recovery',
-                          'Interception', 'Clearance']
-                min_range = [0] * len(params)
-                max_range = [10, 100, 100, 5, 100, 100, 10, 10, 10]
-                fig_radar = generate_radar_chart(df_jugador, params, min_range, max_range)
-            except Exception as e:
-                st.error(f"Error generando radar chart: {e}")
-                fig_radar = None
-
-            try:
-                fig_heatmap = generar_heatmap(df_jugador)
-            except Exception as e:
-                st.error(f"Error generando heatmap: {e}")
-                fig_heatmap = None
-
-            try:
-                fig_pases = generar_campograma_pases(df_jugador)
-            except Exception as e:
-                st.error(f"Error generando campograma de pases: {e}")
-                fig_pases = None
-
-            try:
-                fig_tiros = generar_campograma_tiros(df_jugador)
-            except Exception as e:
-                st.error(f"Error generando campograma de tiros: {e}")
-                fig_tiros = None
+        # Lectura directa de las filas del jugador a través del índice de jugadores, por su
+        # player_id en el equipo elegido (el nombre puede repetirse en otro equipo)
+        with medir("jugadores.carga_eventos", jugador=jugador_seleccionado):
+            player_id = id_jugador(input_folder, jugador_seleccionado, equipo)
+            df_jugador = cargar_eventos_jugador(input_folder, player_id=player_id)
+        partidos = None
+        if ventana is not None:
+            # Los gráficos necesitan las filas: solo las de los partidos del rango
+            partidos = partidos_ventana(prefijos["calendario"], normalizar_ventana(ventana, len(prefijos["calendario"])))
+            df_jugador = df_jugador[df_jugador["game_id"].isin(partidos)].reset_index(drop=True)
+
+        if not df_jugador.empty:
+            with medir("jugadores.limpieza"):
+                df_jugador = limpiar_eventos_jugador(df_jugador)
+
+            with medir("jugadores.estadisticas"):
+                if ventana is None:
+                    stats = calcular_estadisticas_por_jugador(df_jugador, jugador_seleccionado, equipo)
+                else:
+                    stats = calcular_estadisticas_ventana(prefijos, player_id, ventana)
+                minutos = minutos_jugador(input_folder, player_id, equipo, ventana)
+
+            # La exportación usa siempre los totales; en pantalla se puede ver por 90 minutos
+            st.caption(f"Minutos jugados: {minutos}")
+            stats_pantalla = estadisticas_por_90(stats, minutos) if mostrar_por_90 else stats
+
+            # Cada gráfico ocupa un marcador que se llena cuando su imagen está lista
+            marcadores = {}
 
             # Primera fila
             col1, col2, col3 = st.columns([1, 2, 1], gap="small")
 
             with col1:
                 st.markdown("<div style='margin-top: 60px; margin-left: 40px;'>", unsafe_allow_html=True)
-                col1.metric("Acciones Defensivas", stats["acciones_defensivas"])
-                col1.metric("Acciones Ofensivas", stats["acciones_ofensivas"])
+                col1.metric("Acciones Defensivas", stats_pantalla["acciones_defensivas"])
+                col1.metric("Acciones Ofensivas", stats_pantalla["acciones_ofensivas"])
                 st.markdown("</div>", unsafe_allow_html=True)
 
             with col2:
-                if fig_radar is not None:
-                    st.image(fig_to_buffer(fig_radar), width=350)
+                marcadores[GRAFICO_RADAR] = marcador_grafico(GRAFICO_RADAR, 350)
 
             with col3:
                 # Añadir margen superior para alinear con el radar chart
                 st.markdown("<div style='margin-top: 30px;'></div>", unsafe_allow_html=True)
                 
-                # Buscar imagen del jugador
-                player_img_path = f"images/fotos_jugadores/{jugador_seleccionado}.jpg"
-                if os.path.exists(player_img_path):
-                    # Si existe la foto, mostrarla
-                    img = Image.open(player_img_path)
-                    st.image(img, width=120)  # Reducir el tamaño a 120px
+                # Miniatura de la foto del jugador, buscada por su player_id
+                with medir("jugadores.foto"):
+                    foto_jugador = miniatura_por_id(player_id, 120, carpeta_partidos=input_folder)
+                if foto_jugador is not None:
+                    st.image(foto_jugador, width=120)
                 else:
-                    # Si no existe, buscar alternativas de nombre
-                    found = False
-                    for filename in os.listdir("images/fotos_jugadores"):
-                        if filename.lower().endswith(".jpg"):
-                            nombre_archivo = os.path.splitext(filename)[0].lower()
-                            nombre_jugador = jugador_seleccionado.lower()
-                            
-                            # Verificar si el nombre del archivo contiene el nombre del jugador o viceversa
-                            if nombre_jugador in nombre_archivo or all(part in nombre_archivo for part in nombre_jugador.split()):
-                                img = Image.open(f"images/fotos_jugadores/{filename}")
-                                st.image(img, width=120)  # Reducir el tamaño a 120px
-                                st.markdown(f"<div style='text-align: center; font-weight: bold; color: #c8102e;'>{jugador_seleccionado}</div>", unsafe_allow_html=True)
-                                found = True
-                                break
-                    
-                    # Si no se encontró ninguna coincidencia, mostrar un placeholder
-                    if not found:
-                        st.markdown("<div style='width: 120px; height: 120px; background-color: #f0f0f0; display: flex; justify-content: center; align-items: center; border-radius: 50%; margin: 0 auto;'>Sin imagen</div>", unsafe_allow_html=True)
+                    # Si no hay foto, mostrar un placeholder
+                    st.markdown("<div style='width: 120px; height: 120px; background-color: #f0f0f0; display: flex; justify-content: center; align-items: center; border-radius: 50%; margin: 0 auto;'>Sin imagen</div>", unsafe_allow_html=True)
 
             # Segunda fila
             col1, col2, col3 = st.columns([1.5, 1, 1.5], gap="small")
 
             with col1:
-                if fig_heatmap is not None:
-                    st.image(fig_to_buffer(fig_heatmap))
+                marcadores[GRAFICO_HEATMAP] = marcador_grafico(GRAFICO_HEATMAP)
 
             with col2:
                 # Contenedor centrado con ancho fijo
@@ -550,30 +474,49 @@ def main():
                     </style>
                 """, unsafe_allow_html=True)
                 
-                col2.metric("% Pases Exitosos", f"{stats['porcentaje_pases_exitosos']}%")
-                col2.metric("Pases Clasificados", stats["pases_clasificados"])
+                col2.metric("% Pases Exitosos", f"{stats_pantalla['porcentaje_pases_exitosos']}%")
+                col2.metric("Pases Clasificados", stats_pantalla["pases_clasificados"])
                 st.markdown("</div>", unsafe_allow_html=True)
 
             with col3:
-                if fig_pases is not None:
-                    st.image(fig_to_buffer(fig_pases))
+                marcadores[GRAFICO_PASES] = marcador_grafico(GRAFICO_PASES)
 
             # Tercera fila
             col1, col2 = st.columns([1, 1], gap="medium")
 
             with col1:
-                if fig_tiros is not None:
-                    st.image(fig_to_buffer(fig_tiros), width=400)
+                marcadores[GRAFICO_TIROS] = marcador_grafico(GRAFICO_TIROS, 400)
 
             with col2:
                 # Añadimos espacio vertical antes del resumen de tiros
                 st.markdown("<div style='margin-top: 30px;'>", unsafe_allow_html=True)
                 st.markdown("#### Resumen de Tiros")
                 col21, col22, col23 = st.columns(3, gap="small")
-                col21.metric("Missed Shots", stats["missed_shots"])
-                col22.metric("Saved Shots", stats["saved_shots"])
-                col23.metric("Goals", stats["goals"])
+                col21.metric("Missed Shots", stats_pantalla["missed_shots"])
+                col22.metric("Saved Shots", stats_pantalla["saved_shots"])
+                col23.metric("Goals", stats_pantalla["goals"])
                 
+                # Los botones necesitan las imágenes: se dibujan después de renderizarlas
+                zona_botones = st.container()
+
+            # El heatmap sale de sumar el tensor del almacén en los partidos del rango
+            with medir("jugadores.heatmap"):
+                heatmap = conteos_heatmap_jugador(input_folder, player_id, equipo, partidos)
+
+            # Solo se renderizan los gráficos que no están en caché, todos a la vez
+            imagenes = {}
+            for grafico, png, error in renderizar_graficos_jugador(df_jugador, list(marcadores), heatmap=heatmap):
+                imagenes[grafico] = png
+                ancho, marcador = marcadores[grafico]
+                if error is not None:
+                    marcador.error(f"Error generando {ETIQUETAS_GRAFICOS[grafico]}: {error}")
+                elif png is not None:
+                    marcador.image(png, width=ancho)
+                else:
+                    marcador.empty()
+            img_radar, img_heatmap, img_pases, img_tiros = (imagenes.get(g) for g in GRAFICOS_JUGADOR)
+
+            with zona_botones:
                 # Más espacio antes de los botones
                 st.markdown("<div style='margin-top: 50px;'>", unsafe_allow_html=True)
                 btn_col1, btn_col2 = st.columns(2)
@@ -596,23 +539,65 @@ def main():
                 """
                 st.markdown(button_style, unsafe_allow_html=True)
                 
-                # Botones con sus respectivas funciones
+                # Las exportaciones se construyen en memoria y se entregan como descarga
+                # (webbrowser.open abriría el navegador del servidor, no el del usuario)
+                completo = all([img_radar, img_heatmap, img_pases, img_tiros])
+                nombre_archivo = os.path.splitext(nombre_archivo_informe(jugador_seleccionado))[0]
+                # Las exportaciones se preparan a pedido y se guardan en la sesión con esta clave:
+                # con otro equipo, otra ventana o datos nuevos en el almacén (otra huella) se vuelven a preparar
+                clave_exportacion = (jugador_seleccionado, equipo, actualizar_almacen(input_folder)["huella"], ventana)
+
                 with btn_col1:
-                    if st.button("🖨️ Imprimir", key="print_button"):
-                        if all([fig_radar, fig_heatmap, fig_pases, fig_tiros]):
-                            print_page(jugador_seleccionado, stats, 
-                                      fig_radar, fig_heatmap, fig_pases, fig_tiros)
-                        else:
-                            st.error("No se pudieron generar todas las visualizaciones necesarias para imprimir")
-                
+                    # El HTML de impresión lleva las imágenes en base64: solo se arma al pedirlo
+                    clave_impresion = clave_exportacion + (DPI_EXPORTACION["impresion"],)
+                    if st.session_state.get("impresion_jugador", (None, None))[0] != clave_impresion:
+                        if st.button("🖨️ Preparar impresión", key="print_prepare_button"):
+                            if completo:
+                                with medir("jugadores.html_impresion"):
+                                    imagenes_impresion = imagenes_exportacion(df_jugador, "impresion", imagenes, heatmap)
+                                    st.session_state["impresion_jugador"] = (
+                                        clave_impresion,
+                                        generar_html_impresion(jugador_seleccionado, stats, *imagenes_impresion,
+                                                               equipo=equipo),
+                                    )
+                            else:
+                                st.error("No se pudieron generar todas las visualizaciones necesarias para imprimir")
+                    if st.session_state.get("impresion_jugador", (None, None))[0] == clave_impresion:
+                        st.download_button(
+                            "🖨️ Imprimir",
+                            data=st.session_state["impresion_jugador"][1],
+                            file_name=f"{nombre_archivo}.html",
+                            mime="text/html",
+                            key="print_button",
+                        )
+
                 with btn_col2:
-                    if st.button("📄 Generar PDF", key="pdf_button"):
-                        if all([fig_radar, fig_heatmap, fig_pases, fig_tiros]):
-                            generate_pdf(jugador_seleccionado, stats, 
-                                      fig_radar, fig_heatmap, fig_pases, fig_tiros)
-                        else:
-                            st.error("No se pudieron generar todas las visualizaciones necesarias para el PDF")
+                    # El PDF es caro (imágenes a 300 DPI): se prepara a pedido, como la impresión
+                    clave_pdf = clave_exportacion + (DPI_EXPORTACION["pdf"],)
+                    if st.session_state.get("pdf_jugador", (None, None))[0] != clave_pdf:
+                        if st.button("📄 Generar PDF", key="pdf_button"):
+                            if completo:
+                                # fpdf solo se importa cuando se pide un PDF
+                                from procesamiento.pdf_jugador import construir_pdf
+
+                                with medir("jugadores.pdf"):
+                                    imagenes_pdf = imagenes_exportacion(df_jugador, "pdf", imagenes, heatmap)
+                                    st.session_state["pdf_jugador"] = (
+                                        clave_pdf, construir_pdf(jugador_seleccionado, stats, imagenes_pdf, equipo)
+                                    )
+                            else:
+                                st.error("No se pudieron generar todas las visualizaciones necesarias para el PDF")
+                    if st.session_state.get("pdf_jugador", (None, None))[0] == clave_pdf:
+                        st.download_button(
+                            "📄 Descargar PDF",
+                            data=st.session_state["pdf_jugador"][1],
+                            file_name=f"{nombre_archivo}.pdf",
+                            mime="application/pdf",
+                            key="pdf_download_button",
+                        )
                 st.markdown("</div>", unsafe_allow_html=True)
+        else:
+            st.warning(f"No se encontraron eventos para el jugador {jugador_seleccionado} en los partidos seleccionados.")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
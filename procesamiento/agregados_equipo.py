@@ -0,0 +1,283 @@
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+from procesamiento.almacen_eventos import (
+    CARPETA_PARTIDOS, EQUIPO_POR_DEFECTO, actualizar_almacen, cargar_agregados_partido, cargar_eventos,
+    cargar_indice_jugadores, ruta_almacen
+)
+from procesamiento.agregados_partido import METRICAS_ADITIVAS
+from procesamiento.minutos_jugados import MINUTOS_POR_90, por_90
+from procesamiento.estadisticas_jugadores import COLUMNAS_METRICAS, calcular_cubo_por_partido, metricas_desde_cubo
+from procesamiento.ventanas_partidos import (
+    calendario_equipo, normalizar_ventana, partidos_ventana, sumar_ventana, sumas_prefijas
+)
+from procesamiento.rendimiento import medir, registrar_cache
+
+# Métricas por jugador y jornada con las que se construyen las sumas prefijas del equipo
+METRICAS_VENTANA = METRICAS_ADITIVAS + ['partidos_jugados']
+
+# Métricas que también se guardan por 90 minutos (columna '<métrica>_p90')
+METRICAS_POR_90 = [metrica for metrica in METRICAS_ADITIVAS if metrica != 'minutos']
+
+# Minutos mínimos en la ventana para entrar en los rankings por 90 (con pocos minutos se disparan)
+MINUTOS_MINIMOS_POR_90 = 90
+
+# Ventanas de partidos (jornadas y sede) cuyos agregados se conservan por equipo
+MAX_VENTANAS_CACHE = 64
+
+# Caché de agregados por (almacén, equipo); cada entrada guarda la huella con la que se calculó
+_CACHE_AGREGADOS = {}
+
+# Sumas prefijas de la ficha de jugador por (almacén, equipo) -> (huella, dict)
+_CACHE_PREFIJOS_JUGADORES = {}
+
+# Agregados parciales por (almacén, equipo) -> {'partidos': {game_id: sha256}, 'parciales': DataFrame}
+_CACHE_PARCIALES = {}
+
+
+def _actualizar_parciales(carpeta_partidos, manifiesto, equipo):
+    """
+    Mantiene en memoria los agregados parciales de los partidos de un equipo.
+
+    Solo se leen los parciales de los partidos nuevos o modificados desde la última
+    llamada; los de partidos eliminados o reemplazados se descartan. Los partidos de
+    otros equipos de la liga no se leen nunca.
+    """
+    clave = (ruta_almacen(carpeta_partidos), equipo)
+    actuales = {
+        info['game_id']: info['sha256'] for info in manifiesto['partidos'].values() if equipo in info['equipos']
+    }
+    en_cache = _CACHE_PARCIALES.get(clave)
+    if en_cache is None:
+        en_cache = {'partidos': {}, 'parciales': cargar_agregados_partido(carpeta_partidos, game_ids=[])}
+
+    vigentes = {g for g, sha in en_cache['partidos'].items() if actuales.get(g) == sha}
+    nuevos = [g for g in actuales if g not in vigentes]
+    if not nuevos and len(vigentes) == len(en_cache['partidos']):
+        return en_cache['parciales']
+
+    parciales = en_cache['parciales']
+    parciales = parciales[parciales['game_id'].isin(vigentes)]
+    if nuevos:
+        parciales = pd.concat([parciales, cargar_agregados_partido(carpeta_partidos, game_ids=nuevos)],
+                              ignore_index=True)
+    _CACHE_PARCIALES[clave] = {'partidos': {g: actuales[g] for g in actuales}, 'parciales': parciales}
+    return parciales
+
+
+def _prefijos_equipo(parciales, calendario, equipo):
+    """
+    Ordena los agregados parciales del equipo en un arreglo jugador × jornada × métrica y
+    calcula sus sumas prefijas por sede.
+    """
+    del_equipo = parciales[parciales['team'] == equipo]
+    jugadores = pd.Index(sorted(del_equipo['player'].unique()), name='player')
+    valores = np.zeros((len(jugadores), len(calendario), len(METRICAS_VENTANA)), dtype='int64')
+    filas = jugadores.get_indexer(del_equipo['player'])
+    jornadas = np.searchsorted(calendario['game_id'].to_numpy(), del_equipo['game_id'].to_numpy())
+    # Una fila de parciales por (partido, equipo, jugador): cada celda se asigna una sola vez
+    valores[filas, jornadas, :len(METRICAS_ADITIVAS)] = del_equipo[METRICAS_ADITIVAS].to_numpy()
+    valores[filas, jornadas, len(METRICAS_ADITIVAS)] = 1
+    return {'jugadores': jugadores, 'sumas': sumas_prefijas(valores, calendario['local'].to_numpy())}
+
+
+def _totales_ventana(prefijos, ventana):
+    """
+    Totales por jugador en la ventana, con cada métrica también por 90 minutos; quedan fuera
+    los que no jugaron ningún partido de ella.
+    """
+    totales = pd.DataFrame(sumar_ventana(prefijos['sumas'], ventana), columns=METRICAS_VENTANA)
+    totales.insert(0, 'player', prefijos['jugadores'])
+    totales = totales[totales['partidos_jugados'] > 0].reset_index(drop=True)
+    por_90_minutos = por_90(totales[METRICAS_POR_90].to_numpy(), totales[['minutos']].to_numpy())
+    totales[[f'{metrica}_p90' for metrica in METRICAS_POR_90]] = por_90_minutos
+    return totales
+
+
+def _ranking_por_90(tabla, metrica):
+    """Ordena una tabla por '<metrica>_p90' dejando fuera a los jugadores con menos de MINUTOS_MINIMOS_POR_90."""
+    tabla = tabla[tabla['minutos'] >= MINUTOS_MINIMOS_POR_90]
+    return tabla.sort_values(by=f'{metrica}_p90', ascending=False, kind='stable').reset_index(drop=True)
+
+
+def _construir_agregados(prefijos, calendario, ventana, equipo, huella):
+    jugadores = _totales_ventana(prefijos, ventana)
+    total_partidos = len(partidos_ventana(calendario, ventana))
+    ranking_defensivo = jugadores.loc[
+        jugadores['defensive_actions'] > 0, ['player', 'defensive_actions', 'minutos', 'defensive_actions_p90']
+    ]
+    ranking_defensivo = ranking_defensivo.sort_values(by='defensive_actions', ascending=False, kind='stable')
+
+    metricas_pases = jugadores.loc[
+        jugadores['total_pases'] > 0,
+        ['player', 'total_pases', 'pases_exitosos', 'pases_clasificados', 'partidos_jugados', 'minutos',
+         'pases_clasificados_p90']
+    ].copy()
+    metricas_pases.insert(
+        4, 'porcentaje_exitoso', (metricas_pases['pases_exitosos'] / metricas_pases['total_pases']) * 100
+    )
+
+    goles = jugadores.loc[jugadores['goles'] > 0, ['player', 'goles', 'minutos', 'goles_p90']]
+    goles = goles.sort_values(by='goles', ascending=False, kind='stable')
+
+    return {
+        'huella': huella,
+        'equipo': equipo,
+        'ventana': ventana,
+        'calendario': calendario,
+        'total_partidos': total_partidos,
+        'jugadores': jugadores,
+        'ranking_defensivo': ranking_defensivo.reset_index(drop=True),
+        'metricas_pases': metricas_pases.reset_index(drop=True),
+        'goles': goles.reset_index(drop=True),
+        # Los mismos rankings ordenados por 90 minutos, ya preparados para la página
+        'ranking_defensivo_p90': _ranking_por_90(ranking_defensivo, 'defensive_actions'),
+        'goles_p90': _ranking_por_90(goles, 'goles'),
+        # Gráficos ya renderizados (bytes PNG) para esta versión de los datos
+        'graficos': {},
+    }
+
+
+def calcular_agregados_equipo(carpeta_partidos=CARPETA_PARTIDOS, equipo=EQUIPO_POR_DEFECTO, ventana=None):
+    """
+    Calcula todos los agregados que muestra la página de equipo.
+
+    Los agregados parciales que la ingesta guarda por partido se ordenan por jornada y se
+    acumulan en sumas prefijas por sede: los totales de cualquier ventana de jornadas
+    contiguas salen de dos accesos por métrica, sin volver a recorrer los eventos.
+    Cuando llega un partido nuevo solo se leen sus parciales. El resultado se guarda en
+    caché y solo se recalcula cuando cambia la huella del almacén de eventos (es decir,
+    cuando cambia algún CSV de la carpeta de partidos).
+    Los DataFrames retornados son compartidos: no deben modificarse en el llamador.
+
+    Parámetros:
+    - carpeta_partidos (str): Carpeta con los CSV de partidos.
+    - equipo (str): Nombre del equipo a analizar.
+    - ventana (tuple): (inicio, fin, sede) con las jornadas [inicio, fin) y una clave de SEDES.
+      None = toda la temporada.
+
+    Retorna:
+    - dict: Con las claves 'huella', 'equipo', 'ventana', 'calendario', 'total_partidos',
+      'jugadores' (todas las métricas por jugador, con minutos y columnas '_p90'),
+      'ranking_defensivo', 'metricas_pases', 'goles', 'ranking_defensivo_p90', 'goles_p90' y 'graficos'.
+    """
+    manifiesto = actualizar_almacen(carpeta_partidos)
+    huella = manifiesto['huella']
+    clave = (ruta_almacen(carpeta_partidos), equipo)
+
+    agregados = _CACHE_AGREGADOS.get(clave)
+    vigente = agregados is not None and agregados['huella'] == huella
+    registrar_cache('agregados', vigente)
+    if not vigente:
+        with medir('agregados.construir', equipo=equipo):
+            parciales = _actualizar_parciales(carpeta_partidos, manifiesto, equipo)
+            calendario = calendario_equipo(manifiesto, equipo)
+            prefijos = _prefijos_equipo(parciales, calendario, equipo)
+            agregados = _construir_agregados(prefijos, calendario, normalizar_ventana(None, len(calendario)),
+                                             equipo, huella)
+            agregados.update(prefijos=prefijos, ventanas=OrderedDict())
+        _CACHE_AGREGADOS[clave] = agregados
+
+    ventana = normalizar_ventana(ventana, len(agregados['calendario']))
+    if ventana == agregados['ventana']:
+        return agregados
+    ventanas = agregados['ventanas']
+    registrar_cache('agregados_ventana', ventana in ventanas)
+    if ventana not in ventanas:
+        with medir('agregados.ventana', equipo=equipo):
+            ventanas[ventana] = _construir_agregados(agregados['prefijos'], agregados['calendario'], ventana,
+                                                     equipo, huella)
+        if len(ventanas) > MAX_VENTANAS_CACHE:
+            ventanas.popitem(last=False)
+    ventanas.move_to_end(ventana)
+    return ventanas[ventana]
+
+
+def filtrar_por_participacion(agregados, min_participacion=0.7):
+    """
+    Retorna las métricas de pases de los jugadores que jugaron al menos ese porcentaje de los
+    minutos de la ventana (90 por partido).
+    """
+    min_minutos_requeridos = agregados['total_partidos'] * MINUTOS_POR_90 * min_participacion
+    metricas = agregados['metricas_pases']
+    return metricas[metricas['minutos'] >= min_minutos_requeridos]
+
+
+def obtener_grafico(agregados, nombre, graficar, datos):
+    """Renderiza un gráfico del equipo una sola vez por versión de los datos y retorna sus bytes PNG."""
+    graficos = agregados['graficos']
+    registrar_cache('graficos_equipo', nombre in graficos)
+    if nombre not in graficos:
+        graficos[nombre] = graficar(datos).getvalue()
+    return graficos[nombre]
+
+
+def cargar_prefijos_jugadores(carpeta_partidos=CARPETA_PARTIDOS, equipo=EQUIPO_POR_DEFECTO):
+    """
+    Retorna las sumas prefijas por jornada del cubo de conteos de la ficha de los jugadores de un equipo.
+
+    Se construyen una vez por huella del almacén con una sola pasada sobre los eventos del
+    equipo; después, las métricas de la ficha en cualquier ventana se obtienen con
+    estadisticas_ventana sin leer eventos.
+
+    Retorna:
+    - dict: 'calendario', 'jugadores', 'player_ids' (alineado con 'jugadores'), 'tipos', 'conteos' y
+      'pases_clasificados' (sumas prefijas por sede).
+    """
+    manifiesto = actualizar_almacen(carpeta_partidos)
+    clave = (ruta_almacen(carpeta_partidos), equipo)
+    en_cache = _CACHE_PREFIJOS_JUGADORES.get(clave)
+    registrar_cache('prefijos_jugadores', en_cache is not None and en_cache[0] == manifiesto['huella'])
+    if en_cache is None or en_cache[0] != manifiesto['huella']:
+        with medir('agregados.prefijos_jugadores', equipo=equipo):
+            calendario = calendario_equipo(manifiesto, equipo)
+            eventos = cargar_eventos(carpeta_partidos, columnas=['game_id', 'team', 'player', 'type', 'outcome_type',
+                                                                 'qualifier_mask'], equipo=equipo)
+            cubo = calcular_cubo_por_partido(eventos[eventos['team'] == equipo], calendario['game_id'].to_numpy())
+            local = calendario['local'].to_numpy()
+            ids = cargar_indice_jugadores(carpeta_partidos, equipo).drop_duplicates('player').set_index('player')
+            player_ids = pd.Index(ids['player_id'].reindex(cubo['jugadores']).to_numpy(), name='player_id')
+            prefijos = dict(cubo, calendario=calendario, player_ids=player_ids,
+                            conteos=sumas_prefijas(cubo['conteos'], local),
+                            pases_clasificados=sumas_prefijas(cubo['pases_clasificados'], local))
+        en_cache = (manifiesto['huella'], prefijos)
+        _CACHE_PREFIJOS_JUGADORES[clave] = en_cache
+    return en_cache[1]
+
+
+def estadisticas_ventana(prefijos, jugador=None, ventana=None, player_id=None):
+    """
+    Calcula las métricas de la ficha de un jugador en una ventana de jornadas.
+
+    Parámetros:
+    - prefijos (dict): Resultado de cargar_prefijos_jugadores.
+    - jugador (str): Nombre del jugador.
+    - ventana (tuple): (inicio, fin, sede). None = toda la temporada.
+    - player_id (int): Identificador del jugador. Tiene prioridad sobre jugador.
+
+    Retorna:
+    - dict: Métricas de metricas_desde_cubo (ficha y radar); todas valen 0 si el jugador no
+      tiene eventos con el equipo.
+    """
+    ventana = normalizar_ventana(ventana, len(prefijos['calendario']))
+    if player_id is not None:
+        posicion = np.flatnonzero(prefijos['player_ids'] == player_id)[:1]
+    else:
+        posicion = prefijos['jugadores'].get_indexer([jugador])
+        posicion = posicion[posicion >= 0]
+    if not len(posicion):
+        return {columna: 0 for columna in COLUMNAS_METRICAS}
+    cubo = {
+        'conteos': sumar_ventana(prefijos['conteos'], ventana, posicion),
+        'pases_clasificados': sumar_ventana(prefijos['pases_clasificados'], ventana, posicion),
+        'jugadores': prefijos['jugadores'][posicion],
+        'tipos': prefijos['tipos'],
+    }
+    metricas = metricas_desde_cubo(cubo)
+    return {columna: metricas[columna].iloc[0].item() for columna in metricas.columns}
+
+
+def limpiar_cache_agregados():
+    _CACHE_AGREGADOS.clear()
+    _CACHE_PARCIALES.clear()
+    _CACHE_PREFIJOS_JUGADORES.clear()
@@ -0,0 +1,52 @@
+import pandas as pd
+from procesamiento.calificadores import tiene_calificador
+from procesamiento.minutos_jugados import ESQUEMA_MINUTOS, calcular_minutos_partido
+
+# Tipos de evento que cuentan como acción defensiva
+ACCIONES_DEFENSIVAS = ['Clearance', 'Tackle', 'BallRecovery', 'Interception']
+
+# Calificadores que convierten un pase en "pase clasificado"
+TIPOS_PASES_IMPORTANTES = [
+    "IntentionalAssist", "IntentionalGoalAssist", "KeyPass", "ShotAssist", "BigChanceCreated"
+]
+
+# Métricas aditivas: el total de la temporada es la suma de las de cada partido
+METRICAS_ADITIVAS = ['defensive_actions', 'total_pases', 'pases_exitosos', 'pases_clasificados', 'goles', 'minutos']
+
+# Tipos de los agregados parciales: una fila por (partido, equipo, jugador), con la tabla de
+# minutos ya unida (entrada y salida no son aditivas, se guardan solo como referencia)
+ESQUEMA_AGREGADOS_PARTIDO = dict(
+    {"game_id": "int64", "team": "object", "player": "object"},
+    **{metrica: "int64" for metrica in METRICAS_ADITIVAS},
+    minuto_entrada=ESQUEMA_MINUTOS["minuto_entrada"],
+    minuto_salida=ESQUEMA_MINUTOS["minuto_salida"],
+)
+
+
+def calcular_agregados_partido(df):
+    """
+    Calcula los agregados parciales de un partido por equipo y jugador.
+
+    Parámetros:
+    - df (DataFrame): Eventos de un único partido con 'qualifier_mask' (o 'qualifiers').
+
+    Retorna:
+    - DataFrame: Columnas de ESQUEMA_AGREGADOS_PARTIDO, con los minutos de calcular_minutos_partido.
+      Los eventos sin jugador quedan fuera.
+    """
+    tipo = df['type']
+    es_pase = tipo == 'Pass'
+    indicadores = pd.DataFrame({
+        'game_id': df['game_id'],
+        'team': df['team'],
+        'player': df['player'],
+        'defensive_actions': tipo.isin(ACCIONES_DEFENSIVAS),
+        'total_pases': es_pase,
+        'pases_exitosos': es_pase & (df['outcome_type'] == 'Successful'),
+        'pases_clasificados': es_pase & tiene_calificador(df, TIPOS_PASES_IMPORTANTES),
+        'goles': tipo == 'Goal',
+    })
+    conteos = [metrica for metrica in METRICAS_ADITIVAS if metrica != 'minutos']
+    parciales = indicadores.groupby(['game_id', 'team', 'player'], observed=True)[conteos].sum().reset_index()
+    parciales = parciales.merge(calcular_minutos_partido(df), on=['game_id', 'team', 'player'], how='left')
+    return parciales[list(ESQUEMA_AGREGADOS_PARTIDO)].astype(ESQUEMA_AGREGADOS_PARTIDO)
@@ -0,0 +1,658 @@
+import os
+import re
+import json
+import hashlib
+import argparse
+from difflib import SequenceMatcher
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+from procesamiento.calificadores import BANDERAS_CALIFICADORES, parsear_calificadores, mascara_desde_tabla
+from procesamiento.indice_jugadores import ESQUEMA_INDICE_JUGADORES, construir_indice_partido
+from procesamiento.agregados_partido import ESQUEMA_AGREGADOS_PARTIDO, calcular_agregados_partido
+from procesamiento.minutos_jugados import ESQUEMA_MINUTOS
+from procesamiento.esquema_compacto import COLUMNAS_CATEGORICAS, categorias_desde_valores, compactar_eventos
+from procesamiento.mapas_calor import BINS_HEATMAP, TIPO_CONTEOS, calcular_heatmaps_partido
+from procesamiento.posesiones import asignar_posesiones
+from procesamiento.rendimiento import medido, medir
+# Rutas y utilidades sin pandas ni pyarrow (se re-exportan para el resto de módulos)
+from procesamiento.rutas_almacen import (
+    CARPETA_ALMACEN, CARPETA_PARTIDOS, EQUIPO_POR_DEFECTO, NOMBRE_MANIFIESTO, _leer_manifiesto, equipos_desde_nombre,
+    escribir_atomico, hash_archivo, partidos_por_equipo, ruta_almacen
+)
+
+# Versión del esquema: si cambia, el almacén se reconstruye completo
+VERSION_ESQUEMA = 9
+
+# Tipos canónicos de cada columna del CSV de WhoScored
+ESQUEMA_EVENTOS = {
+    "game_id": "int64",
+    "period": "object",
+    "minute": "int64",
+    "second": "float64",
+    "expanded_minute": "int64",
+    "type": "object",
+    "outcome_type": "object",
+    "team_id": "int64",
+    "team": "object",
+    "player_id": "float64",
+    "player": "object",
+    "x": "float64",
+    "y": "float64",
+    "end_x": "float64",
+    "end_y": "float64",
+    "goal_mouth_y": "float64",
+    "goal_mouth_z": "float64",
+    "blocked_x": "float64",
+    "blocked_y": "float64",
+    "qualifiers": "object",
+    "is_touch": "boolean",
+    "is_shot": "boolean",
+    "is_goal": "boolean",
+    "card_type": "object",
+    "related_event_id": "float64",
+    "related_player_id": "float64",
+}
+
+# Columnas calculadas durante la ingesta
+COLUMNAS_DERIVADAS = {
+    "qualifier_mask": "int64",
+    "possession_id": "int32",
+}
+
+# Tipos de la tabla larga de calificadores (una fila por calificador de cada evento)
+ESQUEMA_CALIFICADORES = {
+    "game_id": "int64",
+    "fila": "int32",
+    "qualifier_id": "int16",
+    "nombre": "object",
+    "valor": "object",
+}
+
+# Archivos que genera la ingesta por partido: clave del manifiesto -> (subcarpeta, extensión)
+PARTICIONES = {
+    "ruta": ("partidos", "parquet"),
+    "ruta_calificadores": ("calificadores", "parquet"),
+    "ruta_jugadores": ("jugadores", "arrow"),
+    "ruta_indice_jugadores": ("indice_jugadores", "parquet"),
+    "ruta_agregados": ("agregados", "parquet"),
+    "ruta_heatmaps": ("heatmaps", "npy"),
+}
+
+# Subcarpeta de los tensores de heatmaps consolidados (jugador × partido × rejilla)
+CARPETA_TENSORES = "tensores"
+
+# Índice de jugadores cargado en memoria por almacén: carpeta -> (huella, DataFrame)
+_CACHE_INDICE_JUGADORES = {}
+
+# Tensores de heatmaps abiertos con memory-map: (carpeta, equipo) -> (huella, dict)
+_CACHE_TENSORES = {}
+
+# Prefijo del archivo con las categorías compartidas del esquema compacto ('categorias_<huella>.json')
+PREFIJO_CATEGORIAS = "categorias_"
+
+# Categorías del esquema compacto por almacén: carpeta -> (huella, dict)
+_CACHE_CATEGORIAS = {}
+
+
+def _team_id_local(archivo, ids_equipos):
+    """
+    Identifica el team_id del equipo local de un partido.
+
+    El nombre del archivo usa los nombres del calendario ('manchester united_vs_liverpool.csv')
+    y los eventos los de WhoScored ('Man Utd'), así que no se comparan tal cual: de las dos
+    formas de emparejar local y visitante con los equipos de los eventos se elige la de
+    nombres más parecidos.
+
+    Parámetros:
+    - archivo (str): Nombre del CSV del partido.
+    - ids_equipos (dict): Nombre del equipo en los eventos -> team_id.
+
+    Retorna:
+    - int: team_id del local, o None si no hay dos equipos o el nombre no sigue el formato.
+    """
+    local, visitante = equipos_desde_nombre(archivo)
+    if local is None or len(ids_equipos) != 2:
+        return None
+
+    def parecido(a, b):
+        return SequenceMatcher(None, a.casefold(), b.casefold()).ratio()
+
+    primero, segundo = sorted(ids_equipos)
+    if parecido(local, primero) + parecido(visitante, segundo) >= parecido(local, segundo) + parecido(visitante, primero):
+        return ids_equipos[primero]
+    return ids_equipos[segundo]
+
+
+def leer_csv_partido(ruta):
+    """Lee un CSV de partido y lo convierte a los tipos de ESQUEMA_EVENTOS."""
+    df = pd.read_csv(ruta)
+    for columna, tipo in ESQUEMA_EVENTOS.items():
+        if columna not in df.columns:
+            df[columna] = pd.Series(pd.NA if tipo in ("boolean", "object") else None,
+                                    index=df.index, dtype=tipo)
+        elif tipo == "boolean":
+            df[columna] = df[columna].map({True: True, False: False, "True": True, "False": False}).astype("boolean")
+        elif tipo == "object":
+            df[columna] = df[columna].astype(object).where(df[columna].notna(), None)
+        else:
+            df[columna] = df[columna].astype(tipo)
+    return df[list(ESQUEMA_EVENTOS)]
+
+
+def _esquema_arrow(tipos):
+    vacio = pd.DataFrame({c: pd.Series(dtype=t) for c, t in tipos.items()})
+    campos = []
+    for campo in pa.Schema.from_pandas(vacio, preserve_index=False):
+        # Las columnas de texto vacías se infieren como null: forzar string
+        campos.append(pa.field(campo.name, pa.string()) if pa.types.is_null(campo.type) else campo)
+    return pa.schema(campos, metadata=pa.Schema.from_pandas(vacio, preserve_index=False).metadata)
+
+
+def _guardar_manifiesto(carpeta_almacen, manifiesto):
+    def escribir(ruta_tmp):
+        with open(ruta_tmp, "w", encoding="utf-8") as f:
+            json.dump(manifiesto, f, ensure_ascii=False, indent=2, sort_keys=True)
+    escribir_atomico(os.path.join(carpeta_almacen, NOMBRE_MANIFIESTO), escribir)
+
+
+def _huella(partidos):
+    """Huella del almacén completo a partir del hash de cada archivo fuente."""
+    sha = hashlib.sha256(f"v{VERSION_ESQUEMA};".encode("utf-8"))
+    for archivo in sorted(partidos):
+        sha.update(f"{archivo}:{partidos[archivo]['sha256']};".encode("utf-8"))
+    return sha.hexdigest()[:16]
+
+
+def _borrar_huellas_anteriores(carpeta, prefijo, extension, huella):
+    """
+    Borra los archivos '<prefijo><huella><extension>' de huellas que ya no son la actual.
+
+    Solo se borran archivos completos: los temporales de escrituras en curso (de esta u
+    otra sesión) no encajan con el patrón y se dejan en paz.
+    """
+    patron = re.compile(rf"{re.escape(prefijo)}([0-9a-f]{{16}}){re.escape(extension)}")
+    for archivo in os.listdir(carpeta):
+        coincidencia = patron.fullmatch(archivo)
+        if coincidencia is not None and coincidencia.group(1) != huella:
+            try:
+                os.remove(os.path.join(carpeta, archivo))
+            except OSError:
+                pass
+
+
+def _esquemas():
+    esquema_eventos = _esquema_arrow(dict(ESQUEMA_EVENTOS, **COLUMNAS_DERIVADAS))
+    return {
+        "eventos": esquema_eventos,
+        "calificadores": _esquema_arrow(ESQUEMA_CALIFICADORES),
+        "jugadores": esquema_eventos.insert(0, pa.field("fila", pa.int32())),
+        "indice_jugadores": _esquema_arrow(ESQUEMA_INDICE_JUGADORES),
+        "agregados": _esquema_arrow(ESQUEMA_AGREGADOS_PARTIDO),
+    }
+
+
+def _ruta_particion(clave, game_id):
+    subcarpeta, extension = PARTICIONES[clave]
+    return os.path.join(subcarpeta, f"game_id={game_id}.{extension}")
+
+
+def _escribir_parquet(df, ruta, esquema):
+    tabla = pa.Table.from_pandas(df, schema=esquema, preserve_index=False)
+    escribir_atomico(ruta, lambda ruta_tmp: pq.write_table(tabla, ruta_tmp, compression="zstd"))
+
+
+def _escribir_arrow(df, ruta, esquema):
+    # Arrow IPC sin comprimir: se lee con memory-map y se recorta sin copiar
+    tabla = pa.Table.from_pandas(df, schema=esquema, preserve_index=False)
+
+    def escribir(ruta_tmp):
+        with pa.OSFile(ruta_tmp, "wb") as sink, pa.ipc.new_file(sink, esquema) as writer:
+            writer.write_table(tabla)
+    escribir_atomico(ruta, escribir)
+
+
+def _escribir_npy(arreglo, ruta):
+    def escribir(ruta_tmp):
+        # Con un archivo abierto np.save no añade la extensión a la ruta temporal
+        with open(ruta_tmp, "wb") as f:
+            np.save(f, arreglo)
+    escribir_atomico(ruta, escribir)
+
+
+def _ingestar_partido(ruta_csv, carpeta_almacen, esquemas):
+    """Convierte un CSV de partido en sus particiones Parquet y retorna su metadato."""
+    df = leer_csv_partido(ruta_csv)
+    game_ids = df["game_id"].unique()
+    if len(game_ids) != 1:
+        raise ValueError(f"Se esperaba un único game_id en {ruta_csv} y se encontraron {len(game_ids)}.")
+    game_id = int(game_ids[0])
+
+    # Parsear los calificadores una sola vez: tabla larga + máscara de banderas por evento
+    calificadores = parsear_calificadores(df["qualifiers"])
+    df["qualifier_mask"] = mascara_desde_tabla(calificadores, len(df))
+    calificadores.insert(0, "game_id", game_id)
+
+    # Número de posesión de cada evento dentro del partido
+    df["possession_id"] = asignar_posesiones(df)
+
+    # Copia de los eventos ordenada por jugador + rango de filas de cada jugador
+    eventos_por_jugador, indice = construir_indice_partido(df)
+
+    rutas = {clave: _ruta_particion(clave, game_id) for clave in PARTICIONES}
+    _escribir_parquet(df, os.path.join(carpeta_almacen, rutas["ruta"]), esquemas["eventos"])
+    _escribir_parquet(calificadores, os.path.join(carpeta_almacen, rutas["ruta_calificadores"]),
+                      esquemas["calificadores"])
+    _escribir_arrow(eventos_por_jugador, os.path.join(carpeta_almacen, rutas["ruta_jugadores"]),
+                    esquemas["jugadores"])
+    _escribir_parquet(indice, os.path.join(carpeta_almacen, rutas["ruta_indice_jugadores"]),
+                      esquemas["indice_jugadores"])
+    # Agregados parciales del partido: la temporada se obtiene sumando los de cada partido
+    _escribir_parquet(calcular_agregados_partido(df), os.path.join(carpeta_almacen, rutas["ruta_agregados"]),
+                      esquemas["agregados"])
+    # Conteos del heatmap de cada jugador, en el orden de las filas del índice
+    _escribir_npy(calcular_heatmaps_partido(eventos_por_jugador, indice),
+                  os.path.join(carpeta_almacen, rutas["ruta_heatmaps"]))
+    ids_equipos = {equipo: int(team_id) for equipo, team_id in
+                   df[["team", "team_id"]].dropna().drop_duplicates("team").itertuples(index=False)}
+    return dict(rutas, game_id=game_id, filas=len(df), equipos=sorted(ids_equipos), ids_equipos=ids_equipos,
+                local_team_id=_team_id_local(os.path.basename(ruta_csv), ids_equipos))
+
+
+@medido("almacen.sincronizar")
+def actualizar_almacen(carpeta_partidos=CARPETA_PARTIDOS, carpeta_almacen=None):
+    """
+    Sincroniza el almacén columnar con los CSV de la carpeta de partidos.
+
+    Solo se reconstruyen las particiones de los partidos cuyo archivo fuente cambió
+    (tamaño/fecha y, si difieren, el hash del contenido); las de archivos eliminados
+    se borran.
+
+    Parámetros:
+    - carpeta_partidos (str): Carpeta con los CSV de partidos.
+    - carpeta_almacen (str): Carpeta del almacén. Por defecto se deriva de carpeta_partidos.
+
+    Retorna:
+    - dict: Manifiesto del almacén (esquema, partidos y huella).
+    """
+    if not os.path.exists(carpeta_partidos):
+        raise FileNotFoundError(f"La carpeta {carpeta_partidos} no existe. Verifica la ubicación.")
+
+    carpeta_almacen = carpeta_almacen or ruta_almacen(carpeta_partidos)
+    for subcarpeta, _ in PARTICIONES.values():
+        os.makedirs(os.path.join(carpeta_almacen, subcarpeta), exist_ok=True)
+
+    manifiesto = _leer_manifiesto(carpeta_almacen)
+    if (not manifiesto or manifiesto.get("version_esquema") != VERSION_ESQUEMA
+            or manifiesto.get("banderas_calificadores") != BANDERAS_CALIFICADORES):
+        manifiesto = {
+            "version_esquema": VERSION_ESQUEMA,
+            "esquema": dict(ESQUEMA_EVENTOS, **COLUMNAS_DERIVADAS),
+            "esquema_calificadores": ESQUEMA_CALIFICADORES,
+            "esquema_indice_jugadores": ESQUEMA_INDICE_JUGADORES,
+            "esquema_agregados": ESQUEMA_AGREGADOS_PARTIDO,
+            "banderas_calificadores": BANDERAS_CALIFICADORES,
+            "partidos": {},
+        }
+    partidos = manifiesto["partidos"]
+
+    esquemas = None
+    cambios = False
+    archivos = sorted(f for f in os.listdir(carpeta_partidos) if f.endswith(".csv"))
+
+    for archivo in archivos:
+        ruta_csv = os.path.join(carpeta_partidos, archivo)
+        estado = os.stat(ruta_csv)
+        previo = partidos.get(archivo)
+        if previo and previo["tamano"] == estado.st_size and previo["mtime_ns"] == estado.st_mtime_ns:
+            continue
+
+        sha256 = hash_archivo(ruta_csv)
+        if previo and previo["sha256"] == sha256 and os.path.exists(os.path.join(carpeta_almacen, previo["ruta"])):
+            previo.update(tamano=estado.st_size, mtime_ns=estado.st_mtime_ns)
+            cambios = True
+            continue
+
+        try:
+            esquemas = esquemas or _esquemas()
+            with medir("almacen.ingesta", archivo=archivo):
+                info = _ingestar_partido(ruta_csv, carpeta_almacen, esquemas)
+        except Exception as e:
+            print(f"[ERROR] Error ingestando {archivo}: {e}")
+            continue
+
+        local, visitante = equipos_desde_nombre(archivo)
+        partidos[archivo] = dict(info, tamano=estado.st_size, mtime_ns=estado.st_mtime_ns,
+                                 sha256=sha256, local=local, visitante=visitante)
+        cambios = True
+        if previo and previo["game_id"] != info["game_id"]:
+            _eliminar_particion(carpeta_almacen, previo, partidos)
+        print(f"[INFO] Partido ingestado en el almacén: {archivo} ({info['filas']} eventos)")
+
+    for archivo in set(partidos) - set(archivos):
+        _eliminar_particion(carpeta_almacen, partidos.pop(archivo), partidos)
+        cambios = True
+        print(f"[INFO] Partido eliminado del almacén: {archivo}")
+
+    huella = _huella(partidos)
+    if cambios or manifiesto.get("huella") != huella:
+        manifiesto["huella"] = huella
+        _guardar_manifiesto(carpeta_almacen, manifiesto)
+    return manifiesto
+
+
+def _eliminar_particion(carpeta_almacen, info, partidos):
+    """
+    Borra las particiones de un partido que ya no está en el manifiesto.
+
+    Las particiones van por game_id: si otra entrada del manifiesto tiene el mismo game_id
+    (por ejemplo, el CSV se renombró) sus archivos son los de esa entrada y no se tocan.
+    """
+    if any(otro["game_id"] == info["game_id"] for otro in partidos.values()):
+        return
+    for clave in PARTICIONES:
+        ruta = os.path.join(carpeta_almacen, info[clave])
+        if os.path.exists(ruta):
+            os.remove(ruta)
+
+
+def _leer_particiones(carpeta_partidos, clave_ruta, tipos, columnas, game_ids, equipo=None):
+    rutas, columnas = _rutas_particiones(carpeta_partidos, clave_ruta, tipos, columnas, game_ids, equipo)
+    if not rutas:
+        return pd.DataFrame({c: pd.Series(dtype=tipos[c]) for c in columnas})
+    return ds.dataset(rutas, format="parquet").to_table(columns=columnas).to_pandas()
+
+
+def _rutas_particiones(carpeta_partidos, clave_ruta, tipos, columnas, game_ids, equipo=None):
+    carpeta_almacen = ruta_almacen(carpeta_partidos)
+    manifiesto = actualizar_almacen(carpeta_partidos, carpeta_almacen)
+
+    partidos = manifiesto["partidos"].values()
+    if equipo is not None:
+        # Solo los partidos del equipo: el coste no depende del tamaño de la liga
+        partidos = [p for p in partidos if equipo in p["equipos"]]
+    if game_ids is not None:
+        seleccion = {int(g) for g in game_ids}
+        partidos = [p for p in partidos if p["game_id"] in seleccion]
+    rutas = sorted(os.path.join(carpeta_almacen, p[clave_ruta]) for p in partidos)
+
+    columnas = list(columnas) if columnas is not None else list(tipos)
+    return rutas, columnas
+
+
+def categorias_almacen(carpeta_partidos=CARPETA_PARTIDOS):
+    """
+    Retorna la lista compartida de categorías del esquema compacto para la versión actual del almacén.
+
+    Se obtiene una vez por huella recorriendo solo las columnas categóricas de los eventos y
+    se guarda junto al almacén ('categorias_<huella>.json'), de modo que todas las cargas (y
+    los procesos de renderizado) usan exactamente las mismas categorías.
+
+    Retorna:
+    - dict: columna -> lista de categorías (ver categorias_desde_valores).
+    """
+    carpeta_almacen = ruta_almacen(carpeta_partidos)
+    huella = actualizar_almacen(carpeta_partidos, carpeta_almacen)["huella"]
+    en_cache = _CACHE_CATEGORIAS.get(carpeta_almacen)
+    if en_cache is not None and en_cache[0] == huella:
+        return en_cache[1]
+
+    ruta = os.path.join(carpeta_almacen, f"{PREFIJO_CATEGORIAS}{huella}.json")
+    categorias = None
+    if os.path.exists(ruta):
+        try:
+            with open(ruta, encoding="utf-8") as f:
+                categorias = json.load(f)
+        except (OSError, ValueError):
+            categorias = None
+    if categorias is None:
+        with medir("almacen.categorias"):
+            rutas, _ = _rutas_particiones(carpeta_partidos, "ruta", ESQUEMA_EVENTOS, None, None)
+            valores = {}
+            if rutas:
+                tabla = ds.dataset(rutas, format="parquet").to_table(columns=COLUMNAS_CATEGORICAS)
+                valores = {c: pc.unique(tabla.column(c)).drop_null().to_pylist() for c in COLUMNAS_CATEGORICAS}
+            categorias = categorias_desde_valores(valores)
+
+        def escribir(ruta_tmp):
+            with open(ruta_tmp, "w", encoding="utf-8") as f:
+                json.dump(categorias, f, ensure_ascii=False)
+        escribir_atomico(ruta, escribir)
+        # Las categorías de huellas anteriores ya no se usan
+        _borrar_huellas_anteriores(carpeta_almacen, PREFIJO_CATEGORIAS, ".json", huella)
+
+    _CACHE_CATEGORIAS[carpeta_almacen] = (huella, categorias)
+    return categorias
+
+
+def cargar_eventos(carpeta_partidos=CARPETA_PARTIDOS, columnas=None, game_ids=None, equipo=None, compacto=True):
+    """
+    Lee eventos del almacén columnar leyendo solo las columnas pedidas.
+
+    Parámetros:
+    - carpeta_partidos (str): Carpeta con los CSV de partidos (el almacén se sincroniza antes de leer).
+    - columnas (list): Columnas a leer. None lee todas.
+    - game_ids (iterable): Partidos a leer. None lee toda la temporada.
+    - equipo (str): Si se indica, solo se leen los partidos que jugó ese equipo (ambos equipos).
+    - compacto (bool): Si es True (por defecto) se aplica el esquema compacto: categóricas con
+      las categorías de categorias_almacen, coordenadas float32, ids int32 y banderas bool; al
+      leer todas las columnas se quitan las que no tienen ningún valor. False = tipos de ESQUEMA_EVENTOS.
+
+    Retorna:
+    - DataFrame: Eventos de los partidos seleccionados con las columnas de ESQUEMA_EVENTOS
+      más las columnas derivadas (por ejemplo 'qualifier_mask').
+    """
+    tipos = dict(ESQUEMA_EVENTOS, **COLUMNAS_DERIVADAS)
+    if not compacto:
+        return _leer_particiones(carpeta_partidos, "ruta", tipos, columnas, game_ids, equipo)
+
+    rutas, columnas_leidas = _rutas_particiones(carpeta_partidos, "ruta", tipos, columnas, game_ids, equipo)
+    if rutas:
+        tabla = ds.dataset(rutas, format="parquet").to_table(columns=columnas_leidas)
+    else:
+        tabla = _esquemas()["eventos"].empty_table().select(columnas_leidas)
+    return compactar_eventos(tabla, categorias_almacen(carpeta_partidos), descartar_vacias=columnas is None)
+
+
+def cargar_calificadores(carpeta_partidos=CARPETA_PARTIDOS, columnas=None, game_ids=None):
+    """
+    Lee la tabla larga de calificadores generada en la ingesta.
+
+    Cada fila referencia un evento por ('game_id', 'fila'), donde 'fila' es la posición
+    del evento dentro de su partido en el almacén.
+
+    Retorna:
+    - DataFrame: Columnas de ESQUEMA_CALIFICADORES.
+    """
+    return _leer_particiones(carpeta_partidos, "ruta_calificadores", ESQUEMA_CALIFICADORES,
+                             columnas, game_ids)
+
+
+def cargar_agregados_partido(carpeta_partidos=CARPETA_PARTIDOS, game_ids=None, equipo=None):
+    """
+    Lee los agregados parciales calculados en la ingesta de cada partido.
+
+    Retorna:
+    - DataFrame: Columnas de ESQUEMA_AGREGADOS_PARTIDO, una fila por (partido, equipo, jugador).
+    """
+    return _leer_particiones(carpeta_partidos, "ruta_agregados", ESQUEMA_AGREGADOS_PARTIDO,
+                             None, game_ids, equipo)
+
+
+def cargar_minutos_jugados(carpeta_partidos=CARPETA_PARTIDOS, game_ids=None, equipo=None):
+    """
+    Lee la tabla de minutos jugados que la ingesta guarda junto a los agregados de cada partido.
+
+    Retorna:
+    - DataFrame: Columnas de ESQUEMA_MINUTOS, una fila por (partido, equipo, jugador).
+    """
+    return _leer_particiones(carpeta_partidos, "ruta_agregados", ESQUEMA_AGREGADOS_PARTIDO,
+                             list(ESQUEMA_MINUTOS), game_ids, equipo)
+
+
+def equipos_almacen(carpeta_partidos=CARPETA_PARTIDOS):
+    """Retorna la lista ordenada de equipos con al menos un partido en el almacén."""
+    return list(partidos_por_equipo(actualizar_almacen(carpeta_partidos)))
+
+
+def cargar_indice_jugadores(carpeta_partidos=CARPETA_PARTIDOS, equipo=None):
+    """
+    Retorna el índice de jugadores: una fila por (partido, jugador) con su rango de filas.
+
+    El índice se mantiene en memoria y se recarga solo cuando cambia la huella del almacén.
+    Si se indica equipo, solo se retornan las filas de los jugadores de ese equipo.
+
+    Retorna:
+    - DataFrame: Columnas de ESQUEMA_INDICE_JUGADORES.
+    """
+    carpeta_almacen = ruta_almacen(carpeta_partidos)
+    huella = actualizar_almacen(carpeta_partidos, carpeta_almacen)["huella"]
+    en_cache = _CACHE_INDICE_JUGADORES.get(carpeta_almacen)
+    if en_cache is None or en_cache[0] != huella:
+        indice = _leer_particiones(carpeta_partidos, "ruta_indice_jugadores", ESQUEMA_INDICE_JUGADORES,
+                                   None, None)
+        en_cache = (huella, indice)
+        _CACHE_INDICE_JUGADORES[carpeta_almacen] = en_cache
+    if equipo is not None:
+        return en_cache[1][en_cache[1]["team"] == equipo]
+    return en_cache[1]
+
+
+def id_jugador(carpeta_partidos=CARPETA_PARTIDOS, player=None, equipo=None):
+    """
+    Retorna el player_id de un jugador a partir de su nombre en el índice de jugadores.
+
+    Con equipo el nombre solo se busca en la plantilla de ese equipo, de modo que dos
+    jugadores de equipos distintos con el mismo nombre no se mezclan.
+
+    Retorna:
+    - int: player_id, o None si el nombre no está en el índice.
+    """
+    indice = cargar_indice_jugadores(carpeta_partidos, equipo)
+    ids = indice.loc[indice["player"] == player, "player_id"]
+    return int(ids.iloc[0]) if len(ids) else None
+
+
+def cargar_tensor_heatmaps(carpeta_partidos=CARPETA_PARTIDOS, equipo=None):
+    """
+    Retorna el tensor denso de heatmaps (jugador × partido × filas_y × columnas_x) del almacén.
+
+    El tensor se consolida una vez por huella del almacén a partir de los conteos que la
+    ingesta guarda por partido y se abre con memory-map (uint16), de modo que el heatmap de
+    cualquier grupo de jugadores y partidos es una suma sobre el tensor sin leer eventos.
+
+    Parámetros:
+    - carpeta_partidos (str): Carpeta con los CSV de partidos.
+    - equipo (str): Si se indica, solo los jugadores y partidos de ese equipo. None = toda la carpeta.
+
+    Retorna:
+    - dict: 'conteos' (memmap uint16), 'jugadores' (DataFrame con 'player_id' y 'player' en el
+      orden del primer eje) y 'game_ids' (array en el orden del segundo eje).
+    """
+    carpeta_almacen = ruta_almacen(carpeta_partidos)
+    manifiesto = actualizar_almacen(carpeta_partidos, carpeta_almacen)
+    huella = manifiesto["huella"]
+    en_cache = _CACHE_TENSORES.get((carpeta_almacen, equipo))
+    if en_cache is not None and en_cache[0] == huella:
+        return en_cache[1]
+
+    indice = cargar_indice_jugadores(carpeta_partidos)
+    # Fila de cada jugador en los conteos de su partido (el índice de un partido va ordenado por player_id)
+    indice = indice.sort_values(["game_id", "player_id"], kind="stable")
+    indice = indice.assign(posicion=indice.groupby("game_id").cumcount().to_numpy())
+    if equipo is not None:
+        indice = indice[indice["team"] == equipo]
+
+    jugadores = indice.drop_duplicates("player_id").sort_values("player_id")[["player_id", "player"]]
+    jugadores = jugadores.reset_index(drop=True)
+    game_ids = np.array(sorted(p["game_id"] for p in manifiesto["partidos"].values()
+                               if equipo is None or equipo in p["equipos"]), dtype="int64")
+    forma = (len(jugadores), len(game_ids), BINS_HEATMAP[1], BINS_HEATMAP[0])
+
+    if 0 in forma:
+        # Sin jugadores o sin partidos no hay nada que mapear en disco
+        tensor = {"conteos": np.zeros(forma, dtype=TIPO_CONTEOS), "jugadores": jugadores, "game_ids": game_ids}
+        _CACHE_TENSORES[(carpeta_almacen, equipo)] = (huella, tensor)
+        return tensor
+
+    carpeta_tensores = os.path.join(carpeta_almacen, CARPETA_TENSORES)
+    prefijo = f"heatmaps_{equipo or 'todos'}_"
+    ruta = os.path.join(carpeta_tensores, f"{prefijo}{huella}.npy")
+    if not os.path.exists(ruta):
+        os.makedirs(carpeta_tensores, exist_ok=True)
+        rutas_partidos = {p["game_id"]: p["ruta_heatmaps"] for p in manifiesto["partidos"].values()}
+        fila_jugador = pd.Series(np.arange(len(jugadores)), index=jugadores["player_id"].to_numpy())
+
+        def escribir(ruta_tmp):
+            tensor = np.lib.format.open_memmap(ruta_tmp, mode="w+", dtype=TIPO_CONTEOS, shape=forma)
+            for game_id, filas in indice.groupby("game_id")[["player_id", "posicion"]]:
+                parcial = np.load(os.path.join(carpeta_almacen, rutas_partidos[game_id]), mmap_mode="r")
+                columna = np.searchsorted(game_ids, game_id)
+                tensor[fila_jugador[filas["player_id"]].to_numpy(), columna] = parcial[filas["posicion"].to_numpy()]
+            tensor.flush()
+            del tensor
+
+        with medir("almacen.tensor_heatmaps", equipo=equipo):
+            escribir_atomico(ruta, escribir)
+        # Los tensores de huellas anteriores ya no se usan
+        _borrar_huellas_anteriores(carpeta_tensores, prefijo, ".npy", huella)
+
+    tensor = {"conteos": np.load(ruta, mmap_mode="r"), "jugadores": jugadores, "game_ids": game_ids}
+    _CACHE_TENSORES[(carpeta_almacen, equipo)] = (huella, tensor)
+    return tensor
+
+
+def cargar_eventos_jugador(carpeta_partidos=CARPETA_PARTIDOS, player_id=None, player=None, columnas=None,
+                           compacto=True):
+    """
+    Lee los eventos de un jugador usando el índice de jugadores (coincidencia exacta).
+
+    Solo se leen las filas del jugador: cada partición por jugador se abre con
+    memory-map y se recorta según el rango del índice.
+
+    Parámetros:
+    - carpeta_partidos (str): Carpeta con los CSV de partidos.
+    - player_id (int): Identificador del jugador. Tiene prioridad sobre player.
+    - player (str): Nombre exacto del jugador.
+    - columnas (list): Columnas a leer. None lee todas.
+    - compacto (bool): Aplica el esquema compacto, como en cargar_eventos.
+
+    Retorna:
+    - DataFrame: Eventos del jugador ordenados por partido y por su posición en el partido.
+      Incluye la columna 'fila' con la posición del evento en su partido.
+    """
+    if player_id is None and player is None:
+        raise ValueError("Debe indicarse player_id o player.")
+
+    indice = cargar_indice_jugadores(carpeta_partidos)
+    if player_id is not None:
+        rangos = indice[indice["player_id"] == int(player_id)]
+    else:
+        rangos = indice[indice["player"] == player]
+
+    carpeta_almacen = ruta_almacen(carpeta_partidos)
+    esquema = _esquemas()["jugadores"]
+    seleccion = list(columnas) if columnas is not None else esquema.names
+
+    tablas = []
+    for game_id, inicio, n_eventos in rangos[["game_id", "inicio", "n_eventos"]].itertuples(index=False):
+        ruta = os.path.join(carpeta_almacen, _ruta_particion("ruta_jugadores", game_id))
+        tabla = pa.ipc.open_file(pa.memory_map(ruta)).read_all()
+        tablas.append(tabla.slice(inicio, n_eventos).select(seleccion))
+
+    tabla = pa.concat_tables(tablas) if tablas else esquema.empty_table().select(seleccion)
+    if not compacto:
+        return tabla.to_pandas()
+    return compactar_eventos(tabla, categorias_almacen(carpeta_partidos), descartar_vacias=columnas is None)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Construye o actualiza el almacén columnar de eventos.")
+    parser.add_argument("carpeta_partidos", nargs="?", default=CARPETA_PARTIDOS)
+    args = parser.parse_args()
+
+    manifiesto = actualizar_almacen(args.carpeta_partidos)
+    print(f"[INFO] Almacén actualizado: {len(manifiesto['partidos'])} partidos, huella {manifiesto['huella']}")
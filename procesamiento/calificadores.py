@@ -0,0 +1,107 @@
+import numpy as np
+import pandas as pd
+
+# Calificadores que se empaquetan como bits en la columna 'qualifier_mask'.
+# El bit de cada nombre es su posición en la lista: añadir nombres solo al final.
+# Si la lista cambia, el almacén de eventos se reconstruye al siguiente acceso.
+BANDERAS_CALIFICADORES = [
+    "KeyPass", "IntentionalAssist", "IntentionalGoalAssist", "ShotAssist", "BigChanceCreated",
+    "BigChance", "Assisted", "Longball", "Cross", "Chipped", "ThroughBall", "LayOff",
+    "HeadPass", "Head", "LeftFoot", "RightFoot", "OtherBodyPart",
+    "CornerTaken", "FreekickTaken", "ThrowIn", "GoalKick", "Penalty",
+    "RegularPlay", "FastBreak", "SetPiece", "FromCorner", "OwnGoal",
+    "Yellow", "SecondYellow", "Red",
+]
+
+BIT_CALIFICADOR = {nombre: 1 << i for i, nombre in enumerate(BANDERAS_CALIFICADORES)}
+
+# Cada calificador se serializa como {'type': {'displayName': X, 'value': N}[, 'value': 'V']}
+_PATRON_CALIFICADOR = (
+    r"\{'type': \{'displayName': '(?P<nombre>[^']+)', 'value': (?P<qualifier_id>\d+)\}"
+    r"(?:, 'value': '(?P<valor>[^']*)')?\}"
+)
+
+
+def parsear_calificadores(qualifiers):
+    """
+    Convierte la columna 'qualifiers' (texto con una lista de dicts) en una tabla larga.
+
+    Parámetros:
+    - qualifiers (Series): Columna 'qualifiers' de los eventos.
+
+    Retorna:
+    - DataFrame: Una fila por calificador con las columnas
+      ['fila', 'qualifier_id', 'nombre', 'valor'], donde 'fila' es la posición del evento.
+    """
+    texto = pd.Series(np.asarray(qualifiers, dtype=object)).fillna("")
+    extraido = texto.str.extractall(_PATRON_CALIFICADOR)
+    if extraido.empty:
+        return pd.DataFrame({
+            "fila": pd.Series(dtype="int32"),
+            "qualifier_id": pd.Series(dtype="int16"),
+            "nombre": pd.Series(dtype="object"),
+            "valor": pd.Series(dtype="object"),
+        })
+
+    tabla = extraido.reset_index(level="match", drop=True).rename_axis("fila").reset_index()
+    tabla["fila"] = tabla["fila"].astype("int32")
+    tabla["qualifier_id"] = tabla["qualifier_id"].astype("int16")
+    tabla["valor"] = tabla["valor"].astype(object).where(tabla["valor"].notna(), None)
+    return tabla[["fila", "qualifier_id", "nombre", "valor"]]
+
+
+def mascara_desde_tabla(tabla_calificadores, n_eventos):
+    """Empaqueta la tabla larga de calificadores en una máscara int64 por evento."""
+    bits = tabla_calificadores["nombre"].map(BIT_CALIFICADOR)
+    conocidos = bits.notna().to_numpy()
+    mascara = np.zeros(n_eventos, dtype=np.int64)
+    np.bitwise_or.at(
+        mascara,
+        tabla_calificadores["fila"].to_numpy()[conocidos],
+        bits.to_numpy()[conocidos].astype(np.int64),
+    )
+    return mascara
+
+
+def mascara_calificadores(qualifiers):
+    """Calcula la máscara de banderas directamente desde la columna de texto 'qualifiers'."""
+    return mascara_desde_tabla(parsear_calificadores(qualifiers), len(qualifiers))
+
+
+def mascara_de(nombres):
+    """Retorna la máscara int con los bits de los calificadores indicados."""
+    desconocidos = [n for n in nombres if n not in BIT_CALIFICADOR]
+    if desconocidos:
+        raise ValueError(f"Calificadores sin bandera en BANDERAS_CALIFICADORES: {desconocidos}")
+    mascara = 0
+    for nombre in nombres:
+        mascara |= BIT_CALIFICADOR[nombre]
+    return mascara
+
+
+def tiene_calificador(df, nombres, todos=False):
+    """
+    Indica qué eventos tienen alguno (o todos) de los calificadores indicados.
+
+    Usa la columna 'qualifier_mask' del almacén si está disponible; si no, la calcula
+    a partir de 'qualifiers'. La comparación es por nombre exacto, no por subcadena.
+
+    Parámetros:
+    - df (DataFrame): Eventos con la columna 'qualifier_mask' o 'qualifiers'.
+    - nombres (list): Nombres de calificadores de BANDERAS_CALIFICADORES.
+    - todos (bool): Si es True exige todos los calificadores en lugar de alguno.
+
+    Retorna:
+    - Series: Booleana alineada con el índice de df.
+    """
+    if "qualifier_mask" in df.columns:
+        mascara_eventos = df["qualifier_mask"].to_numpy(dtype=np.int64)
+    else:
+        mascara_eventos = mascara_calificadores(df["qualifiers"])
+
+    mascara = mascara_de(nombres)
+    if todos:
+        resultado = (mascara_eventos & mascara) == mascara
+    else:
+        resultado = (mascara_eventos & mascara) != 0
+    return pd.Series(resultado, index=df.index)
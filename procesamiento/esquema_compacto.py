@@ -0,0 +1,108 @@
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+# Columnas de texto repetido que se cargan como categóricas
+COLUMNAS_CATEGORICAS = ["type", "outcome_type", "team", "player", "period", "card_type"]
+
+# Valores conocidos de WhoScored: van primero en la lista de categorías para que sus códigos
+# no cambien entre almacenes; los valores nuevos se añaden detrás, en orden alfabético
+CATEGORIAS_BASE = {
+    "type": [
+        "Pass", "BallRecovery", "BallTouch", "Aerial", "Clearance", "Tackle", "Interception", "TakeOn",
+        "Dispossessed", "Foul", "Challenge", "BlockedPass", "KeeperPickup", "Save", "Claim", "Punch",
+        "Smother", "KeeperSweeper", "CrossNotClaimed", "SavedShot", "MissedShots", "ShotOnPost", "Goal",
+        "ChanceMissed", "GoodSkill", "ShieldBallOpp", "Error", "OffsidePass", "OffsideGiven",
+        "OffsideProvoked", "CornerAwarded", "PenaltyFaced", "Card", "SubstitutionOff", "SubstitutionOn",
+        "FormationChange", "FormationSet", "Start", "End",
+    ],
+    "outcome_type": ["Successful", "Unsuccessful"],
+    "period": ["PreMatch", "FirstHalf", "SecondHalf", "FirstPeriodOfExtraTime", "SecondPeriodOfExtraTime",
+               "PenaltyShootout", "PostGame"],
+    "card_type": ["Yellow", "SecondYellow", "Red"],
+}
+
+# Coordenadas: float32 sobra para el campo Opta de 0 a 100
+COLUMNAS_FLOAT32 = ["x", "y", "end_x", "end_y", "goal_mouth_y", "goal_mouth_z", "blocked_x", "blocked_y"]
+
+# Identificadores en 32 bits; los que pueden faltar (eventos sin jugador) usan el entero nullable
+TIPOS_ID = {
+    "game_id": "int32",
+    "team_id": "int32",
+    "player_id": "Int32",
+    "related_event_id": "Int32",
+    "related_player_id": "Int32",
+}
+
+# Banderas que en el CSV solo aparecen cuando son True: en memoria son bool (el vacío es False)
+COLUMNAS_BOOLEANAS = ["is_touch", "is_shot", "is_goal"]
+
+
+def categorias_desde_valores(valores):
+    """
+    Construye la lista compartida de categorías de cada columna categórica.
+
+    Parámetros:
+    - valores (dict): columna -> valores observados en el almacén.
+
+    Retorna:
+    - dict: columna -> lista de categorías (las de CATEGORIAS_BASE primero, el resto ordenado).
+    """
+    categorias = {}
+    for columna in COLUMNAS_CATEGORICAS:
+        base = CATEGORIAS_BASE.get(columna, [])
+        nuevos = sorted(set(valores.get(columna, [])) - set(base))
+        categorias[columna] = base + nuevos
+    return categorias
+
+
+def compactar_eventos(tabla, categorias, descartar_vacias=False):
+    """
+    Convierte una tabla Arrow de eventos en un DataFrame con el esquema compacto.
+
+    Las categóricas comparten la misma lista de categorías en todas las cargas de una
+    versión del almacén, así que los DataFrames de distintos partidos o jugadores se pueden
+    concatenar sin volver a object. Las columnas que no son del esquema de eventos (por
+    ejemplo 'fila' o 'qualifiers') se dejan como están.
+
+    Parámetros:
+    - tabla (pyarrow.Table): Eventos leídos del almacén con su esquema canónico.
+    - categorias (dict): Resultado de categorias_desde_valores.
+    - descartar_vacias (bool): Si es True se quitan las columnas sin ningún valor.
+
+    Retorna:
+    - DataFrame: Eventos con categóricas, coordenadas float32, ids int32 y banderas bool.
+    """
+    if descartar_vacias:
+        tabla = tabla.drop_columns([c for c in tabla.column_names if tabla.column(c).null_count == len(tabla)])
+
+    nulables = {}
+    for posicion, nombre in enumerate(tabla.column_names):
+        columna = tabla.column(posicion)
+        if nombre in COLUMNAS_FLOAT32:
+            columna = pc.cast(columna, pa.float32())
+        elif nombre in COLUMNAS_BOOLEANAS:
+            columna = pc.fill_null(columna, False)
+        elif nombre in TIPOS_ID:
+            columna = pc.cast(columna, pa.int32())
+            if TIPOS_ID[nombre] == "Int32":
+                nulables[nombre] = columna
+                continue
+        else:
+            continue
+        tabla = tabla.set_column(posicion, nombre, columna)
+
+    categoricas = [c for c in COLUMNAS_CATEGORICAS if c in tabla.column_names]
+    # Sin los metadatos de pandas del almacén, que restaurarían los tipos canónicos ('boolean'...)
+    df = tabla.drop_columns(list(nulables)).to_pandas(categories=categoricas, ignore_metadata=True)
+    for columna in categoricas:
+        df[columna] = df[columna].cat.set_categories(categorias[columna])
+    for nombre, columna in nulables.items():
+        df[nombre] = columna.to_pandas(types_mapper={pa.int32(): pd.Int32Dtype()}.get)
+    # Mismo orden de columnas que en el almacén
+    return df[tabla.column_names]
+
+
+def memoria_por_columna(df):
+    """Retorna los bytes que ocupa cada columna de un DataFrame (incluidos los textos)."""
+    return df.memory_usage(deep=True, index=False)
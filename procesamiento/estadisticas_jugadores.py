@@ -0,0 +1,205 @@
+import numpy as np
+import pandas as pd
+from procesamiento.calificadores import tiene_calificador
+
+# Resultados posibles de un evento; los eventos sin resultado caen en un tercer cubo
+RESULTADOS = ['Successful', 'Unsuccessful']
+
+ACCIONES_DEFENSIVAS_JUGADOR = ['Clearance', 'Tackle', 'BallRecovery', 'Interception']
+ACCIONES_OFENSIVAS_JUGADOR = ['Pass', 'Goal', 'MissedShots', 'SavedShot', 'ShotOnPost']
+
+# Calificadores que cuentan como "pase clasificado" en la ficha del jugador
+CALIFICADORES_PASES_CLASIFICADOS = ['KeyPass', 'IntentionalAssist']
+
+# Métricas que muestra la ficha del jugador (página, PDF e impresión)
+CLAVES_FICHA = ["acciones_defensivas", "acciones_ofensivas", "porcentaje_pases_exitosos",
+                "pases_clasificados", "missed_shots", "saved_shots", "goals"]
+
+# Métricas del radar: (tipo de evento, True si es porcentaje de éxito / False si es conteo)
+METRICAS_RADAR = {
+    'Goals': ('Goal', False),
+    '% Pass Successful': ('Pass', True),
+    '% Take On Successful': ('TakeOn', True),
+    'Dispossessed': ('Dispossessed', False),
+    '% Aerial Successful': ('Aerial', True),
+    '% Tackle Successful': ('Tackle', True),
+    'Ball Recovery': ('BallRecovery', False),
+    'Interception': ('Interception', False),
+    'Clearance': ('Clearance', False),
+}
+
+# Columnas de metricas_desde_cubo, en su orden
+COLUMNAS_METRICAS = ['acciones_defensivas', 'acciones_ofensivas', 'total_pases', 'pases_exitosos',
+                     'pases_clasificados', 'missed_shots', 'saved_shots', 'goals',
+                     'porcentaje_pases_exitosos'] + list(METRICAS_RADAR)
+
+
+def calcular_cubo_conteos(eventos, calificadores_clasificados=CALIFICADORES_PASES_CLASIFICADOS):
+    """
+    Cuenta eventos por (jugador × tipo × resultado) con un único np.bincount.
+
+    Parámetros:
+    - eventos (DataFrame): Eventos con las columnas 'player', 'type', 'outcome_type' y
+      'qualifier_mask' o 'qualifiers'. Puede contener uno o todos los jugadores.
+    - calificadores_clasificados (list): Calificadores que marcan un pase como clasificado.
+
+    Retorna:
+    - dict: 'conteos' (ndarray int64 de forma jugadores × tipos × 3, donde el último eje es
+      Successful, Unsuccessful y sin resultado), 'pases_clasificados' (ndarray por jugador),
+      'jugadores' y 'tipos' (Index con las etiquetas de cada eje).
+    """
+    # Las categóricas del almacén traen todas las categorías de la liga: solo las presentes
+    jugadores = pd.Categorical(eventos['player']).remove_unused_categories()
+    tipos = pd.Categorical(eventos['type']).remove_unused_categories()
+    resultados = pd.Categorical(eventos['outcome_type'], categories=RESULTADOS).codes.astype(np.int64)
+    resultados[resultados < 0] = len(RESULTADOS)
+
+    n_jugadores, n_tipos, n_resultados = len(jugadores.categories), len(tipos.categories), len(RESULTADOS) + 1
+    codigo_jugador = jugadores.codes.astype(np.int64)
+    codigo_tipo = tipos.codes.astype(np.int64)
+    validos = (codigo_jugador >= 0) & (codigo_tipo >= 0)
+
+    plano = (codigo_jugador[validos] * n_tipos + codigo_tipo[validos]) * n_resultados + resultados[validos]
+    conteos = np.bincount(plano, minlength=n_jugadores * n_tipos * n_resultados)
+    conteos = conteos.reshape(n_jugadores, n_tipos, n_resultados)
+
+    es_clasificado = validos & (tipos == 'Pass') & tiene_calificador(eventos, calificadores_clasificados).to_numpy()
+    pases_clasificados = np.bincount(codigo_jugador[es_clasificado], minlength=n_jugadores)
+
+    return {
+        'conteos': conteos,
+        'pases_clasificados': pases_clasificados,
+        'jugadores': pd.Index(jugadores.categories, name='player'),
+        'tipos': pd.Index(tipos.categories, name='type'),
+    }
+
+
+def calcular_cubo_por_partido(eventos, game_ids, calificadores_clasificados=CALIFICADORES_PASES_CLASIFICADOS):
+    """
+    Cuenta eventos por (jugador × partido × tipo × resultado) con un único np.bincount.
+
+    Es el cubo de calcular_cubo_conteos separado por partido, para poder acumularlo por
+    jornada (sumas prefijas) y obtener las métricas de cualquier rango de partidos.
+
+    Parámetros:
+    - eventos (DataFrame): Como en calcular_cubo_conteos, más la columna 'game_id'.
+    - game_ids (array): Partidos en el orden del segundo eje (ordenados); los eventos de
+      otros partidos se descartan.
+
+    Retorna:
+    - dict: 'conteos' (ndarray int64 jugadores × partidos × tipos × 3), 'pases_clasificados'
+      (ndarray jugadores × partidos), 'jugadores' y 'tipos'.
+    """
+    game_ids = np.asarray(game_ids, dtype=np.int64)
+    # Las categóricas del almacén traen todas las categorías de la liga: solo las presentes
+    jugadores = pd.Categorical(eventos['player']).remove_unused_categories()
+    tipos = pd.Categorical(eventos['type']).remove_unused_categories()
+    resultados = pd.Categorical(eventos['outcome_type'], categories=RESULTADOS).codes.astype(np.int64)
+    resultados[resultados < 0] = len(RESULTADOS)
+
+    juegos = eventos['game_id'].to_numpy(dtype=np.int64)
+    partido = np.minimum(np.searchsorted(game_ids, juegos), max(len(game_ids) - 1, 0))
+    n_jugadores, n_partidos = len(jugadores.categories), len(game_ids)
+    n_tipos, n_resultados = len(tipos.categories), len(RESULTADOS) + 1
+    codigo_jugador = jugadores.codes.astype(np.int64)
+    codigo_tipo = tipos.codes.astype(np.int64)
+    validos = (codigo_jugador >= 0) & (codigo_tipo >= 0) & (n_partidos > 0)
+    if n_partidos:
+        validos &= game_ids[partido] == juegos
+
+    fila = codigo_jugador[validos] * n_partidos + partido[validos]
+    plano = (fila * n_tipos + codigo_tipo[validos]) * n_resultados + resultados[validos]
+    conteos = np.bincount(plano, minlength=n_jugadores * n_partidos * n_tipos * n_resultados)
+    conteos = conteos.reshape(n_jugadores, n_partidos, n_tipos, n_resultados)
+
+    es_clasificado = validos & (tipos == 'Pass') & tiene_calificador(eventos, calificadores_clasificados).to_numpy()
+    pases_clasificados = np.bincount(codigo_jugador[es_clasificado] * n_partidos + partido[es_clasificado],
+                                     minlength=n_jugadores * n_partidos).reshape(n_jugadores, n_partidos)
+
+    return {
+        'conteos': conteos,
+        'pases_clasificados': pases_clasificados,
+        'jugadores': pd.Index(jugadores.categories, name='player'),
+        'tipos': pd.Index(tipos.categories, name='type'),
+    }
+
+
+def _por_tipo(cubo, tipos_evento, exitosos=False):
+    """Suma el cubo sobre los tipos indicados; retorna un ndarray por jugador."""
+    posiciones = cubo['tipos'].get_indexer(tipos_evento)
+    posiciones = posiciones[posiciones >= 0]
+    seleccion = cubo['conteos'][:, posiciones, :]
+    if exitosos:
+        seleccion = seleccion[:, :, [RESULTADOS.index('Successful')]]
+    # Suma sobre los ejes de tipo y resultado: también vale con un cubo sin jugadores
+    return seleccion.sum(axis=(1, 2))
+
+
+def _porcentaje(parte, total):
+    return np.round(np.divide(parte * 100, total, out=np.zeros(len(total)), where=total > 0), 2)
+
+
+def metricas_desde_cubo(cubo):
+    """
+    Deriva de un cubo de conteos todas las métricas de la ficha y del radar por jugador.
+
+    Retorna:
+    - DataFrame: Una fila por jugador (índice 'player') con las métricas de la ficha
+      ('acciones_defensivas', 'porcentaje_pases_exitosos', 'goals', ...) y una columna
+      por cada métrica de METRICAS_RADAR.
+    """
+    total_pases = _por_tipo(cubo, ['Pass'])
+    metricas = pd.DataFrame({
+        'acciones_defensivas': _por_tipo(cubo, ACCIONES_DEFENSIVAS_JUGADOR),
+        'acciones_ofensivas': _por_tipo(cubo, ACCIONES_OFENSIVAS_JUGADOR),
+        'total_pases': total_pases,
+        'pases_exitosos': _por_tipo(cubo, ['Pass'], exitosos=True),
+        'pases_clasificados': cubo['pases_clasificados'],
+        'missed_shots': _por_tipo(cubo, ['MissedShots']),
+        'saved_shots': _por_tipo(cubo, ['SavedShot']),
+        'goals': _por_tipo(cubo, ['Goal']),
+    }, index=cubo['jugadores'])
+    metricas['porcentaje_pases_exitosos'] = _porcentaje(metricas['pases_exitosos'].to_numpy(), total_pases)
+
+    for nombre, (tipo_evento, es_porcentaje) in METRICAS_RADAR.items():
+        total = _por_tipo(cubo, [tipo_evento])
+        if es_porcentaje:
+            metricas[nombre] = _porcentaje(_por_tipo(cubo, [tipo_evento], exitosos=True), total)
+        else:
+            metricas[nombre] = total
+    return metricas
+
+
+def calcular_estadisticas_plantilla(eventos, calificadores_clasificados=CALIFICADORES_PASES_CLASIFICADOS):
+    """Calcula las métricas de todos los jugadores presentes en los eventos en una sola pasada."""
+    return metricas_desde_cubo(calcular_cubo_conteos(eventos, calificadores_clasificados))
+
+
+def metricas_conjunto(eventos):
+    """Calcula las métricas tratando todos los eventos como si fueran de un único jugador."""
+    cubo = calcular_cubo_conteos(eventos)
+    cubo = dict(
+        cubo,
+        conteos=cubo['conteos'].sum(axis=0, keepdims=True),
+        pases_clasificados=cubo['pases_clasificados'].sum(keepdims=True),
+        jugadores=pd.Index(['total'], name='player'),
+    )
+    return metricas_desde_cubo(cubo).iloc[0]
+
+
+def metricas_jugador(eventos, jugador):
+    """
+    Retorna las métricas de un jugador como dict de valores Python.
+
+    Si el jugador no aparece en los eventos todas las métricas valen 0.
+    """
+    metricas = calcular_estadisticas_plantilla(eventos)
+    if jugador not in metricas.index:
+        return {columna: 0 for columna in metricas.columns}
+    return {columna: metricas.at[jugador, columna].item() for columna in metricas.columns}
+
+
+def estadisticas_ficha(eventos, jugador):
+    """Retorna solo las métricas de CLAVES_FICHA de un jugador."""
+    metricas = metricas_jugador(eventos, jugador)
+    return {clave: metricas[clave] for clave in CLAVES_FICHA}
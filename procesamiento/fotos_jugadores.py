@@ -0,0 +1,164 @@
+import os
+import re
+import threading
+import unicodedata
+from PIL import Image
+from procesamiento.rutas_almacen import CARPETA_PARTIDOS
+from procesamiento.recursos_imagenes import variante_imagen
+
+# Carpeta con una foto JPG por jugador, nombrada con su nombre completo o con su player_id
+CARPETA_FOTOS = "./images/fotos_jugadores"
+
+# Anchos en píxeles con los que las páginas muestran las fotos
+ANCHOS_MINIATURAS = (60, 120)
+
+# Índice de fotos en memoria; se reconstruye cuando cambia la carpeta
+_CACHE_INDICE_FOTOS = {}
+_LOCK_FOTOS = threading.Lock()
+
+
+def normalizar_nombre(nombre):
+    """
+    Normaliza un nombre para compararlo sin tildes, mayúsculas ni signos.
+
+    'Vítězslav Jaroš' y 'Vitezslav_Jaros' dan ambos 'vitezslav jaros'.
+    """
+    sin_tildes = "".join(c for c in unicodedata.normalize("NFKD", nombre) if not unicodedata.combining(c))
+    return " ".join(re.sub(r"[^0-9a-z]+", " ", sin_tildes.casefold()).split())
+
+
+def _construir_indice(carpeta):
+    rutas = {}
+    tamanos = {}
+    for entrada in sorted(os.scandir(carpeta), key=lambda e: e.name):
+        if not entrada.name.lower().endswith(".jpg"):
+            continue
+        rutas.setdefault(normalizar_nombre(os.path.splitext(entrada.name)[0]), entrada.path)
+        with Image.open(entrada.path) as imagen:
+            tamanos[entrada.path] = imagen.size
+    return {"rutas": rutas, "tamanos": tamanos, "busquedas": {}, "ids": {}}
+
+
+def cargar_indice_fotos(carpeta=CARPETA_FOTOS, anchos=ANCHOS_MINIATURAS):
+    """
+    Retorna el índice de fotos de la carpeta, construyéndolo solo si la carpeta cambió.
+
+    Al construirlo se generan también las miniaturas de todos los anchos indicados,
+    para que las páginas solo lean imágenes ya redimensionadas.
+
+    Parámetros:
+    - carpeta (str): Carpeta con las fotos de los jugadores.
+    - anchos (iterable): Anchos de las miniaturas que se generan por adelantado.
+
+    Retorna:
+    - dict: 'rutas' (nombre normalizado -> ruta de la foto), 'tamanos' (ruta -> (ancho, alto)),
+      'busquedas' (nombre buscado -> ruta o None) e 'ids' (player_id -> ruta o None).
+    """
+    try:
+        huella = os.stat(carpeta).st_mtime_ns
+    except FileNotFoundError:
+        return {"rutas": {}, "tamanos": {}, "busquedas": {}, "ids": {}}
+
+    with _LOCK_FOTOS:
+        entrada = _CACHE_INDICE_FOTOS.get(carpeta)
+        if entrada is not None and entrada["huella"] == huella:
+            return entrada["indice"]
+
+        indice = _construir_indice(carpeta)
+        for ruta, tamano in indice["tamanos"].items():
+            for ancho in anchos:
+                variante_imagen(ruta, _tamano_miniatura(tamano, ancho), quitar_fondo=False)
+        _CACHE_INDICE_FOTOS[carpeta] = {"huella": huella, "indice": indice}
+        print(f"[INFO] Índice de fotos construido: {len(indice['rutas'])} jugadores")
+        return indice
+
+
+def _tamano_miniatura(tamano, ancho):
+    ancho_original, alto_original = tamano
+    return ancho, max(1, round(alto_original * ancho / ancho_original))
+
+
+def _buscar_ruta(indice, nombre):
+    normalizado = normalizar_nombre(nombre)
+    ruta = indice["rutas"].get(normalizado)
+    if ruta is not None:
+        return ruta
+
+    # Sin coincidencia exacta: el nombre contiene al del archivo o todas sus partes aparecen en él
+    partes = normalizado.split()
+    for nombre_archivo, ruta in indice["rutas"].items():
+        if normalizado in nombre_archivo or (partes and all(parte in nombre_archivo for parte in partes)):
+            return ruta
+    return None
+
+
+def ruta_foto_jugador(nombre, carpeta=CARPETA_FOTOS):
+    """Retorna la ruta de la foto del jugador, o None si no hay ninguna que coincida."""
+    indice = cargar_indice_fotos(carpeta)
+    busquedas = indice["busquedas"]
+    if nombre not in busquedas:
+        busquedas[nombre] = _buscar_ruta(indice, nombre)
+    return busquedas[nombre]
+
+
+def ruta_foto_por_id(player_id, carpeta=CARPETA_FOTOS, carpeta_partidos=CARPETA_PARTIDOS):
+    """
+    Retorna la ruta de la foto de un jugador a partir de su player_id de WhoScored.
+
+    Una foto nombrada con el player_id ('12345.jpg') tiene prioridad; si no la hay, se busca
+    por el nombre del jugador en el índice de jugadores, de modo que dos homónimos pueden
+    tener fotos distintas.
+    """
+    if player_id is None:
+        return None
+    indice = cargar_indice_fotos(carpeta)
+    ids = indice["ids"]
+    if player_id not in ids:
+        ruta = indice["rutas"].get(str(player_id))
+        if ruta is None:
+            from procesamiento.almacen_eventos import cargar_indice_jugadores
+
+            jugadores = cargar_indice_jugadores(carpeta_partidos)
+            nombres = jugadores.loc[jugadores["player_id"] == player_id, "player"].dropna()
+            ruta = ruta_foto_jugador(nombres.iloc[0], carpeta) if not nombres.empty else None
+        ids[player_id] = ruta
+    return ids[player_id]
+
+
+def _miniatura(ruta, ancho, carpeta):
+    if ruta is None:
+        return None
+    tamano = cargar_indice_fotos(carpeta)["tamanos"][ruta]
+    return variante_imagen(ruta, _tamano_miniatura(tamano, ancho), quitar_fondo=False)
+
+
+def miniatura_jugador(nombre, ancho=ANCHOS_MINIATURAS[0], carpeta=CARPETA_FOTOS):
+    """
+    Retorna la foto del jugador redimensionada al ancho indicado.
+
+    Parámetros:
+    - nombre (str): Nombre del jugador (sin importar tildes ni mayúsculas).
+    - ancho (int): Ancho en píxeles de la miniatura.
+    - carpeta (str): Carpeta con las fotos de los jugadores.
+
+    Retorna:
+    - bytes: Imagen PNG, o None si el jugador no tiene foto.
+    """
+    return _miniatura(ruta_foto_jugador(nombre, carpeta), ancho, carpeta)
+
+
+def miniatura_por_id(player_id, ancho=ANCHOS_MINIATURAS[0], carpeta=CARPETA_FOTOS,
+                     carpeta_partidos=CARPETA_PARTIDOS):
+    """
+    Retorna la foto del jugador con ese player_id redimensionada al ancho indicado.
+
+    Parámetros:
+    - player_id (int): player_id de WhoScored (None = sin foto).
+    - ancho (int): Ancho en píxeles de la miniatura.
+    - carpeta (str): Carpeta con las fotos de los jugadores.
+    - carpeta_partidos (str): Carpeta con los CSV de partidos (para el índice de jugadores).
+
+    Retorna:
+    - bytes: Imagen PNG, o None si el jugador no tiene foto.
+    """
+    return _miniatura(ruta_foto_por_id(player_id, carpeta, carpeta_partidos), ancho, carpeta)
@@ -0,0 +1,50 @@
+import numpy as np
+import pandas as pd
+
+# Tipos del índice de jugadores: una fila por (partido, jugador) con su rango de filas
+ESQUEMA_INDICE_JUGADORES = {
+    "game_id": "int64",
+    "player_id": "int64",
+    "player": "object",
+    "team": "object",
+    "inicio": "int64",
+    "n_eventos": "int64",
+}
+
+
+def construir_indice_partido(df):
+    """
+    Ordena los eventos de un partido por jugador y calcula el rango de filas de cada uno.
+
+    Los eventos sin jugador (inicio, fin de periodo, etc.) quedan fuera. La columna 'fila'
+    conserva la posición original del evento en el partido para poder restaurar el orden.
+
+    Parámetros:
+    - df (DataFrame): Eventos de un único partido, en el orden del almacén.
+
+    Retorna:
+    - tuple: (DataFrame de eventos ordenado por 'player_id', DataFrame índice con las
+      columnas de ESQUEMA_INDICE_JUGADORES donde 'inicio' y 'n_eventos' delimitan las
+      filas de cada jugador en el DataFrame ordenado).
+    """
+    con_jugador = df[df["player_id"].notna()]
+    orden = np.argsort(con_jugador["player_id"].to_numpy(), kind="stable")
+    ordenado = con_jugador.iloc[orden].copy()
+    ordenado.insert(0, "fila", con_jugador.index.to_numpy()[orden].astype("int32"))
+    ordenado = ordenado.reset_index(drop=True)
+
+    ids = ordenado["player_id"].to_numpy()
+    if len(ids) == 0:
+        return ordenado, pd.DataFrame({c: pd.Series(dtype=t) for c, t in ESQUEMA_INDICE_JUGADORES.items()})
+
+    inicios = np.flatnonzero(np.r_[True, ids[1:] != ids[:-1]])
+    conteos = np.diff(np.r_[inicios, len(ids)])
+    indice = pd.DataFrame({
+        "game_id": ordenado["game_id"].to_numpy()[inicios].astype("int64"),
+        "player_id": ids[inicios].astype("int64"),
+        "player": ordenado["player"].to_numpy()[inicios],
+        "team": ordenado["team"].to_numpy()[inicios],
+        "inicio": inicios.astype("int64"),
+        "n_eventos": conteos.astype("int64"),
+    })
+    return ordenado, indice
@@ -0,0 +1,157 @@
+import os
+import re
+import time
+import argparse
+import traceback
+import unicodedata
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from procesamiento.almacen_eventos import (
+    CARPETA_PARTIDOS, EQUIPO_POR_DEFECTO, actualizar_almacen, cargar_eventos_jugador, cargar_indice_jugadores,
+    cargar_tensor_heatmaps, id_jugador
+)
+from procesamiento.mapas_calor import sumar_heatmaps
+from procesamiento.estadisticas_jugadores import estadisticas_ficha
+from procesamiento.prerenderizar_jugadores import DPI_PDF, _iniciar_proceso
+
+# Carpeta donde se escriben los informes generados en lote
+CARPETA_INFORMES = "./data/informes_jugadores"
+
+# Resolución de los gráficos según el destino de la exportación
+DPI_EXPORTACION = {
+    "pdf": int(os.environ.get("LFC_DPI_PDF", DPI_PDF)),
+    # La página de impresión usa imágenes pequeñas para que todo quepa en una hoja
+    "impresion": int(os.environ.get("LFC_DPI_IMPRESION", 120)),
+}
+
+def nombre_archivo_informe(jugador):
+    """Nombre de archivo seguro (ASCII, sin espacios) para el informe de un jugador."""
+    ascii_ = unicodedata.normalize("NFKD", jugador).encode("ascii", "ignore").decode("ascii")
+    return re.sub(r"[^A-Za-z0-9]+", "_", ascii_).strip("_") + ".pdf"
+
+
+def generar_informe_jugador(carpeta_partidos, jugador, dpi=DPI_EXPORTACION["pdf"], equipo=EQUIPO_POR_DEFECTO):
+    """
+    Genera el PDF de un jugador (de la plantilla de equipo) reutilizando los gráficos de la caché de render.
+
+    Retorna:
+    - bytes: Contenido del PDF, o None si el jugador no tiene eventos.
+    """
+    from scrapers.filtrar_eventos_por_jugador import limpiar_eventos_jugador
+    from visualizations.graficos_jugador import GRAFICOS_JUGADOR, renderizar_grafico_jugador
+    from procesamiento.pdf_jugador import construir_pdf
+
+    # Mismo DataFrame que construye la página para que coincidan las claves de caché
+    player_id = id_jugador(carpeta_partidos, jugador, equipo)
+    if player_id is None:
+        return None
+    df_jugador = cargar_eventos_jugador(carpeta_partidos, player_id=player_id)
+    if df_jugador.empty:
+        return None
+    df_jugador = limpiar_eventos_jugador(df_jugador)
+    heatmap = sumar_heatmaps(cargar_tensor_heatmaps(carpeta_partidos, equipo), [player_id])
+
+    stats = estadisticas_ficha(df_jugador[df_jugador["team"] == equipo], jugador)
+    imagenes = [renderizar_grafico_jugador(grafico, df_jugador, dpi=dpi, heatmap=heatmap) for grafico in GRAFICOS_JUGADOR]
+    return construir_pdf(jugador, stats, imagenes, equipo)
+
+
+def _escribir_informe(carpeta_partidos, jugador, equipo, carpeta_salida, dpi):
+    pdf_bytes = generar_informe_jugador(carpeta_partidos, jugador, dpi, equipo)
+    if pdf_bytes is None:
+        return None
+    ruta = os.path.join(carpeta_salida, nombre_archivo_informe(jugador))
+    with open(ruta, "wb") as f:
+        f.write(pdf_bytes)
+    return ruta
+
+
+def generar_informes(carpeta_partidos=CARPETA_PARTIDOS, equipo=EQUIPO_POR_DEFECTO, jugadores=None,
+                     carpeta_salida=CARPETA_INFORMES, procesos=None, dpi=DPI_EXPORTACION["pdf"], comprimir=False):
+    """
+    Genera en paralelo el informe PDF de cada jugador de la plantilla.
+
+    Cada proceso de trabajo renderiza (o lee de la caché de disco) los gráficos de un
+    jugador y escribe su PDF en carpeta_salida.
+
+    Parámetros:
+    - carpeta_partidos (str): Carpeta con los CSV de partidos.
+    - equipo (str): Equipo de los jugadores (toda su plantilla si no se indica la lista).
+    - jugadores (list): Nombres de jugadores. None procesa toda la plantilla.
+    - carpeta_salida (str): Carpeta donde se escriben los PDF.
+    - procesos (int): Número de procesos. None usa todos los núcleos.
+    - dpi (int): Resolución de los gráficos del PDF.
+    - comprimir (bool): Si es True, además empaqueta los PDF en '<carpeta_salida>.zip'.
+
+    Retorna:
+    - dict: Resumen con 'informes' (lista de rutas), 'zip' (ruta o None), 'segundos',
+      'informes_por_segundo' y 'fallos' (lista de (jugador, error)).
+    """
+    actualizar_almacen(carpeta_partidos)
+    # El tensor de heatmaps se consolida aquí, una vez, y los procesos solo lo abren
+    cargar_tensor_heatmaps(carpeta_partidos, equipo)
+    if jugadores is None:
+        indice = cargar_indice_jugadores(carpeta_partidos, equipo)
+        jugadores = sorted(indice['player'].dropna().unique())
+    procesos = procesos or os.cpu_count() or 1
+    os.makedirs(carpeta_salida, exist_ok=True)
+
+    inicio = time.perf_counter()
+    informes = []
+    fallos = []
+    with ProcessPoolExecutor(max_workers=procesos, initializer=_iniciar_proceso) as executor:
+        futuros = {
+            executor.submit(_escribir_informe, carpeta_partidos, jugador, equipo, carpeta_salida, dpi): jugador
+            for jugador in jugadores
+        }
+        for futuro in as_completed(futuros):
+            jugador = futuros[futuro]
+            try:
+                ruta = futuro.result()
+            except Exception as e:
+                fallos.append((jugador, str(e)))
+                print(f"[ERROR] Error generando el informe de {jugador}: {e}")
+                traceback.print_exception(e)
+                continue
+            if ruta is None:
+                print(f"[INFO] {jugador} no tiene eventos, se omite su informe")
+            else:
+                informes.append(ruta)
+    informes.sort()
+
+    ruta_zip = None
+    if comprimir:
+        ruta_zip = carpeta_salida.rstrip(os.sep) + ".zip"
+        # Los PDF ya están comprimidos: se guardan sin volver a comprimir
+        with zipfile.ZipFile(ruta_zip, "w", compression=zipfile.ZIP_STORED) as archivo_zip:
+            for ruta in informes:
+                archivo_zip.write(ruta, arcname=os.path.basename(ruta))
+    segundos = time.perf_counter() - inicio
+
+    resumen = {
+        "informes": informes,
+        "zip": ruta_zip,
+        "segundos": round(segundos, 2),
+        "informes_por_segundo": round(len(informes) / segundos, 2) if segundos > 0 else 0.0,
+        "fallos": fallos,
+    }
+    print(f"[INFO] Informes generados: {len(informes)} en {resumen['segundos']} s "
+          f"({resumen['informes_por_segundo']} informes/s, {len(fallos)} fallos) -> {ruta_zip or carpeta_salida}")
+    return resumen
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Genera el informe PDF de todos los jugadores del equipo.")
+    parser.add_argument("carpeta_partidos", nargs="?", default=CARPETA_PARTIDOS)
+    parser.add_argument("--equipo", default=EQUIPO_POR_DEFECTO)
+    parser.add_argument("--jugador", action="append", dest="jugadores", help="Limita a este jugador (repetible).")
+    parser.add_argument("--salida", default=CARPETA_INFORMES)
+    parser.add_argument("--procesos", type=int, default=None)
+    parser.add_argument("--dpi", type=int, default=DPI_EXPORTACION["pdf"])
+    parser.add_argument("--zip", action="store_true", help="Empaqueta los PDF en un archivo zip.")
+    args = parser.parse_args()
+
+    resumen = generar_informes(args.carpeta_partidos, args.equipo, args.jugadores, args.salida,
+                               procesos=args.procesos, dpi=args.dpi, comprimir=args.zip)
+    if resumen["fallos"]:
+        raise SystemExit(1)
@@ -0,0 +1,98 @@
+import numpy as np
+
+# Rejilla de los heatmaps (columnas en x, filas en y) sobre el campo Opta de 0 a 100
+BINS_HEATMAP = (25, 25)
+BORDES_X = np.linspace(0, 100, BINS_HEATMAP[0] + 1)
+BORDES_Y = np.linspace(0, 100, BINS_HEATMAP[1] + 1)
+
+# Tipo de los conteos guardados: un jugador no llega a 65535 eventos en una celda de un partido
+TIPO_CONTEOS = np.uint16
+
+# Suavizado gaussiano que se aplica al dibujar
+SIGMA_HEATMAP = 1
+
+
+def _celdas(valores, bordes):
+    """Celda de cada valor con los mismos bordes que binned_statistic_2d (el borde derecho entra)."""
+    celdas = np.searchsorted(bordes, valores, side="right") - 1
+    celdas[valores == bordes[-1]] = len(bordes) - 2
+    validos = (valores >= bordes[0]) & (valores <= bordes[-1])
+    return celdas, validos
+
+
+def conteos_heatmap(x, y, grupos=None, n_grupos=1):
+    """
+    Cuenta los eventos de cada celda de la rejilla en una sola pasada de bincount.
+
+    Las filas van de arriba abajo del campo, como la 'statistic' de Pitch.bin_statistic,
+    para poder dibujar el resultado directamente. Los puntos sin coordenadas o fuera del
+    campo se descartan.
+
+    Parámetros:
+    - x, y (array): Coordenadas Opta de los eventos.
+    - grupos (array): Grupo de cada evento (0..n_grupos-1), por ejemplo el jugador. None = un solo grupo.
+    - n_grupos (int): Número de grupos.
+
+    Retorna:
+    - ndarray: Conteos int64 de forma (n_grupos, filas_y, columnas_x).
+    """
+    x = np.asarray(x, dtype="float64")
+    y = np.asarray(y, dtype="float64")
+    columnas_x, filas_y = BINS_HEATMAP
+    celda_x, validos_x = _celdas(x, BORDES_X)
+    celda_y, validos_y = _celdas(y, BORDES_Y)
+    validos = validos_x & validos_y
+
+    grupos = np.zeros(len(x), dtype="int64") if grupos is None else np.asarray(grupos, dtype="int64")
+    fila = filas_y - 1 - celda_y[validos]
+    plano = (grupos[validos] * filas_y + fila) * columnas_x + celda_x[validos]
+    conteos = np.bincount(plano, minlength=n_grupos * filas_y * columnas_x)
+    return conteos.reshape(n_grupos, filas_y, columnas_x)
+
+
+def calcular_heatmaps_partido(eventos_por_jugador, indice):
+    """
+    Calcula los conteos del heatmap de cada jugador de un partido.
+
+    Parámetros:
+    - eventos_por_jugador (DataFrame): Eventos del partido ordenados por jugador (construir_indice_partido).
+    - indice (DataFrame): Índice del partido; 'n_eventos' delimita las filas de cada jugador.
+
+    Retorna:
+    - ndarray: Conteos TIPO_CONTEOS de forma (jugadores del índice, filas_y, columnas_x), en el
+      orden de las filas del índice.
+    """
+    grupos = np.repeat(np.arange(len(indice)), indice["n_eventos"].to_numpy())
+    conteos = conteos_heatmap(eventos_por_jugador["x"].to_numpy(dtype="float64", na_value=np.nan),
+                              eventos_por_jugador["y"].to_numpy(dtype="float64", na_value=np.nan),
+                              grupos, len(indice))
+    return np.minimum(conteos, np.iinfo(TIPO_CONTEOS).max).astype(TIPO_CONTEOS)
+
+
+def sumar_heatmaps(tensor, player_ids=None, game_ids=None):
+    """
+    Suma los conteos del tensor de heatmaps para un grupo de jugadores y de partidos.
+
+    Parámetros:
+    - tensor (dict): Resultado de cargar_tensor_heatmaps ('conteos', 'jugadores', 'game_ids').
+    - player_ids (iterable): Jugadores a sumar. None suma todos.
+    - game_ids (iterable): Partidos a sumar. None suma todos.
+
+    Retorna:
+    - ndarray: Conteos int64 de forma (filas_y, columnas_x).
+    """
+    conteos = tensor["conteos"]
+    filas = slice(None)
+    if player_ids is not None:
+        filas = np.flatnonzero(np.isin(tensor["jugadores"]["player_id"].to_numpy(), list(player_ids)))
+    columnas = slice(None)
+    if game_ids is not None:
+        columnas = np.flatnonzero(np.isin(tensor["game_ids"], list(game_ids)))
+    return conteos[filas][:, columnas].sum(axis=(0, 1), dtype="int64")
+
+
+def suavizar_heatmap(conteos, sigma=SIGMA_HEATMAP):
+    """Aplica el suavizado gaussiano del heatmap a una matriz de conteos."""
+    from scipy.ndimage import gaussian_filter
+
+    return gaussian_filter(np.asarray(conteos, dtype="float64"), sigma)
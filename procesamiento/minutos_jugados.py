@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+
+# Tarjetas que terminan la participación del jugador
+TARJETAS_EXPULSION = ["Red", "SecondYellow"]
+
+# Minutos de referencia de las métricas por 90
+MINUTOS_POR_90 = 90
+
+# Tipos de la tabla de minutos: una fila por (partido, equipo, jugador)
+ESQUEMA_MINUTOS = {
+    "game_id": "int64",
+    "team": "object",
+    "player": "object",
+    "minuto_entrada": "int64",
+    "minuto_salida": "int64",
+    "minutos": "int64",
+}
+
+
+def calcular_minutos_partido(df):
+    """
+    Calcula los minutos jugados por cada jugador de un partido, sin bucles por fila.
+
+    Sobre 'expanded_minute' (que incluye el tiempo añadido): un jugador entra en el minuto
+    0 o en el de su SubstitutionOn y sale en el de su SubstitutionOff, en el de su tarjeta
+    roja (o segunda amarilla) o, si no, en el último minuto del partido.
+
+    Parámetros:
+    - df (DataFrame): Eventos de un único partido.
+
+    Retorna:
+    - DataFrame: Columnas de ESQUEMA_MINUTOS. Solo los jugadores con algún evento.
+    """
+    con_jugador = df[df["player"].notna()]
+    fin_partido = int(df["expanded_minute"].max()) if len(df) else 0
+    tipo = con_jugador["type"]
+    minuto = con_jugador["expanded_minute"].astype("float64")
+    expulsion = (tipo == "Card") & con_jugador["card_type"].isin(TARJETAS_EXPULSION)
+    claves = [con_jugador["game_id"], con_jugador["team"], con_jugador["player"]]
+
+    # min() ignora los NaN: sin el evento, el jugador empezó (o terminó) el partido
+    entrada = minuto.where(tipo == "SubstitutionOn").groupby(claves, observed=True).min().fillna(0)
+    salida = minuto.where((tipo == "SubstitutionOff") | expulsion).groupby(claves, observed=True).min().fillna(fin_partido)
+    minutos = pd.DataFrame({"minuto_entrada": entrada, "minuto_salida": salida})
+    minutos["minutos"] = (minutos["minuto_salida"] - minutos["minuto_entrada"]).clip(lower=0)
+    minutos.index.names = ["game_id", "team", "player"]
+    return minutos.reset_index().astype(ESQUEMA_MINUTOS)
+
+
+def por_90(valores, minutos):
+    """
+    Normaliza conteos a 90 minutos.
+
+    Parámetros:
+    - valores (array o escalar): Conteos.
+    - minutos (array o escalar): Minutos jugados de cada conteo.
+
+    Retorna:
+    - ndarray: float64 con valores × 90 / minutos; 0 donde no hay minutos.
+    """
+    valores = np.asarray(valores, dtype="float64")
+    minutos = np.asarray(minutos, dtype="float64")
+    return np.divide(valores * MINUTOS_POR_90, minutos, out=np.zeros(np.broadcast(valores, minutos).shape),
+                     where=minutos > 0)
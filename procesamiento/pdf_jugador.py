@@ -0,0 +1,128 @@
+import io
+import os
+import tempfile
+import unicodedata
+from fpdf import FPDF
+from PIL import Image
+from procesamiento.rutas_almacen import EQUIPO_POR_DEFECTO
+
+# Títulos de los gráficos del PDF, en el orden en que se reciben las imágenes
+TITULOS_IMAGENES_PDF = ['Radar Chart', 'Heat Map', 'Mapa de Pases', 'Mapa de Tiros']
+
+
+def _texto_pdf(texto):
+    """Adapta un texto a latin-1, la única codificación de las fuentes base de FPDF."""
+    try:
+        texto.encode("latin-1")
+        return texto
+    except UnicodeEncodeError:
+        # 'Vítězslav Jaroš' -> 'Vítezslav Jaros': se conservan los caracteres latin-1
+        return "".join(
+            c if c.encode("latin-1", "ignore") else unicodedata.normalize("NFKD", c).encode("latin-1", "ignore").decode("latin-1")
+            for c in texto
+        )
+
+
+def _png_temporal(png, temporales):
+    """
+    Escribe un PNG en memoria como PNG RGB (sin alfa) en un archivo temporal y retorna su ruta.
+
+    El canal alfa se aplana sobre fondo blanco con PIL: FPDF lo separaría píxel a píxel
+    en Python, lo que lleva varios segundos por imagen a 300 DPI. Sin alfa, FPDF copia
+    los datos comprimidos del PNG tal cual. La ruta se añade a temporales para borrarla
+    al terminar el PDF.
+    """
+    imagen = Image.open(io.BytesIO(png))
+    if imagen.mode in ("RGBA", "LA", "P"):
+        imagen = imagen.convert("RGBA")
+        fondo = Image.new("RGB", imagen.size, (255, 255, 255))
+        fondo.paste(imagen, mask=imagen.getchannel("A"))
+        imagen = fondo
+    elif imagen.mode != "RGB":
+        imagen = imagen.convert("RGB")
+
+    # delete=False: en Windows el archivo no puede reabrirse mientras siga abierto
+    with tempfile.NamedTemporaryFile(suffix=".png", delete=False) as archivo:
+        temporales.append(archivo.name)
+        imagen.save(archivo, format="PNG", compress_level=6)
+    return archivo.name
+
+
+def construir_pdf(jugador, stats, imagenes, equipo=EQUIPO_POR_DEFECTO):
+    """
+    Construye el informe PDF de un jugador.
+
+    Parámetros:
+    - jugador (str): Nombre del jugador.
+    - equipo (str): Equipo del jugador, para el título (como en la versión para imprimir).
+    - stats (dict): Métricas de la ficha (ver CLAVES_FICHA).
+    - imagenes (list): PNG (bytes) del radar, mapa de calor, mapa de pases y mapa de tiros,
+      en ese orden. Un elemento None deja el hueco del gráfico vacío.
+
+    Retorna:
+    - bytes: Contenido del PDF.
+    """
+    temporales = []
+    try:
+        return _construir_pdf(jugador, stats, imagenes, equipo, temporales)
+    finally:
+        for ruta in temporales:
+            os.remove(ruta)
+
+
+def _construir_pdf(jugador, stats, imagenes, equipo, temporales):
+    pdf = FPDF()
+    pdf.add_page()
+
+    # Configuración de la página
+    pdf.set_auto_page_break(auto=True, margin=15)
+
+    # Título
+    pdf.set_font("Arial", "B", size=16)
+    pdf.cell(200, 10, txt=_texto_pdf(f"{jugador} - {equipo} Premier League 24/25"), ln=1, align='C')
+    pdf.ln(10)
+
+    # Estadísticas principales
+    pdf.set_font("Arial", "B", size=12)
+    pdf.cell(200, 10, txt="Estadísticas del Jugador", ln=1, align='L')
+    pdf.set_font("Arial", size=10)
+
+    # Primera fila de estadísticas
+    pdf.cell(100, 10, txt=f"Acciones Defensivas: {stats['acciones_defensivas']}", ln=0)
+    pdf.cell(100, 10, txt=f"Acciones Ofensivas: {stats['acciones_ofensivas']}", ln=1)
+
+    # Segunda fila de estadísticas
+    pdf.cell(100, 10, txt=f"Pases Exitosos: {stats['porcentaje_pases_exitosos']}%", ln=0)
+    pdf.cell(100, 10, txt=f"Pases Clasificados: {stats['pases_clasificados']}", ln=1)
+
+    # Estadísticas de tiros
+    pdf.ln(5)
+    pdf.set_font("Arial", "B", size=12)
+    pdf.cell(200, 10, txt="Resumen de Tiros", ln=1, align='L')
+    pdf.set_font("Arial", size=10)
+    pdf.cell(70, 10, txt=f"Missed Shots: {stats['missed_shots']}", ln=0)
+    pdf.cell(70, 10, txt=f"Saved Shots: {stats['saved_shots']}", ln=0)
+    pdf.cell(60, 10, txt=f"Goals: {stats['goals']}", ln=1)
+
+    # Agrupar imágenes en pares
+    titulados = list(zip(TITULOS_IMAGENES_PDF, imagenes))
+    image_pairs = [titulados[0:2], titulados[2:4]]
+
+    for pair in image_pairs:
+        pdf.ln(10)
+        for i, (title, png) in enumerate(pair):
+            # Título de la imagen
+            pdf.set_font("Arial", "B", size=12)
+            pdf.cell(95, 10, txt=title, ln=i, align='L')
+
+            if png is not None:
+                ruta = _png_temporal(png, temporales)
+                if i == 0:
+                    pdf.image(ruta, x=10, y=pdf.get_y() + 10, w=90)
+                else:
+                    pdf.image(ruta, x=110, y=pdf.get_y(), w=90)
+
+            if i == 1:
+                pdf.ln(70)  # Espacio para la siguiente fila de imágenes
+
+    return pdf.output(dest='S').encode('latin-1')
@@ -0,0 +1,122 @@
+import numpy as np
+import pandas as pd
+
+# Tipos de evento que indican qué equipo tiene el balón. El resto (duelos, faltas, despejes,
+# paradas, tarjetas, cambios...) no cambia la posesión: pertenecen a la posesión en curso
+TIPOS_CONTROL = [
+    "Pass", "OffsidePass", "BallRecovery", "BallTouch", "TakeOn", "Dispossessed", "GoodSkill",
+    "KeeperPickup", "Claim", "KeeperSweeper", "SavedShot", "MissedShots", "Goal", "ShotOnPost", "ChanceMissed",
+]
+
+TIPOS_TIRO = ["SavedShot", "MissedShots", "Goal", "ShotOnPost"]
+
+# Columnas que necesita la segmentación
+COLUMNAS_POSESIONES = ["game_id", "period", "team_id", "type"]
+
+# Columnas que necesita el resumen, además de 'possession_id'
+COLUMNAS_RESUMEN_POSESIONES = ["possession_id", "team", "minute", "second", "x", "end_x"]
+
+
+def asignar_posesiones(eventos):
+    """
+    Asigna a cada evento el número de posesión dentro de su partido, sin bucles por fila.
+
+    Una posesión empieza al inicio de cada periodo y cada vez que un evento de control
+    (TIPOS_CONTROL) es de un equipo distinto al del evento de control anterior del mismo
+    periodo. Los eventos que no son de control se quedan en la posesión en curso.
+
+    Parámetros:
+    - eventos (DataFrame): Eventos en el orden del partido con las columnas de COLUMNAS_POSESIONES.
+      Puede contener varios partidos seguidos.
+
+    Retorna:
+    - ndarray: int32 con la posesión de cada evento, empezando en 0 en cada partido.
+    """
+    n = len(eventos)
+    if n == 0:
+        return np.zeros(0, dtype="int32")
+    posicion = np.arange(n)
+    partido = eventos["game_id"].to_numpy()
+    periodo = eventos["period"].to_numpy(dtype=object)
+    equipo = eventos["team_id"].to_numpy(dtype="float64", na_value=np.nan)
+    control = eventos["type"].isin(TIPOS_CONTROL).to_numpy() & ~np.isnan(equipo)
+
+    # Tramos: bloques contiguos del mismo partido y periodo
+    nuevo_partido = np.r_[True, partido[1:] != partido[:-1]]
+    nuevo_tramo = nuevo_partido | np.r_[True, periodo[1:] != periodo[:-1]]
+    inicio_tramo = np.maximum.accumulate(np.where(nuevo_tramo, posicion, 0))
+
+    # Último evento de control anterior a cada evento dentro de su tramo (-1 si no hay)
+    ultimo_control = np.maximum.accumulate(np.where(control, posicion, -1))
+    previo = np.r_[-1, ultimo_control[:-1]]
+    previo = np.where(previo >= inicio_tramo, previo, -1)
+
+    cambio = control & (previo >= 0) & (equipo[np.maximum(previo, 0)] != equipo)
+    frontera = nuevo_tramo | cambio
+    acumulado = np.cumsum(frontera)
+    # Reiniciar la numeración en cada partido
+    inicio_partido = np.maximum.accumulate(np.where(nuevo_partido, posicion, 0))
+    return (acumulado - acumulado[inicio_partido]).astype("int32")
+
+
+def resumen_posesiones(eventos):
+    """
+    Resume cada posesión: equipo, duración, pases, avance y si termina en tiro.
+
+    Parámetros:
+    - eventos (DataFrame): Eventos con las columnas 'game_id', 'type' y las de
+      COLUMNAS_RESUMEN_POSESIONES.
+
+    Retorna:
+    - DataFrame: Una fila por (game_id, possession_id) con 'team' (equipo del primer evento
+      de control), 'eventos', 'pases', 'duracion_s', 'avance_x' (del primer evento de control
+      al punto más adelantado del equipo), 'velocidad' (avance_x por segundo) y 'tiro'.
+    """
+    control = eventos["type"].isin(TIPOS_CONTROL)
+    tiempo = eventos["minute"].astype("float64") * 60 + eventos["second"].fillna(0).astype("float64")
+    claves = [eventos["game_id"], eventos["possession_id"]]
+
+    # Equipo de la posesión: el del primer evento de control (si no hay, el del primer evento)
+    equipo_control = eventos["team"].where(control)
+    resumen = pd.DataFrame({
+        "team": equipo_control.groupby(claves).first(),
+        "eventos": eventos["type"].groupby(claves).size(),
+        "duracion_s": tiempo.groupby(claves).max() - tiempo.groupby(claves).min(),
+    })
+    resumen["team"] = resumen["team"].fillna(eventos["team"].groupby(claves).first())
+
+    del_equipo = (eventos["team"].to_numpy(dtype=object)
+                  == resumen["team"].reindex(pd.MultiIndex.from_arrays(claves)).to_numpy(dtype=object))
+    propios = eventos[del_equipo]
+    claves_propias = [propios["game_id"], propios["possession_id"]]
+    avance = np.fmax(propios["x"], propios["end_x"].where(propios["type"] == "Pass"))
+    inicio_x = propios["x"].where(propios["type"].isin(TIPOS_CONTROL)).groupby(claves_propias).first()
+
+    resumen["pases"] = (propios["type"] == "Pass").groupby(claves_propias).sum()
+    resumen["avance_x"] = (avance.groupby(claves_propias).max() - inicio_x).clip(lower=0)
+    resumen["tiro"] = propios["type"].isin(TIPOS_TIRO).groupby(claves_propias).any()
+    resumen = resumen.fillna({"pases": 0, "avance_x": 0, "tiro": False})
+    resumen["velocidad"] = np.where(resumen["duracion_s"] > 0, resumen["avance_x"] / resumen["duracion_s"], 0.0)
+    return resumen.astype({"pases": "int64", "tiro": bool}).reset_index()
+
+
+def metricas_posesion_equipo(resumen):
+    """
+    Agrega el resumen de posesiones por equipo.
+
+    Retorna:
+    - DataFrame: Por equipo, 'posesiones', 'posesiones_con_tiro', 'pct_con_tiro', 'pases_por_posesion'
+      (longitud media de la construcción), 'duracion_media_s' y 'velocidad_media' (de las posesiones
+      con al menos un pase).
+    """
+    construidas = resumen[resumen["pases"] > 0]
+    metricas = resumen.groupby("team", observed=True).agg(
+        posesiones=("possession_id", "size"), posesiones_con_tiro=("tiro", "sum"),
+    )
+    metricas["pct_con_tiro"] = (metricas["posesiones_con_tiro"] / metricas["posesiones"] * 100).round(2)
+    metricas = metricas.join(construidas.groupby("team", observed=True).agg(
+        pases_por_posesion=("pases", "mean"),
+        duracion_media_s=("duracion_s", "mean"),
+        velocidad_media=("velocidad", "mean"),
+    ))
+    return metricas.reset_index()
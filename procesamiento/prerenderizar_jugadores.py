@@ -0,0 +1,117 @@
+import os
+import time
+import argparse
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from procesamiento.almacen_eventos import (
+    CARPETA_PARTIDOS, EQUIPO_POR_DEFECTO, actualizar_almacen, cargar_eventos_jugador, cargar_indice_jugadores,
+    cargar_tensor_heatmaps, id_jugador
+)
+from procesamiento.mapas_calor import sumar_heatmaps
+
+# Resolución de las imágenes del PDF (las de pantalla usan DPI_PANTALLA)
+DPI_PDF = 300
+
+
+def _iniciar_proceso():
+    # Los procesos de trabajo no tienen pantalla: forzar el backend sin interfaz
+    import matplotlib
+    matplotlib.use("Agg")
+
+
+def _renderizar_jugador(carpeta_partidos, jugador, equipo, dpis):
+    """Renderiza todos los gráficos de un jugador y los deja en la caché de disco."""
+    from scrapers.filtrar_eventos_por_jugador import limpiar_eventos_jugador
+    from visualizations.graficos_jugador import GRAFICOS_JUGADOR, renderizar_grafico_jugador
+
+    # Mismo DataFrame que construye la página para que coincidan las claves de caché
+    player_id = id_jugador(carpeta_partidos, jugador, equipo)
+    if player_id is None:
+        return 0
+    df_jugador = cargar_eventos_jugador(carpeta_partidos, player_id=player_id)
+    if df_jugador.empty:
+        return 0
+    df_jugador = limpiar_eventos_jugador(df_jugador)
+    heatmap = sumar_heatmaps(cargar_tensor_heatmaps(carpeta_partidos, equipo), [player_id])
+
+    renderizados = 0
+    for dpi in dpis:
+        for grafico in GRAFICOS_JUGADOR:
+            if renderizar_grafico_jugador(grafico, df_jugador, dpi=dpi, heatmap=heatmap) is not None:
+                renderizados += 1
+    return renderizados
+
+
+def prerenderizar_jugadores(carpeta_partidos=CARPETA_PARTIDOS, equipo=EQUIPO_POR_DEFECTO, jugadores=None,
+                            procesos=None, dpis=None):
+    """
+    Renderiza en paralelo los gráficos de la ficha de cada jugador y llena la caché de render.
+
+    Cada proceso de trabajo escribe en la caché de disco compartida, de modo que las
+    páginas servidas después solo leen imágenes ya codificadas.
+
+    Parámetros:
+    - carpeta_partidos (str): Carpeta con los CSV de partidos.
+    - equipo (str): Equipo de los jugadores (toda su plantilla si no se indica la lista).
+    - jugadores (list): Nombres de jugadores a renderizar. None renderiza toda la plantilla.
+    - procesos (int): Número de procesos. None usa todos los núcleos.
+    - dpis (iterable): Resoluciones a generar. None genera solo la de pantalla.
+
+    Retorna:
+    - dict: Resumen con 'jugadores', 'graficos', 'segundos', 'jugadores_por_segundo' y
+      'fallos' (lista de (jugador, error)).
+    """
+    from visualizations.cache_render import DPI_PANTALLA
+
+    actualizar_almacen(carpeta_partidos)
+    # El tensor de heatmaps se consolida aquí, una vez, y los procesos solo lo abren
+    cargar_tensor_heatmaps(carpeta_partidos, equipo)
+    if jugadores is None:
+        indice = cargar_indice_jugadores(carpeta_partidos, equipo)
+        jugadores = sorted(indice['player'].dropna().unique())
+    dpis = tuple(dpis) if dpis else (DPI_PANTALLA,)
+    procesos = procesos or os.cpu_count() or 1
+
+    inicio = time.perf_counter()
+    graficos = 0
+    fallos = []
+    with ProcessPoolExecutor(max_workers=procesos, initializer=_iniciar_proceso) as executor:
+        futuros = {
+            executor.submit(_renderizar_jugador, carpeta_partidos, jugador, equipo, dpis): jugador
+            for jugador in jugadores
+        }
+        for futuro in as_completed(futuros):
+            jugador = futuros[futuro]
+            try:
+                graficos += futuro.result()
+            except Exception as e:
+                fallos.append((jugador, str(e)))
+                print(f"[ERROR] Error renderizando {jugador}: {e}")
+                traceback.print_exception(e)
+    segundos = time.perf_counter() - inicio
+
+    resumen = {
+        "jugadores": len(jugadores),
+        "graficos": graficos,
+        "segundos": round(segundos, 2),
+        "jugadores_por_segundo": round(len(jugadores) / segundos, 2) if segundos > 0 else 0.0,
+        "fallos": fallos,
+    }
+    print(f"[INFO] Pre-render completado: {resumen['jugadores']} jugadores, {graficos} gráficos en "
+          f"{resumen['segundos']} s ({resumen['jugadores_por_segundo']} jugadores/s, {len(fallos)} fallos)")
+    return resumen
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pre-renderiza los gráficos de todos los jugadores.")
+    parser.add_argument("carpeta_partidos", nargs="?", default=CARPETA_PARTIDOS)
+    parser.add_argument("--equipo", default=EQUIPO_POR_DEFECTO)
+    parser.add_argument("--procesos", type=int, default=None)
+    parser.add_argument("--pdf", action="store_true", help="Genera también las imágenes a la resolución del PDF.")
+    args = parser.parse_args()
+
+    from visualizations.cache_render import DPI_PANTALLA
+    dpis = (DPI_PANTALLA, DPI_PDF) if args.pdf else (DPI_PANTALLA,)
+    resumen = prerenderizar_jugadores(args.carpeta_partidos, args.equipo, procesos=args.procesos, dpis=dpis)
+    if resumen["fallos"]:
+        raise SystemExit(1)
@@ -0,0 +1,105 @@
+import io
+import os
+import hashlib
+import threading
+import numpy as np
+from PIL import Image
+from procesamiento.rutas_almacen import escribir_atomico, hash_archivo
+from procesamiento.rendimiento import registrar_cache
+
+# Carpeta donde se guardan las variantes ya procesadas (sin fondo y redimensionadas)
+CARPETA_VARIANTES = os.environ.get("LFC_CACHE_IMAGENES", "./data/cache_imagenes")
+
+# Subir este número cuando cambie el procesamiento para no servir variantes viejas
+VERSION_VARIANTES = 1
+
+# Variantes en memoria: (ruta, tamaño, mtime, parámetros) -> bytes PNG
+_CACHE_VARIANTES = {}
+_LOCK_VARIANTES = threading.Lock()
+
+
+def eliminar_fondo_blanco(imagen):
+    """
+    Vuelve transparentes los píxeles blancos puros de una imagen.
+
+    Parámetros:
+    - imagen (PIL.Image): Imagen en cualquier modo.
+
+    Retorna:
+    - PIL.Image: Imagen RGBA donde los píxeles (255, 255, 255) pasan a (255, 255, 255, 0).
+    """
+    pixeles = np.array(imagen.convert("RGBA"))
+    blancos = (pixeles[:, :, :3] == 255).all(axis=2)
+    pixeles[blancos] = (255, 255, 255, 0)
+    return Image.fromarray(pixeles, "RGBA")
+
+
+def procesar_imagen(imagen, tamano=None, quitar_fondo=True):
+    """Aplica la eliminación de fondo y el redimensionado (LANCZOS) a una imagen PIL."""
+    if quitar_fondo:
+        imagen = eliminar_fondo_blanco(imagen)
+    if tamano is not None and tuple(tamano) != imagen.size:
+        imagen = imagen.resize(tuple(tamano), Image.LANCZOS)
+    return imagen
+
+
+def _nombre_variante(ruta, huella, tamano, quitar_fondo):
+    nombre = os.path.splitext(os.path.basename(ruta))[0].replace(" ", "_")
+    medidas = "original" if tamano is None else f"{tamano[0]}x{tamano[1]}"
+    sha = hashlib.sha256(f"{huella}:{medidas}:{quitar_fondo}:{VERSION_VARIANTES}".encode("utf-8"))
+    return f"{nombre}-{medidas}-{sha.hexdigest()[:16]}.png"
+
+
+def variante_imagen(ruta, tamano=None, quitar_fondo=True, carpeta_variantes=CARPETA_VARIANTES):
+    """
+    Retorna los bytes PNG de una imagen preprocesada, generándola solo la primera vez.
+
+    La variante se guarda en carpeta_variantes con un nombre que incluye el hash del
+    contenido de la imagen original, de modo que si la imagen cambia se genera otra.
+
+    Parámetros:
+    - ruta (str): Ruta de la imagen original.
+    - tamano (tuple): (ancho, alto) final en píxeles. None conserva el tamaño original.
+    - quitar_fondo (bool): Si es True, los píxeles blancos pasan a ser transparentes.
+    - carpeta_variantes (str): Carpeta donde se guardan las variantes.
+
+    Retorna:
+    - bytes: Imagen PNG lista para st.image.
+    """
+    estado = os.stat(ruta)
+    clave = (os.path.abspath(ruta), estado.st_size, estado.st_mtime_ns,
+             None if tamano is None else tuple(tamano), quitar_fondo)
+    with _LOCK_VARIANTES:
+        png = _CACHE_VARIANTES.get(clave)
+    registrar_cache("imagenes", png is not None)
+    if png is not None:
+        return png
+
+    ruta_variante = os.path.join(carpeta_variantes,
+                                 _nombre_variante(ruta, hash_archivo(ruta), tamano, quitar_fondo))
+    if os.path.exists(ruta_variante):
+        with open(ruta_variante, "rb") as f:
+            png = f.read()
+    else:
+        with Image.open(ruta) as imagen:
+            procesada = procesar_imagen(imagen, tamano, quitar_fondo)
+        buffer = io.BytesIO()
+        procesada.save(buffer, format="PNG", optimize=True)
+        png = buffer.getvalue()
+
+        try:
+            os.makedirs(carpeta_variantes, exist_ok=True)
+
+            def escribir(destino):
+                with open(destino, "wb") as f:
+                    f.write(png)
+
+            escribir_atomico(ruta_variante, escribir)
+        except OSError as e:
+            # Sin permisos de escritura: se sirve igualmente desde memoria
+            print(f"[ERROR] No se pudo guardar la variante {ruta_variante}: {e}")
+
+    with _LOCK_VARIANTES:
+        _CACHE_VARIANTES[clave] = png
+    return png
+
@@ -0,0 +1,173 @@
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from scipy.sparse.csgraph import connected_components, shortest_path
+from procesamiento.almacen_eventos import CARPETA_PARTIDOS, EQUIPO_POR_DEFECTO, cargar_eventos
+from procesamiento.agregados_equipo import calcular_agregados_equipo
+from procesamiento.ventanas_partidos import partidos_ventana
+from procesamiento.rendimiento import medir, registrar_cache
+
+# Orígenes por bloque en el cálculo de la intermediación (memoria de orden bloque × n²)
+BLOQUE_INTERMEDIACION = 64
+
+# Columnas del almacén que necesita la red de pases
+COLUMNAS_RED_PASES = ["game_id", "period", "team", "player_id", "player", "type", "outcome_type",
+                      "x", "y", "end_x", "end_y"]
+
+
+def calcular_red_pases(eventos, equipo=None):
+    """
+    Construye la red de pases (pasador -> receptor) de un conjunto de eventos en una pasada vectorizada.
+
+    El receptor de un pase exitoso es el jugador del siguiente evento con jugador del mismo
+    partido y periodo, si es del mismo equipo y no es el propio pasador. Los conteos se
+    acumulan en una matriz dispersa de scipy, de modo que el coste no depende de cuántos
+    partidos o equipos haya en los eventos.
+
+    Parámetros:
+    - eventos (DataFrame): Eventos en el orden del almacén con las columnas de COLUMNAS_RED_PASES.
+      Deben incluir a ambos equipos para que un evento rival corte la secuencia.
+    - equipo (str): Si se indica, la red solo tiene los jugadores y pases de ese equipo.
+
+    Retorna:
+    - dict: 'pases' (csr_matrix jugadores × jugadores con los pases entre cada par),
+      'jugadores' (DataFrame con 'player_id', 'player' y 'team' por nodo), 'posiciones'
+      (ndarray jugadores × 2 con la posición media x, y) y 'centralidad' (DataFrame por nodo).
+    """
+    eventos = eventos[eventos["player_id"].notna()]
+    partido = eventos["game_id"].to_numpy()
+    periodo = eventos["period"].to_numpy(dtype=object)
+    equipos = eventos["team"].to_numpy(dtype=object)
+    id_jugador = eventos["player_id"].to_numpy(dtype="int64")
+
+    es_pase = ((eventos["type"] == "Pass") & (eventos["outcome_type"] == "Successful")).to_numpy()
+    # Cada evento se compara con el siguiente: mismo partido, periodo y equipo, otro jugador
+    siguiente_valido = np.zeros(len(eventos), dtype=bool)
+    siguiente_valido[:-1] = ((partido[1:] == partido[:-1]) & (periodo[1:] == periodo[:-1])
+                             & (equipos[1:] == equipos[:-1]) & (id_jugador[1:] != id_jugador[:-1]))
+    del_equipo = np.ones(len(eventos), dtype=bool) if equipo is None else equipos == equipo
+    completados = np.flatnonzero(es_pase & siguiente_valido & del_equipo)
+
+    # Nodos: jugadores de los eventos seleccionados, ordenados por player_id
+    codigos = np.full(len(eventos), -1, dtype="int64")
+    codigos[del_equipo], ids = pd.factorize(id_jugador[del_equipo], sort=True)
+    pasador, receptor = codigos[completados], codigos[completados + 1]
+
+    n = len(ids)
+    pases = sparse.coo_matrix((np.ones(len(completados), dtype="int64"), (pasador, receptor)),
+                              shape=(n, n)).tocsr()
+
+    # Posición media: origen de los pases dados y destino de los recibidos
+    x = eventos["x"].to_numpy(dtype="float64", na_value=np.nan)
+    y = eventos["y"].to_numpy(dtype="float64", na_value=np.nan)
+    fin_x = eventos["end_x"].to_numpy(dtype="float64", na_value=np.nan)[completados]
+    fin_y = eventos["end_y"].to_numpy(dtype="float64", na_value=np.nan)[completados]
+    nodos = np.concatenate([pasador, receptor])
+    suma_x = np.bincount(nodos, np.nan_to_num(np.concatenate([x[completados], fin_x])), minlength=n)
+    suma_y = np.bincount(nodos, np.nan_to_num(np.concatenate([y[completados], fin_y])), minlength=n)
+    conteo = np.bincount(nodos, minlength=n)
+    posiciones = np.column_stack([
+        np.divide(suma_x, conteo, out=np.full(n, np.nan), where=conteo > 0),
+        np.divide(suma_y, conteo, out=np.full(n, np.nan), where=conteo > 0),
+    ])
+
+    primero = np.flatnonzero(del_equipo)[np.unique(codigos[del_equipo], return_index=True)[1]]
+    jugadores = pd.DataFrame({
+        "player_id": ids,
+        "player": eventos["player"].to_numpy(dtype=object)[primero],
+        "team": equipos[primero],
+    })
+    return {
+        "pases": pases,
+        "jugadores": jugadores,
+        "posiciones": posiciones,
+        "centralidad": calcular_centralidad(pases, jugadores["player"]),
+    }
+
+
+def calcular_centralidad(pases, nombres):
+    """
+    Calcula el grado y la intermediación de cada nodo de una red de pases.
+
+    La intermediación usa como distancia de cada arista el inverso del número de pases (las
+    conexiones más frecuentes son más cortas). Un nodo v cuenta para el par (s, t) si está en
+    un camino mínimo: d(s, v) + d(v, t) = d(s, t). Se calcula por componente conexa (en una
+    red de toda la liga, cada equipo) y se normaliza por (n-1)(n-2) con el tamaño n de la componente.
+
+    Retorna:
+    - DataFrame: Índice 'player' con 'pases_dados', 'pases_recibidos', 'grado' (pases dados
+      más recibidos), 'companeros' (pasadores y receptores distintos) e 'intermediacion'.
+    """
+    n = pases.shape[0]
+    dados = np.asarray(pases.sum(axis=1)).ravel()
+    recibidos = np.asarray(pases.sum(axis=0)).ravel()
+    conexiones = ((pases + pases.T) > 0).astype("int64")
+    companeros = np.asarray(conexiones.sum(axis=1)).ravel()
+
+    intermediacion = np.zeros(n)
+    if pases.nnz:
+        distancias = pases.astype("float64")
+        distancias.data = 1.0 / distancias.data
+        _, componentes = connected_components(distancias, directed=True, connection="weak")
+        orden = np.argsort(componentes, kind="stable")
+        limites = np.flatnonzero(np.diff(componentes[orden])) + 1
+        for nodos in np.split(orden, limites):
+            if len(nodos) > 2:
+                intermediacion[nodos] = _intermediacion(distancias[nodos][:, nodos])
+
+    return pd.DataFrame({
+        "pases_dados": dados,
+        "pases_recibidos": recibidos,
+        "grado": dados + recibidos,
+        "companeros": companeros,
+        "intermediacion": np.round(intermediacion, 4),
+    }, index=pd.Index(nombres, name="player"))
+
+
+def _intermediacion(distancias):
+    n = distancias.shape[0]
+    d = shortest_path(distancias, method="D", directed=True)
+    distintos = ~np.eye(n, dtype=bool)
+    cuenta = np.zeros(n, dtype="int64")
+    for inicio in range(0, n, BLOQUE_INTERMEDIACION):
+        origen = slice(inicio, inicio + BLOQUE_INTERMEDIACION)
+        # en_camino[s, v, t]: v está en un camino mínimo de s a t
+        en_camino = (np.isclose(d[origen, :, None] + d[None, :, :], d[origen, None, :])
+                     & np.isfinite(d[origen, None, :]))
+        en_camino &= distintos[origen, :, None] & distintos[None, :, :] & distintos[origen, None, :]
+        cuenta += en_camino.sum(axis=(0, 2))
+    return cuenta / ((n - 1) * (n - 2))
+
+
+def red_pases_equipo(carpeta_partidos=CARPETA_PARTIDOS, equipo=EQUIPO_POR_DEFECTO, ventana=None, game_ids=None):
+    """
+    Retorna la red de pases de un equipo en una ventana de jornadas o en partidos concretos.
+
+    Se calcula una vez por versión de los datos y ventana: se guarda junto a los agregados
+    del equipo (que ya se invalidan con la huella del almacén).
+
+    Parámetros:
+    - carpeta_partidos (str): Carpeta con los CSV de partidos.
+    - equipo (str): Equipo cuya red se construye.
+    - ventana (tuple): (inicio, fin, sede). None = toda la temporada.
+    - game_ids (iterable): Si se indica, solo esos partidos (por ejemplo, uno solo).
+
+    Retorna:
+    - dict: El de calcular_red_pases más 'total_partidos'.
+    """
+    agregados = calcular_agregados_equipo(carpeta_partidos, equipo, ventana)
+    partidos = partidos_ventana(agregados["calendario"], agregados["ventana"])
+    if game_ids is not None:
+        seleccion = {int(g) for g in game_ids}
+        partidos = [g for g in partidos if g in seleccion]
+
+    redes = agregados.setdefault("redes_pases", {})
+    clave = tuple(partidos)
+    registrar_cache("red_pases", clave in redes)
+    if clave not in redes:
+        with medir("red_pases.construir", equipo=equipo, partidos=len(partidos)):
+            eventos = cargar_eventos(carpeta_partidos, columnas=COLUMNAS_RED_PASES, game_ids=partidos)
+            red = calcular_red_pases(eventos, equipo)
+        red["total_partidos"] = len(partidos)
+        redes[clave] = red
+    return redes[clave]
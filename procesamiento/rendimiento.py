@@ -0,0 +1,196 @@
+import os
+import json
+import time
+import threading
+import contextvars
+from collections import defaultdict, deque
+from functools import wraps
+import numpy as np
+
+# La instrumentación solo se activa con LFC_RENDIMIENTO=1; desactivada, medir() no hace nada
+RENDIMIENTO_ACTIVO = os.environ.get("LFC_RENDIMIENTO", "0") == "1"
+
+# Registro estructurado (una línea JSON por tramo, consulta a caché y ejecución de la página)
+RUTA_LOG_RENDIMIENTO = os.environ.get("LFC_LOG_RENDIMIENTO", "./data/rendimiento.jsonl")
+
+# Panel de rendimiento en la barra lateral, solo para administradores
+PANEL_RENDIMIENTO = os.environ.get("LFC_PANEL_RENDIMIENTO", "0") == "1"
+
+# Número de mediciones recientes por etapa con las que se calculan p50 y p95
+VENTANA_PERCENTILES = 200
+
+# Ejecuciones (reruns) recientes que se conservan para el panel
+MAX_EJECUCIONES = 20
+
+# Ejecución en curso del hilo que corre el script de Streamlit (None fuera de una ejecución)
+_EJECUCION_ACTUAL = contextvars.ContextVar("ejecucion_rendimiento", default=None)
+
+_DURACIONES = defaultdict(lambda: deque(maxlen=VENTANA_PERCENTILES))
+_EJECUCIONES = deque(maxlen=MAX_EJECUCIONES)
+_LOCK_RENDIMIENTO = threading.Lock()
+_contador_ejecuciones = 0
+
+
+def activar(activo=True, ruta_log=None):
+    """Activa o desactiva la instrumentación en tiempo de ejecución (y cambia el registro si se indica)."""
+    global RENDIMIENTO_ACTIVO, RUTA_LOG_RENDIMIENTO
+    RENDIMIENTO_ACTIVO = activo
+    if ruta_log is not None:
+        RUTA_LOG_RENDIMIENTO = ruta_log
+
+
+def _escribir_registro(registro):
+    if not RUTA_LOG_RENDIMIENTO:
+        return
+    linea = json.dumps(registro, ensure_ascii=False, default=str) + "\n"
+    try:
+        with _LOCK_RENDIMIENTO:
+            directorio = os.path.dirname(RUTA_LOG_RENDIMIENTO)
+            if directorio:
+                os.makedirs(directorio, exist_ok=True)
+            with open(RUTA_LOG_RENDIMIENTO, "a", encoding="utf-8") as f:
+                f.write(linea)
+    except OSError as e:
+        print(f"[ERROR] No se pudo escribir el registro de rendimiento: {e}")
+
+
+class _TramoNulo:
+    """Tramo que no mide nada: es lo que retorna medir() con la instrumentación desactivada."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_TRAMO_NULO = _TramoNulo()
+
+
+class _Tramo:
+    """Mide la duración de una etapa y la registra al salir del bloque with."""
+
+    def __init__(self, etapa, atributos):
+        self.etapa = etapa
+        self.atributos = atributos
+
+    def __enter__(self):
+        self.inicio = time.perf_counter()
+        return self
+
+    def __exit__(self, tipo_error, *exc):
+        ms = (time.perf_counter() - self.inicio) * 1000
+        ejecucion = _EJECUCION_ACTUAL.get()
+        registro = dict(self.atributos, tipo="tramo", etapa=self.etapa, ms=round(ms, 3), error=tipo_error is not None)
+        with _LOCK_RENDIMIENTO:
+            _DURACIONES[self.etapa].append(ms)
+        if ejecucion is not None:
+            ejecucion["tramos"].append(registro)
+            registro["ejecucion"] = ejecucion["id"]
+        _escribir_registro(registro)
+        return False
+
+
+def medir(etapa, **atributos):
+    """
+    Retorna un context manager que mide la duración del bloque como la etapa indicada.
+
+    Uso: `with medir("jugadores.carga_eventos", jugador=nombre): ...`. Con la
+    instrumentación desactivada retorna un objeto vacío compartido, sin medir ni registrar.
+    """
+    if not RENDIMIENTO_ACTIVO:
+        return _TRAMO_NULO
+    return _Tramo(etapa, atributos)
+
+
+def medido(etapa):
+    """Decorador que mide cada llamada a la función como la etapa indicada."""
+    def decorador(funcion):
+        @wraps(funcion)
+        def envoltura(*args, **kwargs):
+            if not RENDIMIENTO_ACTIVO:
+                return funcion(*args, **kwargs)
+            with _Tramo(etapa, {}):
+                return funcion(*args, **kwargs)
+        return envoltura
+    return decorador
+
+
+def registrar_cache(cache, acierto):
+    """Registra una consulta a una caché ('render', 'agregados', ...) como acierto o fallo."""
+    if not RENDIMIENTO_ACTIVO:
+        return
+    resultado = "hit" if acierto else "miss"
+    ejecucion = _EJECUCION_ACTUAL.get()
+    registro = {"tipo": "cache", "cache": cache, "resultado": resultado}
+    if ejecucion is not None:
+        conteos = ejecucion["caches"].setdefault(cache, {"hit": 0, "miss": 0})
+        conteos[resultado] += 1
+        registro["ejecucion"] = ejecucion["id"]
+    _escribir_registro(registro)
+
+
+def iniciar_ejecucion(pagina):
+    """Marca el inicio de una ejecución (rerun) de la app; los tramos siguientes se le asignan."""
+    global _contador_ejecuciones
+    if not RENDIMIENTO_ACTIVO:
+        return None
+    with _LOCK_RENDIMIENTO:
+        _contador_ejecuciones += 1
+        identificador = f"{os.getpid()}-{_contador_ejecuciones}"
+    ejecucion = {"id": identificador, "pagina": pagina, "inicio": time.time(),
+                 "perf_inicio": time.perf_counter(), "tramos": [], "caches": {}}
+    _EJECUCION_ACTUAL.set(ejecucion)
+    return ejecucion
+
+
+def finalizar_ejecucion():
+    """
+    Cierra la ejecución en curso, la registra y la guarda entre las recientes.
+
+    Retorna:
+    - dict: 'id', 'pagina', 'ms' (total), 'tramos' y 'caches', o None si no había ejecución.
+    """
+    ejecucion = _EJECUCION_ACTUAL.get()
+    if ejecucion is None:
+        return None
+    _EJECUCION_ACTUAL.set(None)
+    ejecucion["ms"] = round((time.perf_counter() - ejecucion.pop("perf_inicio")) * 1000, 3)
+    with _LOCK_RENDIMIENTO:
+        _DURACIONES["ejecucion"].append(ejecucion["ms"])
+        _EJECUCIONES.append(ejecucion)
+    _escribir_registro({"tipo": "ejecucion", "ejecucion": ejecucion["id"], "pagina": ejecucion["pagina"],
+                        "ms": ejecucion["ms"], "tramos": len(ejecucion["tramos"]), "caches": ejecucion["caches"]})
+    return ejecucion
+
+
+def ejecuciones_recientes():
+    """Retorna las últimas ejecuciones finalizadas, la más reciente al final."""
+    with _LOCK_RENDIMIENTO:
+        return list(_EJECUCIONES)
+
+
+def percentiles_etapas():
+    """
+    Retorna p50 y p95 de las mediciones recientes de cada etapa.
+
+    Retorna:
+    - dict: etapa -> {'n', 'p50_ms', 'p95_ms'}.
+    """
+    with _LOCK_RENDIMIENTO:
+        duraciones = {etapa: list(valores) for etapa, valores in _DURACIONES.items()}
+    return {
+        etapa: {
+            "n": len(valores),
+            "p50_ms": round(float(np.percentile(valores, 50)), 3),
+            "p95_ms": round(float(np.percentile(valores, 95)), 3),
+        }
+        for etapa, valores in sorted(duraciones.items()) if valores
+    }
+
+
+def limpiar_rendimiento():
+    """Descarta las mediciones acumuladas en memoria (el registro en disco se conserva)."""
+    with _LOCK_RENDIMIENTO:
+        _DURACIONES.clear()
+        _EJECUCIONES.clear()
@@ -0,0 +1,102 @@
+import os
+import json
+import hashlib
+import tempfile
+
+# Rutas y utilidades del almacén de eventos que no necesitan pandas ni pyarrow, para que
+# la portada de la app pueda usarlas sin cargar las dependencias pesadas.
+
+# Carpeta por defecto con los CSV de partidos descargados por el scraper. Cada carpeta es
+# una colección de partidos de una temporada (de un equipo o de toda la liga)
+CARPETA_PARTIDOS = os.environ.get("LFC_CARPETA_PARTIDOS", "./data/partidos_liverpool")
+
+# Equipo que se muestra si no se elige otro
+EQUIPO_POR_DEFECTO = os.environ.get("LFC_EQUIPO", "Liverpool")
+
+# Carpeta raíz donde se guarda el almacén columnar
+CARPETA_ALMACEN = "./data/almacen_eventos"
+
+NOMBRE_MANIFIESTO = "manifiesto.json"
+
+
+def ruta_almacen(carpeta_partidos=CARPETA_PARTIDOS):
+    """
+    Retorna la carpeta del almacén asociada a una carpeta de CSV de partidos.
+
+    El nombre lleva un hash de la ruta absoluta de la carpeta: dos carpetas con el mismo
+    nombre en sitios distintos ('a/partidos' y 'b/partidos') tienen almacenes distintos.
+    """
+    ruta = os.path.normcase(os.path.abspath(carpeta_partidos))
+    sufijo = hashlib.sha256(ruta.encode("utf-8")).hexdigest()[:8]
+    return os.path.join(CARPETA_ALMACEN, f"{os.path.basename(ruta)}_{sufijo}")
+
+
+def equipos_desde_nombre(archivo):
+    """Extrae local y visitante del nombre 'local_vs_visitante.csv'."""
+    nombre = os.path.splitext(archivo)[0]
+    if "_vs_" not in nombre:
+        return None, None
+    local, visitante = nombre.split("_vs_", 1)
+    return local, visitante
+
+
+def escribir_atomico(ruta, escribir):
+    """
+    Escribe un archivo en una ruta temporal y lo renombra al terminar.
+
+    La ruta temporal es única (mkstemp) aunque varias sesiones del mismo proceso escriban
+    el mismo archivo a la vez; termina en '.tmp' para distinguirla de los archivos completos.
+    """
+    descriptor, ruta_tmp = tempfile.mkstemp(dir=os.path.dirname(ruta) or ".",
+                                            prefix=f"{os.path.basename(ruta)}.", suffix=".tmp")
+    os.close(descriptor)
+    try:
+        # mkstemp crea el archivo con permisos 0600; se dejan los habituales de lectura
+        os.chmod(ruta_tmp, 0o644)
+        escribir(ruta_tmp)
+        os.replace(ruta_tmp, ruta)
+    finally:
+        if os.path.exists(ruta_tmp):
+            os.remove(ruta_tmp)
+
+
+def hash_archivo(ruta):
+    """Retorna el SHA-256 (hexadecimal) del contenido de un archivo, leído por bloques."""
+    sha = hashlib.sha256()
+    with open(ruta, "rb") as f:
+        for bloque in iter(lambda: f.read(1 << 20), b""):
+            sha.update(bloque)
+    return sha.hexdigest()
+
+
+def _leer_manifiesto(carpeta_almacen):
+    ruta = os.path.join(carpeta_almacen, NOMBRE_MANIFIESTO)
+    if not os.path.exists(ruta):
+        return None
+    try:
+        with open(ruta, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def partidos_por_equipo(manifiesto):
+    """Retorna {equipo: [game_id, ...]} a partir del manifiesto del almacén."""
+    equipos = {}
+    for info in manifiesto["partidos"].values():
+        for equipo in info["equipos"]:
+            equipos.setdefault(equipo, []).append(info["game_id"])
+    return {equipo: sorted(game_ids) for equipo, game_ids in sorted(equipos.items())}
+
+
+def equipos_manifiesto(carpeta_partidos=CARPETA_PARTIDOS):
+    """
+    Retorna los equipos del almacén según su último manifiesto, sin sincronizarlo.
+
+    A diferencia de equipos_almacen no lee los CSV: sirve para la barra lateral, que se
+    dibuja antes de que ninguna página cargue datos. Si el almacén aún no existe retorna [].
+    """
+    manifiesto = _leer_manifiesto(ruta_almacen(carpeta_partidos))
+    if not manifiesto or "partidos" not in manifiesto:
+        return []
+    return list(partidos_por_equipo(manifiesto))
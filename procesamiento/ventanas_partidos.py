@@ -0,0 +1,96 @@
+import numpy as np
+import pandas as pd
+
+# Filtro de sede: clave -> etiqueta que se muestra en las páginas
+SEDES = {
+    "todos": "Todos los partidos",
+    "local": "Solo local",
+    "visitante": "Solo visitante",
+}
+
+
+def calendario_equipo(manifiesto, equipo):
+    """
+    Retorna los partidos de un equipo ordenados por jornada (orden de game_id).
+
+    La sede se decide por team_id: el del equipo en el partido frente al 'local_team_id' que
+    el almacén guarda al ingestarlo.
+
+    Retorna:
+    - DataFrame: Columnas 'game_id' y 'local' (bool); la posición de cada fila es la jornada
+      que usan las ventanas (0 = primer partido).
+    """
+    partidos = sorted(
+        (info["game_id"], info["ids_equipos"][equipo] == info["local_team_id"])
+        for info in manifiesto["partidos"].values() if equipo in info["equipos"]
+    )
+    return pd.DataFrame({
+        "game_id": np.array([g for g, _ in partidos], dtype="int64"),
+        "local": np.array([local for _, local in partidos], dtype=bool),
+    })
+
+
+def sumas_prefijas(valores, local):
+    """
+    Calcula las sumas acumuladas por jornada de un arreglo de conteos, por sede.
+
+    Parámetros:
+    - valores (ndarray): Conteos con las jornadas en el segundo eje (filas × jornadas × ...).
+    - local (ndarray): bool por jornada, True si el equipo jugó de local.
+
+    Retorna:
+    - dict: sede -> ndarray int64 de forma (filas × jornadas + 1 × ...), con ceros en la
+      posición 0, de modo que la suma de las jornadas [inicio, fin) es P[:, fin] - P[:, inicio].
+    """
+    valores = np.asarray(valores, dtype="int64")
+    forma_local = (1, len(local)) + (1,) * (valores.ndim - 2)
+    local = np.asarray(local, dtype=bool).reshape(forma_local)
+    ceros = np.zeros((valores.shape[0], 1) + valores.shape[2:], dtype="int64")
+    return {
+        "todos": np.concatenate([ceros, valores.cumsum(axis=1)], axis=1),
+        "local": np.concatenate([ceros, np.where(local, valores, 0).cumsum(axis=1)], axis=1),
+        "visitante": np.concatenate([ceros, np.where(local, 0, valores).cumsum(axis=1)], axis=1),
+    }
+
+
+def normalizar_ventana(ventana, total_jornadas):
+    """
+    Convierte una ventana en (inicio, fin, sede) válida; None equivale a toda la temporada.
+
+    Parámetros:
+    - ventana (tuple): (inicio, fin, sede) con las jornadas [inicio, fin) y una clave de SEDES.
+    - total_jornadas (int): Número de partidos del calendario.
+    """
+    if ventana is None:
+        return 0, total_jornadas, "todos"
+    inicio, fin, sede = ventana
+    if sede not in SEDES:
+        raise ValueError(f"Sede desconocida: {sede}. Opciones: {list(SEDES)}.")
+    inicio = min(max(int(inicio), 0), total_jornadas)
+    return inicio, min(max(int(fin), inicio), total_jornadas), sede
+
+
+def sumar_ventana(prefijos, ventana, filas=None):
+    """
+    Suma los conteos de una ventana de jornadas con dos accesos a las sumas prefijas.
+
+    Parámetros:
+    - prefijos (dict): Resultado de sumas_prefijas.
+    - ventana (tuple): (inicio, fin, sede) ya normalizada.
+    - filas (array): Posiciones de las filas a sumar (por ejemplo, un jugador). None = todas.
+
+    Retorna:
+    - ndarray: Conteos de la ventana (filas × ...).
+    """
+    inicio, fin, sede = ventana
+    filas = slice(None) if filas is None else filas
+    return prefijos[sede][filas, fin] - prefijos[sede][filas, inicio]
+
+
+def partidos_ventana(calendario, ventana):
+    """Retorna los game_id de la ventana (inicio, fin, sede) ya normalizada."""
+    inicio, fin, sede = ventana
+    seleccion = calendario.iloc[inicio:fin]
+    if sede != "todos":
+        seleccion = seleccion[seleccion["local"] == (sede == "local")]
+    return seleccion["game_id"].tolist()
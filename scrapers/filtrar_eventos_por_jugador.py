@@ -1,14 +1,35 @@
 import os
 import pandas as pd
+from procesamiento.almacen_eventos import cargar_eventos_jugador, cargar_indice_jugadores
+
+def limpiar_eventos_jugador(filtered_data):
+    """
+    Limpia los eventos de un jugador: elimina columnas vacías y rellena valores faltantes.
+
+    Parámetros:
+    - filtered_data (DataFrame): Eventos del jugador.
+
+    Retorna:
+    - DataFrame: Eventos limpios.
+    """
+    # Eliminar columnas completamente vacías
+    filtered_data = filtered_data.dropna(axis=1, how='all').copy()
+
+    # Rellenar valores faltantes con lógica específica
+    filtered_data['second'] = filtered_data['second'].fillna(0)
+    filtered_data['end_x'] = filtered_data['end_x'].fillna(filtered_data['x'])
+    filtered_data['end_y'] = filtered_data['end_y'].fillna(filtered_data['y'])
+    return filtered_data
 
 def filtrar_y_limpiar_eventos_jugador(input_folder, output_folder, player_name):
     """
-    Filtra eventos de un jugador específico desde múltiples archivos CSV y limpia los datos.
+    Filtra eventos de un jugador específico usando el índice de jugadores del almacén
+    de eventos y guarda los datos limpios en un CSV.
 
     Parámetros:
     - input_folder (str): Ruta de la carpeta con los archivos CSV de los partidos.
     - output_folder (str): Ruta de la carpeta donde se guardarán los datos filtrados.
-    - player_name (str): Nombre del jugador a filtrar.
+    - player_name (str): Nombre exacto del jugador a filtrar (sin distinguir mayúsculas).
 
     Retorna:
     - str: Ruta del archivo CSV generado con los datos del jugador.
@@ -24,37 +45,17 @@ def filtrar_y_limpiar_eventos_jugador(input_folder, output_folder, player_name):
     sanitized_name = player_name.lower().replace(" ", "_")  # Normalizar el nombre para el archivo
     output_file_path = os.path.join(output_folder, f'{sanitized_name}_eventos.csv')
 
-    # Obtener la lista de archivos CSV
-    csv_files = [f for f in os.listdir(input_folder) if f.endswith('.csv')]
-
-    # Verificar si hay archivos CSV en la carpeta de entrada
-    if not csv_files:
-        raise FileNotFoundError("No se encontraron archivos CSV en la carpeta especificada.")
+    # Buscar el jugador en el índice por nombre exacto (sin distinguir mayúsculas)
+    indice = cargar_indice_jugadores(input_folder)
+    coincidencias = indice.loc[indice['player'].str.lower() == player_name.lower(), 'player_id'].unique()
 
-    # Inicializar un DataFrame para almacenar los datos filtrados
-    filtered_data = pd.DataFrame()
-
-    # Procesar cada archivo CSV
-    for csv_file in csv_files:
-        file_path = os.path.join(input_folder, csv_file)
-        try:
-            df = pd.read_csv(file_path)
-            # Filtrar por player (en lugar de player_name)
-            filtered_df = df[df['player'].str.contains(player_name, case=False, na=False)]
-            # Concatenar los datos filtrados
-            filtered_data = pd.concat([filtered_data, filtered_df], ignore_index=True)
-        except Exception as e:
-            print(f"Error procesando el archivo {csv_file}: {e}")
+    # Leer solo las filas de cada jugador coincidente desde el almacén
+    filtered_data = [cargar_eventos_jugador(input_folder, player_id=player_id) for player_id in coincidencias]
+    filtered_data = pd.concat(filtered_data, ignore_index=True) if filtered_data else pd.DataFrame()
 
     # Limpiar los datos filtrados
     if not filtered_data.empty:
-        # Eliminar columnas completamente vacías
-        filtered_data = filtered_data.dropna(axis=1, how='all')
-
-        # Rellenar valores faltantes con lógica específica
-        filtered_data['second'] = filtered_data['second'].fillna(0)
-        filtered_data['end_x'] = filtered_data['end_x'].fillna(filtered_data['x'])
-        filtered_data['end_y'] = filtered_data['end_y'].fillna(filtered_data['y'])
+        filtered_data = limpiar_eventos_jugador(filtered_data)
 
         # Guardar los datos filtrados y limpios en un archivo CSV
         filtered_data.to_csv(output_file_path, index=False)
@@ -62,4 +63,4 @@ def filtrar_y_limpiar_eventos_jugador(input_folder, output_folder, player_name):
         return output_file_path
     else:
         print(f"No se encontraron eventos para el jugador {player_name}.")
-        return None
\ No newline at end of file
+        return None
@@ -1,91 +1,354 @@
 import os
+import json
+import time
+import hashlib
+import argparse
+import threading
 import pandas as pd
 import ssl
-from datetime import date
-from soccerdata import WhoScored
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from procesamiento.almacen_eventos import actualizar_almacen
+from procesamiento.rutas_almacen import EQUIPO_POR_DEFECTO, equipos_desde_nombre, escribir_atomico, hash_archivo
+from procesamiento.prerenderizar_jugadores import prerenderizar_jugadores
 
 # Configuración para evitar problemas de SSL
 ssl._create_default_https_context = ssl._create_unverified_context
 
-def scrape_liverpool_events():
+LIGA = "ENG-Premier League"
+TEMPORADA_ACTUAL = 2024
+
+# Manifiesto del scraping, guardado junto a los CSV de partidos
+NOMBRE_MANIFIESTO_SCRAPING = "manifiesto_scraping.json"
+
+# Estados de un partido en el manifiesto
+ESTADO_COMPLETO = "completo"
+ESTADO_FALLIDO = "fallido"
+
+# Valores por defecto del modo concurrente
+TRABAJADORES = 4
+PETICIONES_POR_SEGUNDO = 0.5
+REINTENTOS = 3
+ESPERA_BASE_REINTENTO = 5.0
+
+
+class ObtenedorWhoScored:
+    """Obtiene calendario y eventos de WhoScored a través de soccerdata (un navegador por instancia)."""
+
+    def __init__(self, liga=LIGA, temporada=TEMPORADA_ACTUAL):
+        from soccerdata import WhoScored
+        self.ws = WhoScored(leagues=[liga], seasons=[temporada])
+
+    def calendario(self):
+        return self.ws.read_schedule().reset_index()
+
+    def eventos(self, game_id):
+        return self.ws.read_events(game_id)
+
+    def cerrar(self):
+        self.ws.close()
+
+
+class ObtenedorLocal:
     """
-    Scrapea los eventos de los partidos del Liverpool en la temporada actual 
-    y guarda cada partido en un archivo CSV dentro de la carpeta correspondiente.
+    Sirve partidos ya grabados en una carpeta de CSV ('local_vs_visitante.csv'), con la
+    misma interfaz que ObtenedorWhoScored. Permite ejecutar el scraper sin red.
     """
-    print("[INFO] Iniciando scraping de partidos del Liverpool...")
 
-    # Temporada actual
-    temporada_actual = 2024
+    def __init__(self, carpeta):
+        self.carpeta = carpeta
+        self._archivos = {}
+        for archivo in sorted(f for f in os.listdir(carpeta) if f.endswith(".csv")):
+            game_id = pd.read_csv(os.path.join(carpeta, archivo), usecols=["game_id"], nrows=1)["game_id"]
+            if not game_id.empty:
+                self._archivos[int(game_id.iloc[0])] = archivo
 
-    # Inicializar el scraper para la Premier League
-    ws = WhoScored(leagues=["ENG-Premier League"], seasons=[temporada_actual])
-    equipo = "Liverpool"
+    def calendario(self):
+        filas = []
+        for game_id, archivo in self._archivos.items():
+            local, visitante = equipos_desde_nombre(archivo)
+            filas.append({"game_id": game_id, "home_team": local, "away_team": visitante})
+        return pd.DataFrame(filas, columns=["game_id", "home_team", "away_team"])
 
-    # Obtener el calendario de partidos
-    calendario = ws.read_schedule()
+    def eventos(self, game_id):
+        return pd.read_csv(os.path.join(self.carpeta, self._archivos[game_id]))
 
-    # Filtrar los partidos del equipo
-    partidos_liverpool = calendario[
-        (calendario["home_team"] == equipo) | (calendario["away_team"] == equipo)
-    ]
+    def cerrar(self):
+        pass
 
-    # Verificar si hay partidos disponibles
-    if partidos_liverpool.empty:
-        print(f"[INFO] No se encontraron partidos para {equipo}.")
-        ws.close()
-        return
 
-    # Crear carpeta para guardar los partidos
-    carpeta_destino = f"data/partidos_{equipo.lower()}"
-    os.makedirs(carpeta_destino, exist_ok=True)
+class LimitadorTasa:
+    """Espacia las peticiones de todos los hilos para no superar peticiones_por_segundo."""
 
-    # Verificar archivos existentes para evitar duplicados
-    archivos_existentes = os.listdir(carpeta_destino)
-    nuevos_partidos = 0
-    partidos_sin_eventos = 0  # Contador de partidos consecutivos sin eventos
+    def __init__(self, peticiones_por_segundo):
+        self.intervalo = 1.0 / peticiones_por_segundo if peticiones_por_segundo else 0.0
+        self._siguiente = 0.0
+        self._lock = threading.Lock()
 
-    for _, partido in partidos_liverpool.iterrows():
-        try:
-            # Identificar el ID del partido y el rival
-            match_id = int(partido["game_id"])
-            home_team = partido["home_team"]
-            away_team = partido["away_team"]
-
-            # Crear nombre del archivo respetando el orden local vs visitante
-            filename = f"{home_team.lower()}_vs_{away_team.lower()}.csv"
-            file_path = os.path.join(carpeta_destino, filename)
-
-            # Si el archivo ya existe, pasar al siguiente partido
-            if filename in archivos_existentes:
-                print(f"[INFO] Partido ya procesado: {filename}")
-                continue
+    def esperar(self):
+        with self._lock:
+            ahora = time.monotonic()
+            turno = max(ahora, self._siguiente)
+            self._siguiente = turno + self.intervalo
+        if turno > ahora:
+            time.sleep(turno - ahora)
 
-            print(f"[INFO] Procesando partido: {home_team} vs {away_team}")
 
-            # Obtener los eventos del partido
-            eventos = ws.read_events(match_id)
+def cargar_manifiesto_scraping(carpeta_destino):
+    """Lee el manifiesto del scraping ({game_id: entrada}); vacío si no existe."""
+    ruta = os.path.join(carpeta_destino, NOMBRE_MANIFIESTO_SCRAPING)
+    if not os.path.exists(ruta):
+        return {}
+    with open(ruta, encoding="utf-8") as f:
+        return json.load(f)
 
-            # Si hay eventos, reiniciar el contador de partidos sin eventos
-            partidos_sin_eventos = 0
 
-            # Guardar los eventos en un archivo CSV
-            eventos.to_csv(file_path, index=False)
-            print(f"[INFO] Archivo guardado: {file_path}")
-            nuevos_partidos += 1
+def _guardar_manifiesto_scraping(carpeta_destino, manifiesto):
+    def escribir(destino):
+        with open(destino, "w", encoding="utf-8") as f:
+            json.dump(manifiesto, f, indent=2, ensure_ascii=False, sort_keys=True)
 
+    escribir_atomico(os.path.join(carpeta_destino, NOMBRE_MANIFIESTO_SCRAPING), escribir)
+
+
+def _estado_archivo(ruta):
+    """Tamaño y fecha de modificación de un CSV, para saber sin leerlo si cambió."""
+    estado = os.stat(ruta)
+    return {"tamano": estado.st_size, "mtime_ns": estado.st_mtime_ns}
+
+
+def _partido_completo(carpeta_destino, entrada, archivo):
+    """
+    Indica si un partido ya se descargó entero (según el manifiesto y su checksum).
+
+    Si el tamaño y la fecha del CSV coinciden con los del manifiesto no se vuelve a leer;
+    si no (o si la entrada no los tiene) se compara el checksum y, si coincide, se
+    actualizan en la entrada para la próxima ejecución.
+    """
+    ruta = os.path.join(carpeta_destino, archivo)
+    if entrada is None or entrada.get("estado") != ESTADO_COMPLETO or not os.path.exists(ruta):
+        return False
+    estado = _estado_archivo(ruta)
+    if all(entrada.get(clave) == valor for clave, valor in estado.items()):
+        return True
+    if hash_archivo(ruta) != entrada.get("sha256"):
+        return False
+    entrada.update(estado)
+    return True
+
+
+def _adoptar_archivo_existente(carpeta_destino, archivo, game_id):
+    """
+    Registra en el manifiesto un CSV descargado antes de que existiera el manifiesto.
+
+    Solo se acepta si se puede leer entero y corresponde al partido; si no, se vuelve a descargar.
+    """
+    ruta = os.path.join(carpeta_destino, archivo)
+    try:
+        ids = pd.read_csv(ruta, usecols=["game_id"])["game_id"].unique()
+    except Exception:
+        return None
+    if len(ids) != 1 or int(ids[0]) != game_id:
+        return None
+    return {
+        "estado": ESTADO_COMPLETO,
+        "archivo": archivo,
+        "filas": int(len(pd.read_csv(ruta, usecols=["game_id"]))),
+        "sha256": hash_archivo(ruta),
+        **_estado_archivo(ruta),
+        "intentos": 0,
+        "actualizado": datetime.now().isoformat(timespec="seconds"),
+    }
+
+
+def _descargar_partido(obtener_obtenedor, limitador, carpeta_destino, game_id, archivo, reintentos, espera_base):
+    """Descarga un partido con reintentos y lo escribe de forma atómica; retorna su entrada de manifiesto."""
+    ultimo_error = None
+    for intento in range(1, reintentos + 1):
+        try:
+            limitador.esperar()
+            eventos = obtener_obtenedor().eventos(game_id)
+            if eventos is None or eventos.empty:
+                raise ValueError("el partido no tiene eventos")
+
+            contenido = eventos.to_csv(index=False).encode("utf-8")
+
+            def escribir(destino):
+                with open(destino, "wb") as f:
+                    f.write(contenido)
+
+            ruta = os.path.join(carpeta_destino, archivo)
+            escribir_atomico(ruta, escribir)
+            return {
+                "estado": ESTADO_COMPLETO,
+                "archivo": archivo,
+                "filas": int(len(eventos)),
+                "sha256": hashlib.sha256(contenido).hexdigest(),
+                **_estado_archivo(ruta),
+                "intentos": intento,
+                "actualizado": datetime.now().isoformat(timespec="seconds"),
+            }
         except Exception as e:
-            print(f"[ERROR] Error procesando el partido {match_id}: {str(e)}")
-            continue
+            ultimo_error = e
+            if intento < reintentos:
+                espera = espera_base * 2 ** (intento - 1)
+                print(f"[ERROR] Partido {game_id}, intento {intento}/{reintentos}: {e}. Reintentando en {espera:.0f} s")
+                time.sleep(espera)
+
+    return {
+        "estado": ESTADO_FALLIDO,
+        "archivo": archivo,
+        "intentos": reintentos,
+        "error": str(ultimo_error),
+        "actualizado": datetime.now().isoformat(timespec="seconds"),
+    }
+
+
+def scrape_liverpool_events(equipo=EQUIPO_POR_DEFECTO, carpeta_destino=None, trabajadores=TRABAJADORES,
+                            peticiones_por_segundo=PETICIONES_POR_SEGUNDO, reintentos=REINTENTOS,
+                            espera_base=ESPERA_BASE_REINTENTO, crear_obtenedor=None, temporada=TEMPORADA_ACTUAL):
+    """
+    Scrapea los eventos de los partidos de un equipo (o de toda la liga) en la temporada
+    indicada y guarda cada partido en un archivo CSV dentro de la carpeta correspondiente.
+
+    Los partidos se descargan en paralelo con un número acotado de trabajadores y un
+    límite global de peticiones por segundo. Cada CSV se escribe de forma atómica y queda
+    registrado en un manifiesto por game_id (estado, filas y checksum), de modo que una
+    ejecución interrumpida continúa donde quedó y los partidos fallidos se reintentan.
+
+    Parámetros:
+    - equipo (str): Equipo cuyos partidos se descargan. None descarga todos los de la liga.
+    - carpeta_destino (str): Carpeta de los CSV. None usa 'data/partidos_<equipo>' o, para
+      toda la liga, 'data/partidos_premier_league_<temporada>'.
+    - trabajadores (int): Número máximo de descargas simultáneas.
+    - peticiones_por_segundo (float): Límite de peticiones entre todos los trabajadores.
+    - reintentos (int): Intentos por partido antes de marcarlo como fallido.
+    - espera_base (float): Segundos de espera tras el primer fallo (se duplica en cada intento).
+    - crear_obtenedor (callable): Crea el objeto que obtiene calendario y eventos
+      (ObtenedorWhoScored por defecto; ObtenedorLocal para trabajar sin red).
+    - temporada (int): Año de inicio de la temporada (2024 = 2024/25).
+
+    Retorna:
+    - dict: Manifiesto actualizado del scraping.
+    """
+    print(f"[INFO] Iniciando scraping de partidos de {equipo or 'toda la liga'}...")
+    crear_obtenedor = crear_obtenedor or (lambda: ObtenedorWhoScored(LIGA, temporada))
+
+    # Un obtenedor por hilo: el navegador de soccerdata no se puede compartir entre hilos
+    locales = threading.local()
+    obtenedores = []
+    lock_obtenedores = threading.Lock()
+
+    def obtener_obtenedor():
+        if not hasattr(locales, "obtenedor"):
+            locales.obtenedor = crear_obtenedor()
+            with lock_obtenedores:
+                obtenedores.append(locales.obtenedor)
+        return locales.obtenedor
+
+    try:
+        # Obtener el calendario de partidos y filtrar los partidos del equipo
+        calendario = obtener_obtenedor().calendario()
+        if equipo is None:
+            partidos_equipo = calendario
+        else:
+            es_del_equipo = (
+                (calendario["home_team"].str.casefold() == equipo.casefold())
+                | (calendario["away_team"].str.casefold() == equipo.casefold())
+            )
+            partidos_equipo = calendario[es_del_equipo]
+
+        # Verificar si hay partidos disponibles
+        if partidos_equipo.empty:
+            print(f"[INFO] No se encontraron partidos para {equipo or 'la liga'}.")
+            return {}
+
+        # Crear carpeta para guardar los partidos (una carpeta por temporada si es toda la liga)
+        if carpeta_destino is None:
+            carpeta_destino = (f"data/partidos_{equipo.lower()}" if equipo
+                               else f"data/partidos_premier_league_{temporada}")
+        os.makedirs(carpeta_destino, exist_ok=True)
+        manifiesto = cargar_manifiesto_scraping(carpeta_destino)
+
+        # Decidir qué partidos faltan según el manifiesto (no solo por el nombre del archivo)
+        pendientes = []
+        for _, partido in partidos_equipo.iterrows():
+            game_id = int(partido["game_id"])
+            archivo = f"{partido['home_team'].lower()}_vs_{partido['away_team'].lower()}.csv"
+            entrada = manifiesto.get(str(game_id))
+            if _partido_completo(carpeta_destino, entrada, archivo):
+                continue
+            if entrada is None and os.path.exists(os.path.join(carpeta_destino, archivo)):
+                entrada = _adoptar_archivo_existente(carpeta_destino, archivo, game_id)
+                if entrada is not None:
+                    manifiesto[str(game_id)] = entrada
+                    print(f"[INFO] Partido ya procesado: {archivo}")
+                    continue
+            pendientes.append((game_id, archivo))
+        _guardar_manifiesto_scraping(carpeta_destino, manifiesto)
+
+        print(f"[INFO] {len(pendientes)} partidos por descargar con {trabajadores} trabajadores")
+        limitador = LimitadorTasa(peticiones_por_segundo)
+        nuevos_partidos = 0
+        with ThreadPoolExecutor(max_workers=max(1, trabajadores)) as executor:
+            futuros = {
+                executor.submit(_descargar_partido, obtener_obtenedor, limitador, carpeta_destino,
+                                game_id, archivo, reintentos, espera_base): game_id
+                for game_id, archivo in pendientes
+            }
+            for futuro in as_completed(futuros):
+                game_id = futuros[futuro]
+                entrada = futuro.result()
+                manifiesto[str(game_id)] = entrada
+                # Guardar tras cada partido para poder retomar si se interrumpe la ejecución
+                _guardar_manifiesto_scraping(carpeta_destino, manifiesto)
+                if entrada["estado"] == ESTADO_COMPLETO:
+                    nuevos_partidos += 1
+                    print(f"[INFO] Archivo guardado: {entrada['archivo']} ({entrada['filas']} eventos)")
+                else:
+                    print(f"[ERROR] Error procesando el partido {game_id}: {entrada['error']}")
+    finally:
+        # Cerrar los navegadores del scraper
+        for obtenedor in obtenedores:
+            obtenedor.cerrar()
 
     # Resumen de la ejecución
+    fallidos = sum(1 for game_id, _ in pendientes if manifiesto[str(game_id)]["estado"] == ESTADO_FALLIDO)
     if nuevos_partidos == 0:
         print(f"[INFO] No se encontraron nuevos partidos para guardar.")
     else:
         print(f"[INFO] Se guardaron {nuevos_partidos} nuevos partidos.")
-    
-    # Cerrar el navegador del scraper
-    ws.close()
+    if fallidos:
+        print(f"[ERROR] {fallidos} partidos fallaron; se reintentarán en la próxima ejecución.")
+
+    # Ingestar los partidos nuevos en el almacén columnar y pre-renderizar las fichas: las del
+    # equipo o, con toda la liga, las de cada equipo que jugó alguno de los partidos nuevos
+    manifiesto_almacen = actualizar_almacen(carpeta_destino)
+    if nuevos_partidos > 0:
+        nuevos = {game_id for game_id, _ in pendientes if manifiesto[str(game_id)]["estado"] == ESTADO_COMPLETO}
+        equipos = [equipo] if equipo is not None else sorted({
+            nombre for info in manifiesto_almacen["partidos"].values() if info["game_id"] in nuevos
+            for nombre in info["equipos"]
+        })
+        for equipo_nuevo in equipos:
+            prerenderizar_jugadores(carpeta_destino, equipo_nuevo)
+    return manifiesto
 
 # Ejecutar el script directamente
 if __name__ == "__main__":
-    scrape_liverpool_events()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Descarga los eventos de los partidos del equipo desde WhoScored.")
+    parser.add_argument("--equipo", default=EQUIPO_POR_DEFECTO)
+    parser.add_argument("--liga", action="store_true", help="Descarga los partidos de todos los equipos.")
+    parser.add_argument("--temporada", type=int, default=TEMPORADA_ACTUAL)
+    parser.add_argument("--destino", default=None, help="Carpeta de los CSV (por defecto data/partidos_<equipo>).")
+    parser.add_argument("--trabajadores", type=int, default=TRABAJADORES)
+    parser.add_argument("--peticiones-por-segundo", type=float, default=PETICIONES_POR_SEGUNDO)
+    parser.add_argument("--reintentos", type=int, default=REINTENTOS)
+    parser.add_argument("--local", default=None,
+                        help="Carpeta con partidos grabados para usar en lugar de WhoScored.")
+    args = parser.parse_args()
+
+    crear_obtenedor = (lambda: ObtenedorLocal(args.local)) if args.local else None
+    scrape_liverpool_events(None if args.liga else args.equipo, args.destino, args.trabajadores,
+                            args.peticiones_por_segundo, args.reintentos, crear_obtenedor=crear_obtenedor,
+                            temporada=args.temporada)
@@ -0,0 +1,39 @@
+import numpy as np
+import pandas as pd
+from procesamiento.agregados_equipo import estadisticas_ventana
+from procesamiento.estadisticas_jugadores import COLUMNAS_METRICAS, calcular_cubo_por_partido
+from procesamiento.ventanas_partidos import sumas_prefijas
+
+
+def _prefijos():
+    # Dos jornadas: la primera en casa, con un gol de Salah en cada una
+    calendario = pd.DataFrame({'game_id': np.array([1, 2], dtype='int64'), 'local': np.array([True, False])})
+    eventos = pd.DataFrame({
+        'game_id': [1, 1, 2],
+        'player': ['Mohamed Salah', 'Mohamed Salah', 'Mohamed Salah'],
+        'type': ['Goal', 'Pass', 'Goal'],
+        'outcome_type': ['Successful', 'Successful', 'Successful'],
+        'qualifiers': ['[]', '[]', '[]'],
+    })
+    cubo = calcular_cubo_por_partido(eventos, calendario['game_id'].to_numpy())
+    local = calendario['local'].to_numpy()
+    player_ids = pd.Index([304], name='player_id')
+    return dict(cubo, calendario=calendario, player_ids=player_ids, conteos=sumas_prefijas(cubo['conteos'], local),
+                pases_clasificados=sumas_prefijas(cubo['pases_clasificados'], local))
+
+
+def test_jugador_ausente_retorna_ceros():
+    assert estadisticas_ventana(_prefijos(), 'Nadie', None) == {columna: 0 for columna in COLUMNAS_METRICAS}
+
+
+def test_ventana_por_sede():
+    prefijos = _prefijos()
+    assert estadisticas_ventana(prefijos, 'Mohamed Salah', None)['goals'] == 2
+    assert estadisticas_ventana(prefijos, 'Mohamed Salah', (0, 2, 'visitante'))['goals'] == 1
+    assert list(estadisticas_ventana(prefijos, 'Mohamed Salah', (0, 1, 'todos'))) == COLUMNAS_METRICAS
+
+
+def test_busqueda_por_player_id():
+    prefijos = _prefijos()
+    assert estadisticas_ventana(prefijos, ventana=None, player_id=304)['goals'] == 2
+    assert estadisticas_ventana(prefijos, ventana=None, player_id=1) == {columna: 0 for columna in COLUMNAS_METRICAS}
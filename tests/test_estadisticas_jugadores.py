@@ -0,0 +1,27 @@
+import pandas as pd
+from procesamiento.estadisticas_jugadores import CLAVES_FICHA, estadisticas_ficha, metricas_jugador
+
+
+def _eventos(filas):
+    return pd.DataFrame(filas, columns=['player', 'type', 'outcome_type', 'qualifiers'])
+
+
+def test_eventos_vacios_retornan_ceros():
+    # Un cubo sin jugadores no debe fallar al sumar por tipo
+    eventos = _eventos([])
+    assert estadisticas_ficha(eventos, 'Mohamed Salah') == {clave: 0 for clave in CLAVES_FICHA}
+    assert all(valor == 0 for valor in metricas_jugador(eventos, 'Mohamed Salah').values())
+
+
+def test_metricas_de_un_jugador():
+    eventos = _eventos([
+        ['Mohamed Salah', 'Pass', 'Successful', '[]'],
+        ['Mohamed Salah', 'Pass', 'Unsuccessful', '[]'],
+        ['Mohamed Salah', 'Goal', 'Successful', '[]'],
+        ['Virgil van Dijk', 'Clearance', 'Successful', '[]'],
+    ])
+    ficha = estadisticas_ficha(eventos, 'Mohamed Salah')
+    assert ficha['acciones_ofensivas'] == 3
+    assert ficha['goals'] == 1
+    assert ficha['porcentaje_pases_exitosos'] == 50.0
+    assert estadisticas_ficha(eventos, 'Virgil van Dijk')['acciones_defensivas'] == 1
@@ -0,0 +1,18 @@
+import os
+from procesamiento.rutas_almacen import equipos_desde_nombre, ruta_almacen
+
+
+def test_carpetas_con_el_mismo_nombre_tienen_almacenes_distintos(tmp_path):
+    assert ruta_almacen(str(tmp_path / "a" / "partidos")) != ruta_almacen(str(tmp_path / "b" / "partidos"))
+
+
+def test_misma_carpeta_mismo_almacen(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    absoluta = ruta_almacen(str(tmp_path / "partidos"))
+    assert ruta_almacen("partidos") == absoluta == ruta_almacen("./partidos/")
+    assert os.path.basename(absoluta).startswith("partidos_")
+
+
+def test_equipos_desde_nombre():
+    assert equipos_desde_nombre("manchester united_vs_liverpool.csv") == ("manchester united", "liverpool")
+    assert equipos_desde_nombre("partido.csv") == (None, None)
@@ -0,0 +1,64 @@
+import os
+import scrapers.scrape_liverpool_events as scraper
+from benchmarks.generador_eventos import generar_carpeta_partidos
+from procesamiento import rutas_almacen
+
+
+class ObtenedorContador(scraper.ObtenedorLocal):
+    """ObtenedorLocal que anota cada partido pedido."""
+    pedidos = []
+
+    def eventos(self, game_id):
+        ObtenedorContador.pedidos.append(game_id)
+        return super().eventos(game_id)
+
+
+def _scrape(origen, destino):
+    ObtenedorContador.pedidos = []
+    manifiesto = scraper.scrape_liverpool_events("Liverpool", destino, trabajadores=2, peticiones_por_segundo=0,
+                                                 reintentos=1, crear_obtenedor=lambda: ObtenedorContador(origen))
+    return manifiesto, list(ObtenedorContador.pedidos)
+
+
+def test_scrape_incremental_con_obtenedor_local(tmp_path, monkeypatch):
+    # Sin pre-render y con el almacén dentro de la carpeta temporal
+    monkeypatch.setattr(scraper, "prerenderizar_jugadores", lambda *args, **kwargs: None)
+    monkeypatch.setattr(rutas_almacen, "CARPETA_ALMACEN", str(tmp_path / "almacen"))
+    origen, destino = str(tmp_path / "origen"), str(tmp_path / "destino")
+    generar_carpeta_partidos(origen, partidos=3, semilla=0)
+
+    manifiesto, pedidos = _scrape(origen, destino)
+    assert len(pedidos) == 3
+    assert all(entrada["estado"] == scraper.ESTADO_COMPLETO for entrada in manifiesto.values())
+
+    # Segunda ejecución: todo está completo y no se descarga nada (ni se leen los CSV)
+    hasheados = []
+    monkeypatch.setattr(scraper, "hash_archivo",
+                        lambda ruta: hasheados.append(ruta) or rutas_almacen.hash_archivo(ruta))
+    _, pedidos = _scrape(origen, destino)
+    assert pedidos == []
+    assert hasheados == []
+
+    # Un CSV truncado no pasa el checksum y solo ese partido se vuelve a descargar
+    entrada = next(iter(manifiesto.values()))
+    with open(os.path.join(destino, entrada["archivo"]), "r+b") as f:
+        f.truncate(100)
+    manifiesto, pedidos = _scrape(origen, destino)
+    assert len(pedidos) == 1
+    assert manifiesto[str(pedidos[0])]["archivo"] == entrada["archivo"]
+
+
+def test_scrape_liga_prerenderiza_los_equipos_nuevos(tmp_path, monkeypatch):
+    prerenderizados = []
+    monkeypatch.setattr(scraper, "prerenderizar_jugadores",
+                        lambda carpeta, equipo, **kwargs: prerenderizados.append(equipo))
+    monkeypatch.setattr(rutas_almacen, "CARPETA_ALMACEN", str(tmp_path / "almacen"))
+    origen, destino = str(tmp_path / "origen"), str(tmp_path / "destino")
+    generar_carpeta_partidos(origen, partidos=2, semilla=0)
+
+    ObtenedorContador.pedidos = []
+    scraper.scrape_liverpool_events(None, destino, trabajadores=1, peticiones_por_segundo=0, reintentos=1,
+                                    crear_obtenedor=lambda: ObtenedorContador(origen))
+    # Los dos partidos del primer equipo: él y sus dos rivales
+    assert len(prerenderizados) == 3
+    assert "Liverpool" in prerenderizados
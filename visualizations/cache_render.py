@@ -0,0 +1,299 @@
+import io
+import os
+import hashlib
+import tempfile
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from importlib.metadata import version
+import pandas as pd
+from procesamiento.rendimiento import medir, registrar_cache
+
+# Límites de la caché en memoria de gráficos renderizados
+MAX_BYTES_CACHE_RENDER = 64 * 1024 * 1024
+MAX_ENTRADAS_CACHE_RENDER = 512
+
+# Caché en disco compartida por todos los procesos que sirven la app (sobrevive a reinicios)
+CARPETA_CACHE_DISCO = os.environ.get("LFC_CACHE_GRAFICOS", "./data/cache_graficos")
+MAX_BYTES_CACHE_DISCO = int(os.environ.get("LFC_CACHE_GRAFICOS_MAX_BYTES", 512 * 1024 * 1024))
+
+# Subir este número cuando cambie el aspecto de algún gráfico para no servir imágenes viejas
+VERSION_RENDER = 1
+
+# Resolución por defecto de las imágenes que se muestran en pantalla
+DPI_PANTALLA = 120
+
+
+class CacheRender:
+    """
+    Caché LRU de gráficos codificados como PNG, acotada por número de entradas y bytes.
+
+    Las claves tienen la forma '<grafico>:<hash>', de modo que se puede invalidar
+    todo un tipo de gráfico a la vez.
+    """
+
+    def __init__(self, max_bytes=MAX_BYTES_CACHE_RENDER, max_entradas=MAX_ENTRADAS_CACHE_RENDER):
+        self.max_bytes = max_bytes
+        self.max_entradas = max_entradas
+        self._entradas = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def obtener(self, clave):
+        with self._lock:
+            datos = self._entradas.get(clave)
+            if datos is None:
+                self.misses += 1
+                return None
+            self._entradas.move_to_end(clave)
+            self.hits += 1
+            return datos
+
+    def guardar(self, clave, datos):
+        if len(datos) > self.max_bytes:
+            return
+        with self._lock:
+            if clave in self._entradas:
+                self._bytes -= len(self._entradas.pop(clave))
+            self._entradas[clave] = datos
+            self._bytes += len(datos)
+            while self._bytes > self.max_bytes or len(self._entradas) > self.max_entradas:
+                _, expulsado = self._entradas.popitem(last=False)
+                self._bytes -= len(expulsado)
+                self.evictions += 1
+
+    def invalidar(self, grafico=None):
+        """Elimina todas las entradas, o solo las del tipo de gráfico indicado."""
+        with self._lock:
+            if grafico is None:
+                claves = list(self._entradas)
+            else:
+                claves = [c for c in self._entradas if c.startswith(f"{grafico}:")]
+            for clave in claves:
+                self._bytes -= len(self._entradas.pop(clave))
+
+    def estadisticas(self):
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entradas": len(self._entradas),
+                "bytes": self._bytes,
+            }
+
+
+class CacheDisco:
+    """
+    Caché de gráficos PNG en una carpeta, segura para varios procesos.
+
+    Cada entrada es un archivo escrito de forma atómica (temporal + rename). Cuando la
+    carpeta supera max_bytes se eliminan los archivos usados hace más tiempo.
+    """
+
+    def __init__(self, carpeta=CARPETA_CACHE_DISCO, max_bytes=MAX_BYTES_CACHE_DISCO):
+        self.carpeta = carpeta
+        self.max_bytes = max_bytes
+        self._bytes_estimados = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _ruta(self, clave):
+        return os.path.join(self.carpeta, clave.replace(":", "-") + ".png")
+
+    def obtener(self, clave):
+        ruta = self._ruta(clave)
+        try:
+            with open(ruta, "rb") as f:
+                datos = f.read()
+            # Marcar como usado recientemente para la expulsión por antigüedad
+            os.utime(ruta)
+        except OSError:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return datos
+
+    def guardar(self, clave, datos):
+        if len(datos) > self.max_bytes:
+            return
+        os.makedirs(self.carpeta, exist_ok=True)
+        descriptor, ruta_tmp = tempfile.mkstemp(dir=self.carpeta, suffix=".tmp")
+        try:
+            with os.fdopen(descriptor, "wb") as f:
+                f.write(datos)
+            os.replace(ruta_tmp, self._ruta(clave))
+        finally:
+            if os.path.exists(ruta_tmp):
+                os.remove(ruta_tmp)
+
+        with self._lock:
+            if self._bytes_estimados is None:
+                self._bytes_estimados = self._tamano_total()
+            else:
+                self._bytes_estimados += len(datos)
+            if self._bytes_estimados > self.max_bytes:
+                self._podar()
+
+    def _archivos(self):
+        try:
+            entradas = list(os.scandir(self.carpeta))
+        except FileNotFoundError:
+            return []
+        archivos = []
+        for entrada in entradas:
+            if entrada.name.endswith(".png"):
+                try:
+                    estado = entrada.stat()
+                except FileNotFoundError:
+                    continue
+                archivos.append((estado.st_mtime, estado.st_size, entrada.path))
+        return archivos
+
+    def _tamano_total(self):
+        return sum(tamano for _, tamano, _ in self._archivos())
+
+    def _podar(self):
+        """Elimina los archivos más antiguos hasta quedar en el 90% del límite."""
+        archivos = sorted(self._archivos())
+        total = sum(tamano for _, tamano, _ in archivos)
+        objetivo = self.max_bytes * 0.9
+        for _, tamano, ruta in archivos:
+            if total <= objetivo:
+                break
+            try:
+                os.remove(ruta)
+                self.evictions += 1
+            except FileNotFoundError:
+                pass
+            total -= tamano
+        self._bytes_estimados = total
+
+    def invalidar(self, grafico=None):
+        """Elimina todos los archivos, o solo los del tipo de gráfico indicado."""
+        prefijo = "" if grafico is None else f"{grafico}-"
+        for _, _, ruta in self._archivos():
+            if os.path.basename(ruta).startswith(prefijo):
+                try:
+                    os.remove(ruta)
+                except FileNotFoundError:
+                    pass
+        with self._lock:
+            self._bytes_estimados = None
+
+    def estadisticas(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+class CacheNiveles:
+    """Combina la caché en memoria (primer nivel) con la caché en disco (segundo nivel)."""
+
+    def __init__(self, memoria, disco):
+        self.memoria = memoria
+        self.disco = disco
+
+    def obtener(self, clave):
+        datos = self.memoria.obtener(clave)
+        if datos is None and self.disco is not None:
+            datos = self.disco.obtener(clave)
+            if datos is not None:
+                self.memoria.guardar(clave, datos)
+        return datos
+
+    def guardar(self, clave, datos):
+        self.memoria.guardar(clave, datos)
+        if self.disco is not None:
+            try:
+                self.disco.guardar(clave, datos)
+            except OSError as e:
+                # Sin permisos o sin espacio: se sigue sirviendo desde memoria
+                print(f"[ERROR] No se pudo guardar el gráfico en la caché de disco: {e}")
+
+    def invalidar(self, grafico=None):
+        self.memoria.invalidar(grafico)
+        if self.disco is not None:
+            self.disco.invalidar(grafico)
+
+    def estadisticas(self):
+        estadisticas = {"memoria": self.memoria.estadisticas()}
+        if self.disco is not None:
+            estadisticas["disco"] = self.disco.estadisticas()
+        return estadisticas
+
+
+# Caché compartida por todos los gráficos de la aplicación
+CACHE_RENDER = CacheNiveles(CacheRender(), CacheDisco())
+
+
+def huella_datos(df):
+    """Hash del contenido de un DataFrame (columnas y valores, sin el índice)."""
+    sha = hashlib.sha256(repr(list(df.columns)).encode("utf-8"))
+    sha.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return sha.hexdigest()
+
+
+@lru_cache(maxsize=None)
+def _version_matplotlib():
+    # Versión sin importar matplotlib: con la caché llena no hace falta cargarlo
+    return version("matplotlib")
+
+
+def clave_render(grafico, datos, args=(), kwargs=None, dpi=DPI_PANTALLA):
+    """Clave de caché a partir del contenido de los datos y los parámetros del gráfico."""
+    sha = hashlib.sha256(huella_datos(datos).encode("utf-8"))
+    sha.update(repr((args, sorted((kwargs or {}).items()), dpi)).encode("utf-8"))
+    sha.update(f"{VERSION_RENDER}:{_version_matplotlib()}".encode("utf-8"))
+    return f"{grafico}:{sha.hexdigest()}"
+
+
+def figura_a_png(fig, dpi=DPI_PANTALLA):
+    """Codifica una figura como PNG y la cierra para liberar memoria."""
+    import matplotlib.pyplot as plt
+
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="png", dpi=dpi, bbox_inches="tight")
+    plt.close(fig)
+    return buffer.getvalue()
+
+
+def renderizar_png(grafico, funcion, datos, *args, dpi=DPI_PANTALLA, **kwargs):
+    """
+    Retorna el PNG de un gráfico, renderizándolo solo si no está en la caché.
+
+    Parámetros:
+    - grafico (str): Nombre del tipo de gráfico (prefijo de la clave de caché).
+    - funcion (callable): Función que recibe (datos, *args, **kwargs) y retorna una figura.
+    - datos (DataFrame): Datos del gráfico; su contenido forma parte de la clave.
+    - dpi (int): Resolución del PNG.
+
+    Retorna:
+    - bytes: Imagen PNG, o None si la función no pudo generar el gráfico (ValueError).
+    """
+    with medir(f"render.{grafico}.clave"):
+        clave = clave_render(grafico, datos, args, kwargs, dpi)
+        png = CACHE_RENDER.obtener(clave)
+    registrar_cache("render", png is not None)
+    if png is not None:
+        return png
+
+    try:
+        with medir(f"render.{grafico}.dibujo"):
+            fig = funcion(datos, *args, **kwargs)
+    except ValueError as e:
+        # Sin datos suficientes para el gráfico: no se cachea
+        print(f"No se pudo generar el gráfico {grafico}: {e}")
+        return None
+
+    with medir(f"render.{grafico}.png", dpi=dpi):
+        png = figura_a_png(fig, dpi)
+    CACHE_RENDER.guardar(clave, png)
+    return png
@@ -0,0 +1,35 @@
+import streamlit as st
+from procesamiento.ventanas_partidos import SEDES
+
+def selector_ventana(calendario, clave):
+    """
+    Dibuja el filtro de jornadas y sede de una página.
+
+    Parámetros:
+    - calendario (DataFrame): Partidos del equipo por jornada (calendario_equipo).
+    - clave (str): Prefijo de las claves de los widgets en la sesión.
+
+    Retorna:
+    - tuple: (inicio, fin, sede) con las jornadas [inicio, fin), o None si se eligió toda la temporada.
+    """
+    total = len(calendario)
+    if total == 0:
+        return None
+
+    # Con otro equipo (u otro número de partidos) el rango elegido antes ya no es válido
+    if st.session_state.get(f"{clave}_total") != total:
+        st.session_state.pop(f"{clave}_jornadas", None)
+        st.session_state[f"{clave}_total"] = total
+
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        if total > 1:
+            inicio, fin = st.slider("Jornadas", 1, total, (1, total), key=f"{clave}_jornadas")
+        else:
+            inicio, fin = 1, 1
+    with col2:
+        sede = st.selectbox("Sede", list(SEDES), format_func=SEDES.get, key=f"{clave}_sede")
+
+    if (inicio, fin, sede) == (1, total, "todos"):
+        return None
+    return inicio - 1, fin, sede
@@ -1,30 +1,19 @@
-import os
-import pandas as pd
 import matplotlib.pyplot as plt
 import io
+from procesamiento.almacen_eventos import EQUIPO_POR_DEFECTO
+from procesamiento.rendimiento import medido
+from procesamiento.agregados_equipo import calcular_agregados_equipo
 
-def calcular_goles_por_jugador(carpeta_partidos):
-    all_data = []
-    for archivo in os.listdir(carpeta_partidos):
-        if archivo.endswith('.csv'):
-            file_path = os.path.join(carpeta_partidos, archivo)
-            data = pd.read_csv(file_path)
-            all_data.append(data)
-
-    all_data = pd.concat(all_data, ignore_index=True)
-    goles_liverpool = all_data[
-        (all_data['type'] == 'Goal') & (all_data['team'] == 'Liverpool')
-    ]
-
-    goles_por_jugador = goles_liverpool['player'].value_counts().reset_index()
-    goles_por_jugador.columns = ['player', 'goles']
-    return goles_por_jugador
+def calcular_goles_por_jugador(carpeta_partidos, equipo=EQUIPO_POR_DEFECTO, ventana=None):
+    return calcular_agregados_equipo(carpeta_partidos, equipo, ventana)['goles'].copy()
 
+@medido("grafico.goles_torta")
 def graficar_goles_torta(goles_df):
     """
     Genera un gráfico de torta con colores en tonalidades de rojo y lo guarda en un buffer.
     """
-    # Englobar jugadores con un solo gol en 'Otros'
+    # Englobar jugadores con un solo gol en 'Otros' (sin modificar el DataFrame recibido)
+    goles_df = goles_df.copy()
     goles_df.loc[goles_df['goles'] == 1, 'player'] = 'Otros'
     goles_torta = goles_df.groupby('player')['goles'].sum().reset_index()
 
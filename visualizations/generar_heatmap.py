@@ -1,40 +1,14 @@
+import numpy as np
 import matplotlib.pyplot as plt
 from mplsoccer import Pitch
-from scipy.ndimage import gaussian_filter
-import functools
+from procesamiento.mapas_calor import BINS_HEATMAP, conteos_heatmap, suavizar_heatmap
+from visualizations.cache_render import CACHE_RENDER
+from visualizations.graficos_jugador import GRAFICO_HEATMAP
 
-# Diccionario para caché de heatmaps
-HEATMAP_CACHE = {}
-
-# Decorador para caché
-def cache_heatmap(func):
-    @functools.wraps(func)
-    def wrapper(df_jugador, figsize=(9, 7), *args, **kwargs):
-        # Crear una clave única para el caché basada en el jugador y tamaño de figura
-        player_name = df_jugador['player'].iloc[0] if 'player' in df_jugador.columns and not df_jugador.empty else "unknown"
-        cache_key = f"{player_name}_heatmap_{figsize[0]}x{figsize[1]}"
-        
-        # Si ya existe en caché, devolver el gráfico almacenado
-        if cache_key in HEATMAP_CACHE:
-            return HEATMAP_CACHE[cache_key]
-        
-        # Si no está en caché, generar el gráfico
-        try:
-            fig = func(df_jugador, figsize, *args, **kwargs)
-            # Almacenar en caché
-            HEATMAP_CACHE[cache_key] = fig
-            return fig
-        except ValueError as e:
-            # Si hay un error, registrarlo pero no cachear
-            print(f"No se pudo generar el heatmap: {e}")
-            return None
-    return wrapper
-
-@cache_heatmap
 def generar_heatmap(df_jugador, figsize=(9, 7)):
     """
     Genera un heatmap para un jugador basado en las coordenadas x, y.
-    Utiliza caché para mejorar el rendimiento en entornos con recursos limitados.
+    Para obtener la imagen cacheada usar renderizar_grafico_jugador(GRAFICO_HEATMAP, df_jugador).
 
     Parámetros:
     - df_jugador (DataFrame): DataFrame con los eventos del jugador, que contiene las columnas 'x' y 'y'.
@@ -47,9 +21,24 @@ def generar_heatmap(df_jugador, figsize=(9, 7)):
     if 'x' not in df_jugador.columns or 'y' not in df_jugador.columns:
         raise ValueError("El DataFrame debe contener las columnas 'x' y 'y'.")
 
-    # Filtrar las columnas necesarias para el heatmap
-    heatmap_data = df_jugador[['x', 'y']].dropna()
+    # Conteos por celda con la misma rejilla que el tensor de heatmaps del almacén
+    conteos = conteos_heatmap(df_jugador['x'].to_numpy(dtype='float64', na_value=np.nan),
+                              df_jugador['y'].to_numpy(dtype='float64', na_value=np.nan))[0]
+    return generar_heatmap_conteos(conteos, figsize)
+
+def generar_heatmap_conteos(conteos, figsize=(9, 7)):
+    """
+    Dibuja un heatmap a partir de conteos ya agregados (por ejemplo, sumas del tensor de heatmaps).
+    Es el gráfico GRAFICO_HEATMAP de la ficha: para obtener la imagen cacheada usar
+    renderizar_grafico_jugador(GRAFICO_HEATMAP, df_jugador, heatmap=conteos).
 
+    Parámetros:
+    - conteos (array o DataFrame): Matriz (filas_y, columnas_x) con las filas de arriba abajo del campo.
+    - figsize (tuple): Tamaño de la figura Matplotlib.
+
+    Retorna:
+    - fig: Objeto de la figura Matplotlib con el heatmap.
+    """
     # Configurar el campo
     pitch = Pitch(
         pitch_type='opta', 
@@ -63,12 +52,9 @@ def generar_heatmap(df_jugador, figsize=(9, 7)):
     fig, ax = pitch.draw(figsize=figsize)
     fig.set_facecolor('black')  # Fondo de la figura
 
-    # Crear los datos del mapa de calor acumulado
-    bin_statistic = pitch.bin_statistic(
-        heatmap_data['x'], heatmap_data['y'],
-        statistic='count', bins=(25, 25)
-    )
-    bin_statistic['statistic'] = gaussian_filter(bin_statistic['statistic'], 1)
+    # Rejilla del campo (sin puntos) con los conteos suavizados como estadística
+    bin_statistic = pitch.bin_statistic(np.array([]), np.array([]), statistic='count', bins=BINS_HEATMAP)
+    bin_statistic['statistic'] = suavizar_heatmap(conteos)
 
     # Dibujar el mapa de calor con transparencia
     pcm = pitch.heatmap(bin_statistic, ax=ax, cmap='hot', edgecolors='#22312b', alpha=0.7)
@@ -83,5 +69,4 @@ def generar_heatmap(df_jugador, figsize=(9, 7)):
 
 # Función para limpiar el caché si es necesario
 def clear_heatmap_cache():
-    global HEATMAP_CACHE
-    HEATMAP_CACHE = {}
\ No newline at end of file
+    CACHE_RENDER.invalidar(GRAFICO_HEATMAP)
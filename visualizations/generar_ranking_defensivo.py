@@ -1,37 +1,28 @@
-import os
-import pandas as pd
 import matplotlib.pyplot as plt
 import io
+from procesamiento.almacen_eventos import EQUIPO_POR_DEFECTO
+from procesamiento.rendimiento import medido
+from procesamiento.agregados_equipo import calcular_agregados_equipo
+from procesamiento.agregados_partido import ACCIONES_DEFENSIVAS
 
 # Variables defensivas que vamos a analizar
-defensive_actions = ['Clearance', 'Tackle', 'BallRecovery', 'Interception']
+defensive_actions = ACCIONES_DEFENSIVAS
 
-def generar_ranking_defensivo(carpeta_partidos):
+def generar_ranking_defensivo(carpeta_partidos, equipo=EQUIPO_POR_DEFECTO, ventana=None):
     """
-    Genera un ranking de acciones defensivas de los jugadores del Liverpool.
+    Genera un ranking de acciones defensivas de los jugadores del equipo.
+    Con ventana=(inicio, fin, sede) solo cuentan esas jornadas.
     """
-    all_defensive_data = []
+    return calcular_agregados_equipo(carpeta_partidos, equipo, ventana)['ranking_defensivo'].copy()
 
-    for archivo in os.listdir(carpeta_partidos):
-        if archivo.endswith('.csv'):
-            file_path = os.path.join(carpeta_partidos, archivo)
-            data = pd.read_csv(file_path)
-            liverpool_defensive_actions = data[
-                (data['type'].isin(defensive_actions)) & (data['team'] == 'Liverpool')
-            ]
-            all_defensive_data.append(liverpool_defensive_actions)
-
-    all_defensive_data = pd.concat(all_defensive_data, ignore_index=True)
-    ranking = all_defensive_data.groupby('player').size().reset_index(name='defensive_actions')
-    ranking = ranking.sort_values(by='defensive_actions', ascending=False)
-    return ranking
-
-def graficar_ranking_defensivo(ranking):
+@medido("grafico.ranking_defensivo")
+def graficar_ranking_defensivo(ranking, columna='defensive_actions'):
     """
     Genera un gráfico de barras con el ranking de acciones defensivas.
+    Con columna='defensive_actions_p90' las barras son por 90 minutos.
     """
     fig, ax = plt.subplots(figsize=(6, 4))  # Ajusta tamaño
-    ax.bar(ranking['player'], ranking['defensive_actions'], color='red', alpha=0.7)
+    ax.bar(ranking['player'], ranking[columna], color='red', alpha=0.7)
 
     # Configuración del diseño
     ax.set_xticklabels(ranking['player'], rotation=45, ha='right', fontsize=8)
@@ -0,0 +1,60 @@
+import io
+import numpy as np
+import matplotlib.pyplot as plt
+from matplotlib.collections import LineCollection
+from mplsoccer import Pitch
+from procesamiento.rendimiento import medido
+
+# Pases mínimos por partido para dibujar la conexión entre dos jugadores
+MIN_PASES_POR_PARTIDO = 2
+
+@medido("grafico.red_pases")
+def graficar_red_pases(red, min_pases=None):
+    """
+    Dibuja la red de pases de un equipo sobre el campo.
+
+    Todas las conexiones se dibujan en una sola LineCollection (grosor según el número de
+    pases) y todos los jugadores en un único scatter (tamaño según su grado), en su posición media.
+
+    Parámetros:
+    - red (dict): Resultado de red_pases_equipo.
+    - min_pases (int): Pases mínimos para dibujar una conexión. Por defecto, MIN_PASES_POR_PARTIDO
+      por cada partido de la red.
+
+    Retorna:
+    - BytesIO: Imagen PNG del gráfico.
+    """
+    if min_pases is None:
+        min_pases = MIN_PASES_POR_PARTIDO * max(red["total_partidos"], 1)
+
+    pases = red["pases"].tocoo()
+    posiciones = red["posiciones"]
+    visibles = pases.data >= min_pases
+    origen, destino, conteos = pases.row[visibles], pases.col[visibles], pases.data[visibles]
+
+    pitch = Pitch(pitch_type='opta', pitch_color='#22312b', line_color='#c7d5cc')
+    fig, ax = pitch.draw(figsize=(10, 7))
+    fig.set_facecolor('#22312b')
+
+    if len(conteos):
+        segmentos = np.stack([posiciones[origen], posiciones[destino]], axis=1)
+        grosores = 0.5 + 6 * conteos / conteos.max()
+        ax.add_collection(LineCollection(segmentos, linewidths=grosores, colors='#c8102e', alpha=0.6, zorder=1))
+
+    # Solo los jugadores con alguna conexión visible
+    nodos = np.unique(np.concatenate([origen, destino]))
+    grado = red["centralidad"]["grado"].to_numpy()[nodos]
+    tamanos = 200 + 1200 * grado / max(grado.max(), 1) if len(nodos) else []
+    ax.scatter(posiciones[nodos, 0], posiciones[nodos, 1], s=tamanos, color='white', edgecolors='#c8102e',
+               linewidth=2, zorder=2)
+    for nodo in nodos:
+        # Sin el nombre de pila: "van Dijk", "Mac Allister"
+        apellido = str(red["jugadores"]["player"].iat[nodo]).split(" ", 1)[-1]
+        ax.annotate(apellido, posiciones[nodo], xytext=(0, -18), textcoords='offset points', ha='center',
+                    color='white', fontsize=8, zorder=3)
+
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="png", dpi=100, bbox_inches="tight")
+    plt.close(fig)
+    buffer.seek(0)
+    return buffer
@@ -0,0 +1,169 @@
+import os
+import importlib
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+import numpy as np
+import pandas as pd
+from procesamiento.mapas_calor import conteos_heatmap
+from visualizations.cache_render import CACHE_RENDER, DPI_PANTALLA, clave_render, renderizar_png
+from procesamiento.rendimiento import medir, registrar_cache
+
+# Nombres de los gráficos en la caché de render
+GRAFICO_RADAR = "radar"
+GRAFICO_HEATMAP = "heatmap"
+GRAFICO_PASES = "pases"
+GRAFICO_TIROS = "tiros"
+
+# Parámetros del radar de la ficha del jugador
+PARAMS_RADAR = ['Goals', '% Pass Successful', '% Take On Successful', 'Dispossessed',
+                '% Aerial Successful', '% Tackle Successful', 'Ball Recovery',
+                'Interception', 'Clearance']
+MIN_RANGE_RADAR = [0] * len(PARAMS_RADAR)
+MAX_RANGE_RADAR = [10, 100, 100, 5, 100, 100, 10, 10, 10]
+
+# Procesos que renderizan a la vez los gráficos de un jugador que no están en caché
+PROCESOS_GRAFICOS = int(os.environ.get("LFC_PROCESOS_GRAFICOS", min(4, os.cpu_count() or 1)))
+
+_POOL_GRAFICOS = None
+_LOCK_POOL = threading.Lock()
+
+
+def _funcion_diferida(modulo, nombre):
+    """
+    Retorna una función que importa el módulo del gráfico solo al llamarla.
+
+    matplotlib, mplsoccer y scipy tardan más de un segundo en importarse: si el gráfico
+    se sirve desde la caché de render nunca llegan a cargarse.
+    """
+    def funcion(*args, **kwargs):
+        return getattr(importlib.import_module(modulo), nombre)(*args, **kwargs)
+    funcion.__name__ = nombre
+    return funcion
+
+
+# Gráficos de la ficha del jugador: nombre en caché -> (función, argumentos extra, título)
+GRAFICOS_JUGADOR = {
+    GRAFICO_RADAR: (_funcion_diferida("visualizations.generar_radar_chart", "generate_radar_chart"),
+                    (PARAMS_RADAR, MIN_RANGE_RADAR, MAX_RANGE_RADAR), "Radar Chart"),
+    GRAFICO_HEATMAP: (_funcion_diferida("visualizations.generar_heatmap", "generar_heatmap_conteos"), (),
+                      "Heat Map"),
+    GRAFICO_PASES: (_funcion_diferida("visualizations.generar_campograma_pases", "generar_campograma_pases"),
+                    (), "Mapa de Pases"),
+    GRAFICO_TIROS: (_funcion_diferida("visualizations.generar_campograma_tiros", "generar_campograma_tiros"),
+                    (), "Mapa de Tiros"),
+}
+
+
+def datos_grafico_jugador(grafico, df_jugador, heatmap=None):
+    """
+    Retorna los datos con los que se dibuja (y se busca en la caché) un gráfico del jugador.
+
+    El heatmap se dibuja desde los conteos de la rejilla: los indicados en heatmap (sumas
+    del tensor de heatmaps del almacén) o, si no, los de las filas del jugador. Con los
+    mismos conteos la imagen y su clave de caché son las mismas por ambos caminos.
+    """
+    if grafico != GRAFICO_HEATMAP:
+        return df_jugador
+    if heatmap is None:
+        heatmap = conteos_heatmap(df_jugador["x"].to_numpy(dtype="float64", na_value=np.nan),
+                                  df_jugador["y"].to_numpy(dtype="float64", na_value=np.nan))[0]
+    return pd.DataFrame(np.asarray(heatmap, dtype="int64"))
+
+
+def renderizar_grafico_jugador(grafico, df_jugador, dpi=DPI_PANTALLA, heatmap=None):
+    """
+    Retorna el PNG (bytes) de uno de los gráficos de GRAFICOS_JUGADOR, usando la caché de render.
+
+    Retorna None si el jugador no tiene datos para ese gráfico (por ejemplo, sin tiros).
+    heatmap son los conteos del heatmap ya sumados (ver datos_grafico_jugador).
+    """
+    funcion, args, _ = GRAFICOS_JUGADOR[grafico]
+    return renderizar_png(grafico, funcion, datos_grafico_jugador(grafico, df_jugador, heatmap), *args, dpi=dpi)
+
+
+def _pool_graficos():
+    """
+    Pool de procesos compartido por las sesiones; se crea en el primer render que lo necesita.
+
+    Los procesos se arrancan con 'spawn': un fork desde el servidor de Streamlit, con varios
+    hilos de sesión vivos, podría heredar locks tomados por otro hilo y quedarse bloqueado.
+    """
+    global _POOL_GRAFICOS
+    with _LOCK_POOL:
+        if _POOL_GRAFICOS is None:
+            from procesamiento.prerenderizar_jugadores import _iniciar_proceso
+            _POOL_GRAFICOS = ProcessPoolExecutor(max_workers=PROCESOS_GRAFICOS, initializer=_iniciar_proceso,
+                                                 mp_context=multiprocessing.get_context("spawn"))
+        return _POOL_GRAFICOS
+
+
+def _descartar_pool():
+    global _POOL_GRAFICOS
+    with _LOCK_POOL:
+        if _POOL_GRAFICOS is not None:
+            _POOL_GRAFICOS.shutdown(wait=False, cancel_futures=True)
+            _POOL_GRAFICOS = None
+
+
+def _renderizar_capturando(grafico, df_jugador, dpi, heatmap=None):
+    try:
+        return grafico, renderizar_grafico_jugador(grafico, df_jugador, dpi, heatmap), None
+    except Exception as e:
+        return grafico, None, e
+
+
+def renderizar_graficos_jugador(df_jugador, graficos=None, dpi=DPI_PANTALLA, heatmap=None):
+    """
+    Genera (grafico, png, error) a medida que cada gráfico está listo.
+
+    Los que ya están en la caché de render salen primero, sin tocar el pool. Los que faltan
+    se renderizan a la vez en procesos de trabajo (backend Agg), así que el tiempo total es
+    aproximadamente el del gráfico más lento y no la suma de todos.
+
+    Parámetros:
+    - df_jugador: Eventos limpios del jugador.
+    - graficos: Nombres de GRAFICOS_JUGADOR a renderizar (por defecto, todos).
+    - dpi: Resolución de las imágenes.
+    - heatmap: Conteos del heatmap ya sumados (sumar_heatmaps). None los calcula desde df_jugador.
+
+    Retorna:
+    - Generador de tuplas (grafico, png o None, excepción o None).
+    """
+    pendientes = {}
+    for grafico in (graficos or GRAFICOS_JUGADOR):
+        _, args, _ = GRAFICOS_JUGADOR[grafico]
+        clave = clave_render(grafico, datos_grafico_jugador(grafico, df_jugador, heatmap), args, None, dpi)
+        png = CACHE_RENDER.obtener(clave)
+        if png is not None:
+            registrar_cache("render", True)
+            yield grafico, png, None
+        else:
+            pendientes[grafico] = clave
+
+    # Con un solo gráfico pendiente no compensa enviar los datos a otro proceso
+    if len(pendientes) < 2 or PROCESOS_GRAFICOS < 2:
+        for grafico in pendientes:
+            yield _renderizar_capturando(grafico, df_jugador, dpi, heatmap)
+        return
+
+    with medir("render.paralelo", graficos=len(pendientes)):
+        try:
+            pool = _pool_graficos()
+            for _ in pendientes:
+                registrar_cache("render", False)
+            futuros = [pool.submit(_renderizar_capturando, grafico, df_jugador, dpi, heatmap) for grafico in pendientes]
+            for futuro in as_completed(futuros):
+                grafico, png, error = futuro.result()
+                # El proceso de trabajo ya lo dejó en la caché de disco; falta la memoria de este proceso
+                if png is not None:
+                    CACHE_RENDER.memoria.guardar(pendientes.pop(grafico), png)
+                else:
+                    pendientes.pop(grafico)
+                yield grafico, png, error
+        except BrokenProcessPool as e:
+            print(f"[ERROR] El pool de gráficos dejó de responder, se renderiza en este proceso: {e}")
+            _descartar_pool()
+            for grafico in list(pendientes):
+                yield _renderizar_capturando(grafico, df_jugador, dpi, heatmap)